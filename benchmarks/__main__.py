@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from benchmarks.results import compare_results, load_results, save_results
+from benchmarks.suite import DTYPES, POPULATION_SIZES, TOPOLOGIES, run_benchmarks
+from src.utils.config_utils import get_config_module
+
+BASELINE_PATH = Path("benchmarks/baseline.json")
+RESULTS_PATH = Path("benchmarks/results.json")
+
+
+def main() -> int:
+    """
+    Run the benchmarks, save the results and compare them with the baseline.
+
+    Returns:
+        (int): 1 if any benchmark regressed, otherwise 0
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the simulation, inference and reproduction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=POPULATION_SIZES, help="Population sizes")
+    parser.add_argument("--topologies", nargs="+", default=list(TOPOLOGIES), choices=list(TOPOLOGIES))
+    parser.add_argument("--dtypes", nargs="+", default=DTYPES, choices=DTYPES, help="Data types of networks")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Path to save results to")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Path of baseline results")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Fraction a result can regress by")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    args = parser.parse_args()
+
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    config = get_config_module()
+
+    results = run_benchmarks(config, args.sizes, args.topologies, args.dtypes)
+    save_results(results, args.output)
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline found at {args.baseline}, run with --save-baseline to create one")
+        return 0
+
+    comparisons = compare_results(results, load_results(args.baseline), args.threshold)
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison["regression"] else "ok"
+        print(f"{comparison['key']}: {comparison['change']:+.1%} vs baseline [{flag}]")
+
+    return int(any(comparison["regression"] for comparison in comparisons))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
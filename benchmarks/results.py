@@ -0,0 +1,86 @@
+import json
+import platform
+from pathlib import Path
+from typing import Any, Dict, List, cast
+
+import numpy as np
+
+from benchmarks.suite import result_key
+
+
+def save_results(results: List[Dict[str, Any]], filepath: Path) -> None:
+    """
+    Save benchmark results and details of the machine they were measured on to a json file.
+
+    Parameters:
+        results (List[Dict[str, Any]]): Result of each benchmark
+        filepath (Path): Path to json file
+    """
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_results(filepath: Path) -> List[Dict[str, Any]]:
+    """
+    Load benchmark results from a json file.
+
+    Parameters:
+        filepath (Path): Path to json file
+
+    Returns:
+        (List[Dict[str, Any]]): Result of each benchmark
+    """
+    with open(filepath, "r") as file:
+        return cast(List[Dict[str, Any]], json.load(file)["results"])
+
+
+def compare_results(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results with a baseline. A result is a regression if it is worse than its
+    baseline by more than the threshold, e.g. a threshold of 0.2 flags frames per second which
+    dropped by more than 20% or latencies which rose by more than 20%.
+
+    Parameters:
+        results (List[Dict[str, Any]]): Result of each benchmark
+        baseline (List[Dict[str, Any]]): Baseline result of each benchmark
+        threshold (float): Fraction a result can be worse than its baseline
+
+    Returns:
+        (List[Dict[str, Any]]): Comparison of each result which has a baseline
+    """
+    baseline_values = {result_key(result): result["value"] for result in baseline}
+
+    comparisons = []
+    for result in results:
+        key = result_key(result)
+        if key not in baseline_values:
+            continue
+
+        change = result["value"] / baseline_values[key] - 1
+        if result["higher_is_better"]:
+            regression = change < -threshold
+        else:
+            regression = change > threshold
+
+        comparisons.append(
+            {
+                "key": key,
+                "value": result["value"],
+                "baseline": baseline_values[key],
+                "change": change,
+                "regression": regression,
+            }
+        )
+    return comparisons
@@ -0,0 +1,258 @@
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from src.app import App
+from src.models.neat import NEATPopulationNetwork
+
+NEAT_TOPOLOGY = "neat"
+
+TOPOLOGIES: Dict[str, List[Dict[str, Any]]] = {
+    "small": [{"name": "Hidden", "num_nodes": 3, "activation": "relu"}],
+    "medium": [{"name": "Hidden", "num_nodes": 16, "activation": "relu"}],
+    "large": [
+        {"name": "Hidden1", "num_nodes": 32, "activation": "relu"},
+        {"name": "Hidden2", "num_nodes": 32, "activation": "relu"},
+    ],
+    NEAT_TOPOLOGY: [],
+}
+
+POPULATION_SIZES = [10, 100, 1000, 10000, 100000]
+
+DTYPES = ["float64", "float32"]
+
+
+def create_benchmark_app(config: Any, population_size: int, topology: str, dtype: str) -> App:
+    """
+    Create a headless application with a population size, neural network topology and dtype. The
+    neat topology uses minimal NEAT genomes instead of dense networks. Checkpoints and the metrics
+    log are disabled, so benchmarks never overwrite a training checkpoint or append to the
+    training metrics, and reproduction is timed without writing them.
+
+    Parameters:
+        config (Any): Application config
+        population_size (int): Number of birds in population
+        topology (str): Name of hidden layer topology in TOPOLOGIES
+        dtype (str): Data type of neural networks and birds' state
+
+    Returns:
+        (App): Headless application
+    """
+    benchmark_config = SimpleNamespace(
+        GAME={
+            **config.GAME,
+            "headless": True,
+            "num_workers": 1,
+            "checkpoint": {**config.GAME["checkpoint"], "interval": 0},
+            "metrics": {**config.GAME["metrics"], "path": None},
+        },
+        GA={**config.GA, "population_size": population_size},
+        NN={
+            **config.NN,
+            "hidden_layers": TOPOLOGIES[topology],
+            "dtype": dtype,
+            "neat": {**config.NN["neat"], "enabled": topology == NEAT_TOPOLOGY},
+        },
+        BIRD=config.BIRD,
+        PIPE={**config.PIPE, "seed": 0},
+    )
+    np.random.seed(0)
+    return App.create_app(benchmark_config)
+
+
+def time_per_call(func: Callable[[], Any], num_calls: int, repeat: int = 3) -> float:
+    """
+    Time a function and return the fastest time per call of several repeats.
+
+    Parameters:
+        func (Callable[[], Any]): Function to time
+        num_calls (int): Number of calls in each repeat
+        repeat (int): Number of repeats
+
+    Returns:
+        (float): Seconds per call
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            func()
+        best = min(best, (time.perf_counter() - start) / num_calls)
+    return float(best)
+
+
+def num_calls_for(population_size: int, budget: int = 100000) -> int:
+    """
+    Return the number of calls to time so each benchmark simulates a similar number of birds.
+
+    Parameters:
+        population_size (int): Number of birds in population
+        budget (int): Number of birds to simulate in each repeat
+
+    Returns:
+        (int): Number of calls, at least 5
+    """
+    return max(budget // population_size, 5)
+
+
+def benchmark_game_loop(app: App) -> float:
+    """
+    Measure the frames per second of the headless game loop, including the new generations which
+    start during the measurement.
+
+    Parameters:
+        app (App): Headless application
+
+    Returns:
+        (float): Frames per second
+    """
+
+    def frame() -> None:
+        app.update()
+        app.count += 1
+
+    return 1 / time_per_call(frame, num_calls_for(app.swarm.size, budget=200000))
+
+
+def benchmark_population_inference(app: App) -> float:
+    """
+    Measure the latency of one batched feedforward for the whole population.
+
+    Parameters:
+        app (App): Headless application
+
+    Returns:
+        (float): Seconds per call
+    """
+    inputs = app.swarm.get_inputs(None)
+    return time_per_call(lambda: app.brain.feedforward(inputs), num_calls_for(app.swarm.size, budget=200000))
+
+
+def benchmark_single_inference(app: App) -> float:
+    """
+    Measure the latency of feeding forward the neural network or NEAT genome of a single bird.
+
+    Parameters:
+        app (App): Headless application
+
+    Returns:
+        (float): Seconds per call
+    """
+    inputs = app.swarm.get_inputs(None)[0]
+    if isinstance(app.brain, NEATPopulationNetwork):
+        brain = app.brain
+        genome = brain.genomes[0]
+        return time_per_call(lambda: genome.feedforward(inputs, brain.hidden_activation, brain.output_activation), 1000)
+
+    nn = app.birds[0].nn
+    return time_per_call(lambda: nn.feedforward(inputs), 1000)
+
+
+def benchmark_reproduction(app: App) -> float:
+    """
+    Measure the time to select parents and create the next generation of the population.
+
+    Parameters:
+        app (App): Headless application
+
+    Returns:
+        (float): Seconds per generation
+    """
+    counts = np.arange(app.swarm.size)
+
+    def generation() -> None:
+        app.swarm.set_counts(counts)
+        app.population.evaluate()
+
+    return time_per_call(generation, num_calls_for(app.swarm.size))
+
+
+def benchmark_memory(app: App) -> float:
+    """
+    Measure the memory used by the population's genomes and the birds' state arrays. NEAT genomes
+    with the same topology share their node and connection arrays, so each array is counted once.
+
+    Parameters:
+        app (App): Headless application
+
+    Returns:
+        (float): Number of bytes
+    """
+    arrays = [app.swarm.y, app.swarm.velocity, app.swarm.alive, app.swarm.count]
+    if isinstance(app.brain, NEATPopulationNetwork):
+        genome_arrays = {
+            id(array): array
+            for genome in app.brain.genomes
+            for array in (
+                genome.nodes,
+                genome.biases,
+                genome.innovations,
+                genome.connections,
+                genome.weights,
+                genome.enabled,
+            )
+        }
+        arrays += list(genome_arrays.values())
+    else:
+        arrays.append(app.brain.genomes)
+    return float(sum(array.nbytes for array in arrays))
+
+
+BENCHMARKS: Dict[str, Dict[str, Any]] = {
+    "game_loop": {"func": benchmark_game_loop, "unit": "frames/s", "higher_is_better": True},
+    "population_inference": {"func": benchmark_population_inference, "unit": "s", "higher_is_better": False},
+    "single_inference": {"func": benchmark_single_inference, "unit": "s", "higher_is_better": False},
+    "reproduction": {"func": benchmark_reproduction, "unit": "s", "higher_is_better": False},
+    "memory": {"func": benchmark_memory, "unit": "bytes", "higher_is_better": False},
+}
+
+
+def run_benchmarks(
+    config: Any, population_sizes: List[int], topologies: List[str], dtypes: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Run every benchmark for each population size, topology and dtype.
+
+    Parameters:
+        config (Any): Application config
+        population_sizes (List[int]): Population sizes to benchmark
+        topologies (List[str]): Names of topologies to benchmark
+        dtypes (List[str]): Data types to benchmark
+
+    Returns:
+        (List[Dict[str, Any]]): Result of each benchmark
+    """
+    results = []
+    for dtype in dtypes:
+        for topology in topologies:
+            for population_size in population_sizes:
+                app = create_benchmark_app(config, population_size, topology, dtype)
+                for name, benchmark in BENCHMARKS.items():
+                    value = benchmark["func"](app)
+                    result = {
+                        "name": name,
+                        "topology": topology,
+                        "population_size": population_size,
+                        "dtype": dtype,
+                        "value": value,
+                        "unit": benchmark["unit"],
+                        "higher_is_better": benchmark["higher_is_better"],
+                    }
+                    print(f"{result_key(result)}: {value:.6g} {benchmark['unit']}")
+                    results.append(result)
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """
+    Return the key used to match a result with the baseline.
+
+    Parameters:
+        result (Dict[str, Any]): Benchmark result
+
+    Returns:
+        (str): Benchmark name, topology, population size and dtype
+    """
+    return f"{result['name']}[{result['topology']}-{result['population_size']}-{result['dtype']}]"
@@ -1,3 +1,6 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
 from dotenv import load_dotenv
 
 from src.app import App
@@ -8,5 +11,26 @@ load_dotenv()
 config = get_config_module()
 
 if __name__ == "__main__":
+    parser = ArgumentParser(description="Flappy Bird with Neuroevolution")
+    parser.add_argument("--headless", action="store_true", help="Run without a window or frame limiter")
+    parser.add_argument("--generations", type=int, default=None, help="Number of generations to run headless")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes when headless")
+    parser.add_argument("--islands", type=int, default=None, help="Number of island processes when headless")
+    parser.add_argument("--resume", type=Path, default=None, help="Path to checkpoint to resume training from")
+    args = parser.parse_args()
+
+    if args.headless:
+        config.GAME["headless"] = True
+    if args.workers is not None:
+        config.GAME["num_workers"] = args.workers
+    if args.islands is not None:
+        config.GA["islands"]["num_islands"] = args.islands
+
     app = App.create_app(config)
-    app.run()
+    if args.resume is not None:
+        app.resume(args.resume)
+
+    if app.headless:
+        app.run_headless(args.generations)
+    else:
+        app.run()
@@ -1,20 +1,75 @@
+import os
 import sys
-from typing import Any
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
+import numpy as np
 import pygame
-from pygame.locals import QUIT
+from pygame.locals import K_DOWN, K_UP, KEYDOWN, QUIT, K_p
 
-from src.models.ga import Population
+from src.checkpoint import Checkpointer, load_checkpoint
+from src.metrics import MetricsLog
+from src.models.ga import Brain, FitnessCache, Population
+from src.models.neat import NEATPopulationNetwork
+from src.models.population_nn import PopulationNeuralNetwork
 from src.objects.bird import Bird
-from src.objects.pipe import Pipe
+from src.objects.bird_swarm import BirdSwarm
+from src.objects.pipe import PipeQueue
+from src.objects.pipe_course import PipeCourse
+from src.profiler import Profiler
+from src.renderer import Renderer
+
+if TYPE_CHECKING:
+    from src.islands import Migration
 
 
 class App:
     """
     This class creates a Pygame instance and runs the application. The screen dimensions are
-    defined in the __init__ method, and the pipes are also configured in that method. A population
+    defined in the __init__ method, and the pipes are configured in the create_pipes method. A population
     is created in the create_population method. Helper methods have been defined to write text
     to the screen to display the game statistics. Calling the run method starts the application.
+
+    If the application is headless, no window is opened and nothing is drawn. The game logic in
+    update() runs as fast as possible and the simulation speed is reported each generation.
+
+    The pipes of each generation are replayed from a PipeCourse which is created from a seed when
+    the generation starts. The seeds are drawn from the pipe seed in the config, so a run with a
+    fixed seed always plays the same courses. If the course is fixed, one seed is drawn when the
+    application starts and every generation replays the same course.
+
+    If the fitness cache is enabled, the members whose genomes were simulated on the same course
+    in the previous generation, e.g. elites on a fixed course, start the generation dead with their
+    cached counts, and exact clones are only simulated once.
+
+    Only the parts of the screen which changed are redrawn each frame. The Renderer clears the
+    rectangles of the birds, pipes and statistics drawn in the previous frame and updates them on
+    the display, and the text surfaces of the statistics are only rendered when their text changes.
+
+    The speed of the application is the number of simulation steps run for each drawn frame, so
+    training can be watched faster than the frame rate. Only the state after the last step is drawn.
+    The speed is set in the config and can be doubled or halved with the up and down arrow keys.
+
+    The time of each phase of a frame is measured by a Profiler if it is enabled in the config. The
+    rolling averages can be shown on the screen by pressing P and are dumped to a file every number
+    of generations set in the config.
+
+    A checkpoint of the population is saved in the background every number of generations set in
+    the config, and a run can be resumed from a checkpoint with the resume() method.
+
+    If background reproduction is enabled in the config, the window does not freeze while the
+    population reproduces. When a generation finishes, the population is evaluated on a background
+    thread while the game loop keeps handling events and shows that the next generation is being
+    reproduced. The simulation is paused and the birds are not drawn until the reproduction has
+    finished, so the background thread is the only one which reads or writes the population. The
+    pipes of the next generation are then created within one frame, so the new genomes replace the
+    old ones between two frames. Headless runs reproduce in the game loop.
+
+    The birds' brains are dense neural networks, or NEAT genomes which start minimal and evolve
+    their topology if NEAT is enabled in the config. Checkpoints, memory-mapped genomes and worker
+    processes need the genome array of the dense networks.
     """
 
     pygame.init()
@@ -31,15 +86,37 @@ class App:
 
         self.FONT = pygame.font.SysFont(config.GAME["font"]["font"], config.GAME["font"]["size"])
         self.FPS = config.GAME["fps"]
+        self.speed = config.GAME["speed"]
+        self.sim_rate = 0.0
+        self.sim_steps = 0
+        self.sim_rate_time = time.perf_counter()
 
         self.screen_width = config.GAME["screen"]["width"]
         self.screen_height = config.GAME["screen"]["height"]
 
+        self.headless = config.GAME["headless"]
+        if self.headless:
+            self.init_headless_display()
+
         self.display_surf = pygame.display.set_mode((self.screen_width, self.screen_height))
         self.name = config.GAME["name"]
         pygame.display.set_caption(self.name)
+        self.renderer = Renderer(self.display_surf)
+        self.text_surfaces: Dict[Tuple[float, float], Tuple[str, pygame.Surface]] = {}
 
         self.count = 0
+        self.course_rng = np.random.default_rng(config.PIPE["seed"])
+        self.course_seed = int(self.course_rng.integers(2**31)) if config.PIPE["fixed_course"] else None
+        self.fitness_cache = FitnessCache() if config.GA["fitness_cache"] else None
+        self.known_counts: Optional[np.ndarray] = None
+        self.checkpointer = Checkpointer.create(config.GAME["checkpoint"])
+        self.profiler = Profiler.create(config.GAME["profiler"])
+        self.metrics = MetricsLog.create(config.GAME["metrics"])
+        self.migration: Optional[Migration] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.reproduction: Optional[Future] = None
+        if config.GAME["background_reproduction"] and not self.headless:
+            self.executor = ThreadPoolExecutor(max_workers=1)
 
     @classmethod
     def create_app(cls, config: Any) -> "App":
@@ -54,6 +131,18 @@ class App:
         app.create_pipes()
         return app
 
+    @staticmethod
+    def init_headless_display() -> None:
+        """
+        Switch Pygame to the dummy video driver so that no window is opened.
+        """
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        if pygame.display.get_init() and pygame.display.get_driver() == "dummy":
+            return
+
+        pygame.display.quit()
+        pygame.display.init()
+
     def create_population(self) -> None:
         """
         Create the population of members which will learn to play the game. The population size
@@ -62,39 +151,118 @@ class App:
 
         The characteristics of each member are also defined. In this case, the Cartesian
         coordinates of the bird's start position are given (x, y), along with its width and height.
+
+        Raises:
+            ValueError: If NEAT is enabled with checkpoints, memory-mapped genomes, worker processes
+                or islands
         """
+        self.swarm = BirdSwarm.create(
+            self.config.BIRD,
+            self.config.GA["population_size"],
+            (self.screen_width, self.screen_height),
+            self.config.NN["dtype"],
+        )
+
         self.birds = []
-        for _ in range(self.config.GA["population_size"]):
-            self.birds.append(Bird.create(self.config.BIRD, self.config.NN))
+        for index in range(self.config.GA["population_size"]):
+            self.birds.append(Bird.create(self.config.BIRD, self.config.NN, self.swarm, index))
+
+        genomes_path = self.config.GA["genomes_path"]
+        self.brain: Brain
+        if self.config.NN["neat"]["enabled"]:
+            if (
+                self.checkpointer.interval > 0
+                or genomes_path is not None
+                or self.config.GAME["num_workers"] > 1
+                or self.config.GA["islands"]["num_islands"] > 1
+            ):
+                raise ValueError(
+                    "NEAT does not support checkpoints, memory-mapped genomes, worker processes or islands"
+                )
+            self.brain = NEATPopulationNetwork.create(self.config.NN, self.config.GA["population_size"])
+        else:
+            self.brain = PopulationNeuralNetwork(
+                [bird.nn for bird in self.birds], Path(genomes_path) if genomes_path is not None else None
+            )
+        self.population = Population.create(self.config.GA, self.birds, self.brain, self.swarm, self.metrics)
+
+    @property
+    def dense_brain(self) -> PopulationNeuralNetwork:
+        """
+        Return the population's brain if it is made of dense neural networks with a genome array.
+
+        Returns:
+            (PopulationNeuralNetwork): Batched dense neural networks
+
+        Raises:
+            ValueError: If the population's brain is made of NEAT genomes
+        """
+        if not isinstance(self.brain, PopulationNeuralNetwork):
+            raise ValueError("NEAT genomes are not stored in a genome array")
+        return self.brain
 
-        self.population = Population(self.birds, self.config.GA["mutation_rate"])
+    def create_pipes(self) -> None:
+        """
+        Create the course of pipes for the next generation. The course lasts until the maximum
+        score is reached. The counts of the members which do not need to be simulated on the course
+        are looked up in the fitness cache.
+        """
+        self.start_course(
+            PipeCourse.create(
+                self.config.PIPE,
+                (self.screen_width, self.screen_height),
+                self.config.GA["max_score"] * 60,
+                self.course_seed if self.course_seed is not None else int(self.course_rng.integers(2**31)),
+            )
+        )
+        self.apply_fitness_cache()
 
-    def create_pipes(self):
+    def apply_fitness_cache(self) -> None:
         """
-        Create list for pipes and set spawnrate and speed.
+        Look up the known counts of the population on the current course and leave the members with
+        known counts dead, so only the other members are simulated.
         """
-        self.pipes = []
-        self.pipe_current_spawnrate = self.config.PIPE["start_spawnrate"]
-        self.pipe_current_speed = self.config.PIPE["start_speed"]
+        if self.fitness_cache is None:
+            return
+
+        self.known_counts = self.fitness_cache.lookup(self.brain.genome_digests(), self.course.seed)
+        self.swarm.set_known_counts(self.known_counts)
+
+    def start_course(self, course: PipeCourse) -> None:
+        """
+        Clear the pipes on the screen and start playing a course of pipes from the first frame.
+
+        Parameters:
+            course (PipeCourse): Course of pipes to play
+        """
+        self.pipes = PipeQueue()
+        self.pipe_index = 0
+        self.count = 0
+        self.course = course
 
     def write_text(self, text: str, x: float, y: float) -> None:
         """
-        Write text to the screen at the given position.
+        Write text to the screen at the given position. The rendered text is cached for each
+        position and only rendered again when the text changes.
 
         Parameters:
             text (str): Text to write
             x (float): x coordinate of text's position
             y (float): y coordinate of text's position
         """
-        text_to_write = self.FONT.render(text, False, (255, 255, 255))
-        self.display_surf.blit(text_to_write, (x, y))
+        cached = self.text_surfaces.get((x, y))
+        if cached is None or cached[0] != text:
+            cached = (text, self.FONT.render(text, False, (255, 255, 255)))
+            self.text_surfaces[(x, y)] = cached
+
+        self.renderer.add(self.display_surf.blit(cached[1], (x, y)))
 
     def display_stats(self) -> None:
         """
         Display statistics to the screen using the above helper function.
 
-        In this case, the current generation number, the number of birds alive, and the current
-        score is displayed on the screen.
+        In this case, the current generation number, the number of birds alive, the current score,
+        and the speed and number of simulation steps per second are displayed on the screen.
         """
         self.write_text(f"Generation: {self.population.generation}", 0, 0)
         self.write_text(
@@ -107,37 +275,243 @@ class App:
             0,
             self.config.GAME["font"]["size"] * 2,
         )
+        self.write_text(
+            f"Speed: {self.speed}x | Steps/sec: {self.sim_rate:.0f}",
+            0,
+            self.config.GAME["font"]["size"] * 3,
+        )
+        if self.reproducing:
+            self.write_text(
+                f"Reproducing generation {self.population.generation + 1}...",
+                0,
+                self.screen_height - self.config.GAME["font"]["size"],
+            )
 
-    def update(self) -> None:
+        if self.profiler.overlay:
+            for index, (phase, average) in enumerate(self.profiler.averages.items()):
+                self.write_text(f"{phase}: {average * 1000:.2f} ms", 0, self.config.GAME["font"]["size"] * (index + 4))
+
+    def draw(self) -> None:
+        """
+        Draw the pipes and the birds which are still alive to the screen. The birds share an x
+        coordinate, so their rectangles are joined into one column for the renderer.
+        """
+        for pipe in self.pipes:
+            for rect in pipe.draw():
+                self.renderer.add(rect)
+
+        bird_rects = [bird.draw() for bird in self.population.population if bird.alive]
+        if bird_rects:
+            self.renderer.add(bird_rects[0].unionall(bird_rects[1:]))
+
+    @property
+    def generation_finished(self) -> bool:
+        """
+        Return whether every bird is dead or the best bird has reached the maximum score while it
+        is alive, so a generation does not finish before it starts if a bird with a cached count
+        has already reached the maximum score.
+
+        Returns:
+            (bool): Has the current generation finished?
+        """
+        return self.population.num_alive == 0 or (
+            bool(self.swarm.alive[self.swarm.best_index])
+            and self.population.best_member.score == self.config.GA["max_score"]
+        )
+
+    @property
+    def reproducing(self) -> bool:
+        """
+        Return whether the next generation is being reproduced on the background thread.
+
+        Returns:
+            (bool): Is the population reproducing?
+        """
+        return self.reproduction is not None
+
+    def new_generation(self) -> None:
         """
-        Perform physics calculations and draw elements to screen.
+        Reproduce the population and start the next generation.
         """
-        if self.population.num_alive == 0 or self.population.best_member.score == self.config.GA["max_score"]:
-            self.population.evaluate()
-            self.pipes = []
-            self.pipe_current_speed = self.config.PIPE["start_speed"]
-            self.pipe_current_spawnrate = self.config.PIPE["start_spawnrate"]
+        self.profiler.start()
+        self.reproduce()
+        self.profiler.lap("evaluate")
+        self.start_generation()
 
-        if self.count % int(self.pipe_current_spawnrate) == 0:
-            self.pipes.append(Pipe.create(config_pipe=self.config.PIPE, speed=self.pipe_current_speed))
-            self.pipe_current_speed = min(
-                self.pipe_current_speed + self.config.PIPE["acc_speed"],
-                self.config.PIPE["max_speed"],
+    def reproduce(self) -> None:
+        """
+        Evaluate the population to create the genomes of the next generation. This may run on the
+        background thread, so it does not use the profiler or the display.
+
+        Checkpoints are written from the genome array without copying it, so the last checkpoint
+        is waited for before the population replaces its genomes. The counts of the generation are
+        stored in the fitness cache before the population is evaluated.
+
+        If the application is an island of an island model, the genomes of its fittest members are
+        sent to the neighbouring islands when a migration is due, and the genomes received from
+        other islands replace offspring.
+        """
+        self.checkpointer.wait()
+        if self.fitness_cache is not None:
+            self.swarm.count[:] = self.fitness_cache.store(self.swarm.count)
+        if self.migration is not None:
+            fitnesses = self.population.fitnesses
+            if self.migration.due(self.population.generation):
+                self.migration.emigrate(self.dense_brain.genomes, fitnesses)
+
+        self.population.evaluate()
+
+        if self.migration is not None:
+            self.migration.immigrate(self.dense_brain.genomes, fitnesses)
+
+    def start_generation(self) -> None:
+        """
+        Save a checkpoint if one is due and create the pipes for the next generation. The profile
+        is dumped if one is due.
+        """
+        if self.checkpointer.due(self.population.generation):
+            self.checkpointer.save(
+                self.dense_brain.genomes,
+                self.population.generation,
+                self.rng_states,
+                self.population.state,
+                self.course_seed,
             )
-            self.pipe_current_spawnrate = max(
-                self.pipe_current_spawnrate - self.config.PIPE["acc_spawnrate"],
-                self.config.PIPE["min_spawnrate"],
+        if self.profiler.due(self.population.generation):
+            self.profiler.dump(self.population.generation)
+        self.create_pipes()
+
+    @property
+    def rng_states(self) -> Dict[str, Any]:
+        """
+        Return the states of the random number generators used by the population and the pipes.
+
+        Returns:
+            (Dict[str, Any]): State of each random number generator
+        """
+        return {
+            "population": self.population.rng.bit_generator.state,
+            "course": self.course_rng.bit_generator.state,
+        }
+
+    def resume(self, filepath: Path) -> None:
+        """
+        Load the population's genomes, generation, random number generator states and the rest of
+        its state from a checkpoint, and create the pipes for the loaded generation. If the course
+        is fixed, the course of the checkpoint is replayed.
+
+        Parameters:
+            filepath (Path): Path to checkpoint
+        """
+        checkpoint = load_checkpoint(filepath)
+        genomes = checkpoint["genomes"]
+        brain = self.dense_brain
+        if genomes.shape != (len(self.birds), brain.genome_length):
+            raise ValueError(
+                f"Checkpoint genomes have shape {genomes.shape}, expected {(len(self.birds), brain.genome_length)}"
             )
-            self.count = 1
 
-        for pipe in self.pipes:
-            if pipe.offscreen:
-                self.pipes.remove(pipe)
-            else:
-                pipe.update()
+        brain.set_genomes(genomes)
+        self.population.generation = checkpoint["generation"]
+        self.population.rng.bit_generator.state = checkpoint["rng_states"]["population"]
+        self.course_rng.bit_generator.state = checkpoint["rng_states"]["course"]
+        self.population.load_state(checkpoint["population_state"])
+        if self.course_seed is not None and checkpoint["course_seed"] is not None:
+            self.course_seed = checkpoint["course_seed"]
+        self.swarm.reset()
+        self.create_pipes()
+
+    def update(self) -> None:
+        """
+        Start a new generation if the current one has finished, then perform physics calculations
+        for the pipes and birds.
+
+        With background reproduction, the population is submitted to the background thread when
+        the generation finishes and no physics calculations are performed until it has reproduced.
+        The next generation is then started and simulated in the same update. Errors raised while
+        reproducing are raised here.
+        """
+        if self.reproduction is not None:
+            if not self.reproduction.done():
+                return
+            reproduction, self.reproduction = self.reproduction, None
+            reproduction.result()
+            self.start_generation()
+        elif self.generation_finished:
+            if self.executor is not None:
+                self.reproduction = self.executor.submit(self.reproduce)
+                return
+            self.new_generation()
 
-        for bird in self.population.population:
-            bird.update(self.pipes)
+        self.step()
+
+    def close(self) -> None:
+        """
+        Wait for the population to finish reproducing, then stop the background threads and write
+        the remaining metrics.
+        """
+        if self.reproduction is not None:
+            self.reproduction.result()
+            self.reproduction = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.checkpointer.close()
+        self.metrics.close()
+
+    def step(self) -> None:
+        """
+        Spawn the pipes due on the current frame from the course and move the pipes, then perform
+        physics calculations for the birds.
+        """
+        self.profiler.start()
+        while self.pipe_index < len(self.course) and self.course.frames[self.pipe_index] <= self.count:
+            self.pipes.append(self.course.create_pipe(self.pipe_index))
+            self.pipe_index += 1
+
+        self.pipes.update()
+        nearest_pipe = self.pipes.next_pipe(self.swarm.x)
+        self.profiler.lap("pipes")
+
+        inputs = self.swarm.get_inputs(nearest_pipe)
+        self.profiler.lap("inputs")
+        outputs = self.brain.feedforward(inputs)
+        self.profiler.lap("inference")
+        self.swarm.kill_colliding(nearest_pipe)
+        self.profiler.lap("collision")
+        self.swarm.move(outputs)
+        self.profiler.lap("physics")
+
+    def handle_key(self, key: int) -> None:
+        """
+        Double the speed if the up arrow key is pressed, or halve it if the down arrow key is pressed.
+        Pressing P shows or hides the profiler overlay.
+
+        Parameters:
+            key (int): Key which was pressed
+        """
+        if key == K_UP:
+            self.speed *= 2
+        elif key == K_DOWN:
+            self.speed = max(self.speed // 2, 1)
+        elif key == K_p:
+            self.profiler.toggle_overlay()
+
+    def record_steps(self, num_steps: int) -> None:
+        """
+        Record the number of simulation steps run in a frame. The number of steps per second is
+        calculated about once a second so the statistics are not rendered again every frame.
+
+        Parameters:
+            num_steps (int): Number of simulation steps
+        """
+        self.sim_steps += num_steps
+        now = time.perf_counter()
+        elapsed = now - self.sim_rate_time
+        if elapsed >= 1:
+            self.sim_rate = self.sim_steps / elapsed
+            self.sim_steps = 0
+            self.sim_rate_time = now
 
     def run(self) -> None:
         """
@@ -148,18 +522,136 @@ class App:
         to calculate each members' fitnesses and perform crossover and mutation before resetting
         the game with the new population.
         """
+        if self.headless:
+            self.run_headless()
+            return
+
         while True:
+            self.profiler.start()
             for event in pygame.event.get():
                 if event.type == QUIT:
+                    self.close()
                     pygame.quit()
                     sys.exit()
+                if event.type == KEYDOWN:
+                    self.handle_key(event.key)
+            self.profiler.lap("events")
 
-            self.display_surf.fill((0, 0, 0))
+            num_steps = 0
+            for _ in range(self.speed):
+                self.update()
+                if self.reproducing:
+                    break
+                self.count += 1
+                num_steps += 1
+            self.record_steps(num_steps)
 
-            self.update()
+            self.profiler.start()
+            self.renderer.clear()
+            if not self.reproducing:
+                self.draw()
 
             # Updating the Pygame window
             self.display_stats()
-            pygame.display.update()
+            self.renderer.update()
+            self.profiler.lap("render")
             self.FramePerSec.tick(self.FPS)
-            self.count += 1
+
+    def run_headless(self, num_generations: Optional[int] = None) -> None:
+        """
+        Run the game logic without a window, drawing or a frame limiter. The simulation speed is
+        printed at the end of each generation. If more than one worker is configured, each
+        generation is simulated in shards across worker processes. If more than one island is
+        configured, an island model runs instead, with one population in each process. The last
+        checkpoint and the buffered metrics are written before returning, including when the run is
+        interrupted.
+
+        Parameters:
+            num_generations (Optional[int]): Number of generations to run, runs forever if None
+        """
+        start_generation = self.population.generation
+        start_time = time.perf_counter()
+        self.num_frames = 0
+
+        try:
+            if self.config.GA["islands"]["num_islands"] > 1:
+                self.run_islands(num_generations)
+                return
+
+            if self.config.GAME["num_workers"] > 1:
+                self.run_sharded(num_generations, start_time)
+                return
+
+            while num_generations is None or self.population.generation - start_generation < num_generations:
+                generation = self.population.generation
+
+                self.update()
+                self.count += 1
+                self.num_frames += 1
+
+                if self.population.generation != generation:
+                    self.report_speed(self.population.generation - start_generation, time.perf_counter() - start_time)
+        finally:
+            self.close()
+
+    def run_sharded(self, num_generations: Optional[int], start_time: float) -> None:
+        """
+        Simulate each generation across worker processes, then evaluate the population.
+
+        Parameters:
+            num_generations (Optional[int]): Number of generations to run, runs forever if None
+            start_time (float): Time the headless run started
+        """
+        from src.evaluator import ShardedEvaluator
+
+        brain = self.dense_brain
+        evaluator = ShardedEvaluator(self.config, self.config.GAME["num_workers"])
+        try:
+            completed = 0
+            while num_generations is None or completed < num_generations:
+                self.profiler.start()
+                counts = evaluator.evaluate(brain.genomes, self.course, self.known_counts)
+                self.profiler.lap("shards")
+                self.swarm.set_counts(counts)
+                self.num_frames += int(np.max(counts))
+
+                self.new_generation()
+                completed += 1
+                self.report_speed(completed, time.perf_counter() - start_time)
+        finally:
+            evaluator.close()
+
+    def run_islands(self, num_generations: Optional[int]) -> None:
+        """
+        Run an island model with one population of the configured size in each worker process,
+        then print the result of each island.
+
+        Parameters:
+            num_generations (Optional[int]): Number of generations to run, runs forever if None
+        """
+        from src.islands import IslandModel
+
+        model = IslandModel(self.config, self.config.GA["islands"]["num_islands"])
+        for result in model.run(num_generations):
+            print(
+                f"Island: {result['island']} | "
+                f"Generation: {result['generation'] - 1} | "
+                f"Best fitness: {result['best_fitness']:.0f} | "
+                f"Migrants received: {result['migrants_received']}"
+            )
+
+    def report_speed(self, num_generations: int, elapsed: float) -> None:
+        """
+        Calculate and print the simulation speed since the headless run started.
+
+        Parameters:
+            num_generations (int): Number of generations completed
+            elapsed (float): Seconds since the run started
+        """
+        self.frames_per_second = self.num_frames / elapsed
+        self.generations_per_hour = num_generations * 3600 / elapsed
+        print(
+            f"Generation: {self.population.generation - 1} | "
+            f"Frames/sec: {self.frames_per_second:.0f} | "
+            f"Generations/hour: {self.generations_per_hour:.1f}"
+        )
@@ -0,0 +1,169 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(
+    filepath: Path,
+    genomes: np.ndarray,
+    generation: int,
+    rng_states: Dict[str, Any],
+    population_state: Optional[Dict[str, Any]] = None,
+    course_seed: Optional[int] = None,
+) -> None:
+    """
+    Save the genomes of a population, its generation, the states of its random number generators,
+    any other state of the population, e.g. its mutation schedule, and the seed of a fixed pipe
+    course to an uncompressed .npz file. The file is written next to the checkpoint and then
+    renamed, so an existing checkpoint is never left partially written.
+
+    Parameters:
+        filepath (Path): Path to checkpoint
+        genomes (np.ndarray): Genomes with shape (population, genome length)
+        generation (int): Generation of population
+        rng_states (Dict[str, Any]): State of each random number generator
+        population_state (Optional[Dict[str, Any]]): State of population which is not stored in
+            the genomes
+        course_seed (Optional[int]): Seed of pipe course replayed every generation, None if the
+            course is not fixed
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    temp_filepath = filepath.with_name(f"{filepath.name}.tmp")
+
+    with open(temp_filepath, "wb") as file:
+        np.savez(
+            file,
+            version=CHECKPOINT_VERSION,
+            genomes=genomes,
+            generation=generation,
+            rng_states=json.dumps(rng_states),
+            population_state=json.dumps(population_state or {}),
+            course_seed=json.dumps(course_seed),
+        )
+    os.replace(temp_filepath, filepath)
+
+
+def load_checkpoint(filepath: Path) -> Dict[str, Any]:
+    """
+    Load a checkpoint saved with save_checkpoint(). Checkpoints saved without a population state
+    load an empty one, and checkpoints saved without a course seed load None.
+
+    Parameters:
+        filepath (Path): Path to checkpoint
+
+    Returns:
+        (Dict[str, Any]): Genomes, generation, random number generator states, population state and
+            course seed
+    """
+    with np.load(filepath) as checkpoint:
+        if int(checkpoint["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {int(checkpoint['version'])}")
+
+        return {
+            "genomes": checkpoint["genomes"],
+            "generation": int(checkpoint["generation"]),
+            "rng_states": json.loads(str(checkpoint["rng_states"])),
+            "population_state": (
+                json.loads(str(checkpoint["population_state"])) if "population_state" in checkpoint.files else {}
+            ),
+            "course_seed": json.loads(str(checkpoint["course_seed"])) if "course_seed" in checkpoint.files else None,
+        }
+
+
+class Checkpointer:
+    """
+    This class saves checkpoints of the population every number of generations. The genomes are
+    written to disk on a background thread without being copied, so large or memory-mapped
+    populations are not duplicated in memory. The caller must wait() for the write to finish before
+    modifying the genomes.
+    """
+
+    def __init__(self, filepath: Path, interval: int):
+        """
+        Configure where and how often checkpoints are saved.
+
+        Parameters:
+            filepath (Path): Path to checkpoint
+            interval (int): Number of generations between checkpoints, 0 to disable checkpoints
+        """
+        self.filepath = filepath
+        self.interval = interval
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.future: Optional[Future] = None
+
+    @classmethod
+    def create(cls, config_checkpoint: Dict[str, Any]) -> "Checkpointer":
+        """
+        Create a checkpointer from config file.
+
+        Parameters:
+            config_checkpoint (Dict(str, Any)): Checkpoint configuration
+
+        Returns:
+            (Checkpointer): Configured checkpointer
+        """
+        return cls(Path(config_checkpoint["path"]), config_checkpoint["interval"])
+
+    def due(self, generation: int) -> bool:
+        """
+        Return whether a checkpoint should be saved for a generation.
+
+        Parameters:
+            generation (int): Generation of population
+
+        Returns:
+            (bool): Is a checkpoint due?
+        """
+        return self.interval > 0 and generation % self.interval == 0
+
+    def save(
+        self,
+        genomes: np.ndarray,
+        generation: int,
+        rng_states: Dict[str, Any],
+        population_state: Optional[Dict[str, Any]] = None,
+        course_seed: Optional[int] = None,
+    ) -> None:
+        """
+        Save a checkpoint on the background thread.
+
+        Parameters:
+            genomes (np.ndarray): Genomes with shape (population, genome length), must not be modified
+                after calling this method
+            generation (int): Generation of population
+            rng_states (Dict[str, Any]): State of each random number generator
+            population_state (Optional[Dict[str, Any]]): State of population which is not stored in
+                the genomes
+            course_seed (Optional[int]): Seed of pipe course replayed every generation, None if the
+                course is not fixed
+        """
+        self.wait()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.future = self.executor.submit(
+            save_checkpoint, self.filepath, genomes, generation, rng_states, population_state, course_seed
+        )
+
+    def wait(self) -> None:
+        """
+        Wait for the last checkpoint to be written.
+        """
+        if self.future is not None:
+            self.future.result()
+            self.future = None
+
+    def close(self) -> None:
+        """
+        Wait for the last checkpoint to be written and stop the background thread.
+        """
+        self.wait()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -4,15 +4,47 @@ GAME = {
     "name": "Flappy Bird with Neuroevolution",
     "screen": {"width": 700, "height": 700},
     "fps": 60,
+    "speed": 1,
+    "headless": False,
+    "num_workers": 1,
+    "background_reproduction": False,
+    "checkpoint": {"path": "checkpoints/population.npz", "interval": 0},
+    "metrics": {"path": None, "flush_interval": 10},
+    "profiler": {"path": "profiles/profile.json", "interval": 0, "overlay": False, "window": 120},
     "font": {"font": "freesansbold.ttf", "size": 28},
 }
 
-GA = {"population_size": 10, "mutation_rate": 0.05, "max_score": 100}
+GA = {
+    "population_size": 10,
+    "mutation_rate": 0.05,
+    "mutation_schedule": {
+        "enabled": False,
+        "per_layer": False,
+        "min_rate": 0.01,
+        "max_rate": 0.5,
+        "increase": 1.5,
+        "decrease": 0.9,
+        "patience": 5,
+        "diversity_threshold": 0.05,
+    },
+    "selection": "roulette",
+    "tournament_size": 3,
+    "elitism": 0,
+    "speciation": {"enabled": False, "threshold": 0.3, "max_species": 20, "target_species": 10, "threshold_step": 0.1},
+    "fitness_cache": False,
+    "islands": {"num_islands": 1, "migration_interval": 10, "num_migrants": 2, "topology": "ring"},
+    "max_score": 100,
+    "genomes_path": None,
+}
 
 NN = {
     "input_layer": {"name": "Input", "num_nodes": 5, "activation": "linear"},
     "output_layer": {"name": "Output", "num_nodes": 2, "activation": "linear"},
     "hidden_layers": [{"name": "Hidden", "num_nodes": 3, "activation": "relu"}],
+    "weights_range": {"low": -1, "high": 1},
+    "bias_range": {"low": -0.3, "high": 0.3},
+    "dtype": "float64",
+    "neat": {"enabled": False, "hidden_activation": "relu", "add_connection_rate": 0.05, "add_node_rate": 0.03},
 }
 
 BIRD = {"x": 30, "y": 400, "width": 40, "height": 40, "grav": 1, "lift": -20, "min_velocity": -10}
@@ -29,4 +61,6 @@ PIPE = {
     "acc_spawnrate": 0.1,
     "start_speed": 3.5,
     "max_speed": 11,
+    "seed": None,
+    "fixed_course": False,
 }
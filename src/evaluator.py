@@ -0,0 +1,173 @@
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.app import App
+from src.objects.pipe_course import PipeCourse
+
+ShardTask = Tuple[str, Tuple[int, ...], str, int, int, PipeCourse, Optional[np.ndarray]]
+
+_CONFIG_NAMES = ["GAME", "GA", "NN", "BIRD", "PIPE"]
+
+_worker_config: Dict[str, Any] = {}
+_worker_apps: Dict[int, App] = {}
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """
+    Store the application config in a worker process.
+
+    Parameters:
+        config (Dict[str, Any]): Dictionary of config names and settings
+    """
+    _worker_config.update(config)
+
+
+def _get_worker_app(size: int) -> App:
+    """
+    Get the headless application used by a worker process to simulate a shard of a given size.
+
+    Parameters:
+        size (int): Number of birds in shard
+
+    Returns:
+        (App): Headless application with a population of the shard size
+    """
+    if size not in _worker_apps:
+        config = SimpleNamespace(**_worker_config)
+        config.GAME = {
+            **config.GAME,
+            "headless": True,
+            "profiler": {**config.GAME["profiler"], "interval": 0, "overlay": False},
+        }
+        config.GA = {**config.GA, "population_size": size, "genomes_path": None, "fitness_cache": False}
+        _worker_apps[size] = App.create_app(config)
+
+    return _worker_apps[size]
+
+
+def _evaluate_shard(task: ShardTask) -> np.ndarray:
+    """
+    Simulate one generation of a shard of the population in a worker process.
+
+    Parameters:
+        task (ShardTask): Shared memory name, genomes shape, genomes dtype, first and last index of
+            shard, course of pipes, and known count of each bird in shard if there are any
+
+    Returns:
+        (np.ndarray): Count of each bird in shard
+    """
+    name, shape, dtype, start, stop, course, known = task
+    app = _get_worker_app(stop - start)
+
+    shared_memory = SharedMemory(name=name)
+    genomes: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+    app.dense_brain.set_genomes(genomes[start:stop])
+    del genomes
+    shared_memory.close()
+
+    app.swarm.reset()
+    app.start_course(course)
+    if known is not None:
+        app.swarm.set_known_counts(known)
+
+    while not app.generation_finished:
+        app.step()
+        app.count += 1
+
+    return app.swarm.count.copy()
+
+
+class ShardedEvaluator:
+    """
+    This class evaluates a population across several worker processes. The population is split into
+    shards and each worker simulates a shard in a headless application. Every worker is sent the
+    same course of pipes, so each shard plays an identical course and the counts match those of a
+    single process simulation.
+
+    The genomes of the population are copied into shared memory each generation, so only the shard
+    bounds are sent to the workers and only the counts of each bird are sent back. The birds whose
+    counts are already known, e.g. from a fitness cache, are not simulated by the workers.
+    """
+
+    def __init__(self, config: Any, num_workers: int):
+        """
+        Start the worker processes.
+
+        Parameters:
+            config (Any): Application config
+            num_workers (int): Number of worker processes
+        """
+        self.num_workers = num_workers
+        self.shared_memory: Optional[SharedMemory] = None
+
+        worker_config = {name: getattr(config, name) for name in _CONFIG_NAMES}
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(num_workers, initializer=_init_worker, initargs=(worker_config,))
+
+    def shards(self, size: int) -> List[Tuple[int, int]]:
+        """
+        Split a population into one shard per worker.
+
+        Parameters:
+            size (int): Number of members in population
+
+        Returns:
+            (List[Tuple[int, int]]): First and last index of each shard
+        """
+        bounds = np.linspace(0, size, min(self.num_workers, size) + 1).astype(int)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def evaluate(self, genomes: np.ndarray, course: PipeCourse, known: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate one generation of the population and return the count of each member.
+
+        Parameters:
+            genomes (np.ndarray): Genomes with shape (population, genome length)
+            course (PipeCourse): Course of pipes to play
+            known (Optional[np.ndarray]): Known count of each member, -1 for members to simulate
+
+        Returns:
+            (np.ndarray): Count of each member
+        """
+        if self.shared_memory is None or self.shared_memory.size < genomes.nbytes:
+            self.close_shared_memory()
+            self.shared_memory = SharedMemory(create=True, size=genomes.nbytes)
+
+        shared_genomes: np.ndarray = np.ndarray(genomes.shape, dtype=genomes.dtype, buffer=self.shared_memory.buf)
+        shared_genomes[:] = genomes
+        del shared_genomes
+
+        tasks: List[ShardTask] = [
+            (
+                self.shared_memory.name,
+                genomes.shape,
+                genomes.dtype.str,
+                int(start),
+                int(stop),
+                course,
+                known[start:stop] if known is not None else None,
+            )
+            for start, stop in self.shards(len(genomes))
+        ]
+        return np.concatenate(self.pool.map(_evaluate_shard, tasks))
+
+    def close_shared_memory(self) -> None:
+        """
+        Release the shared memory used for the genomes.
+        """
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and release the shared memory.
+        """
+        self.pool.close()
+        self.pool.join()
+        self.close_shared_memory()
@@ -0,0 +1,270 @@
+import multiprocessing
+import queue
+from multiprocessing.context import SpawnProcess
+from multiprocessing.queues import Queue
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.app import App
+
+_CONFIG_NAMES = ["GAME", "GA", "NN", "BIRD", "PIPE"]
+
+
+class Migration:
+    """
+    This class moves genomes between the islands of an island model. Every number of generations,
+    an island sends copies of the genomes of its fittest members to the inbox of each neighbouring
+    island, before its population reproduces. In a ring topology the neighbour of each island is the
+    next island, and in a fully connected topology every other island is a neighbour.
+
+    After each reproduction, the genomes which have arrived in the island's inbox replace the
+    offspring at the indices of the least fit members of the last generation, so elites are never
+    replaced. The inbox is never waited on, so an island never waits for a slower neighbour. The
+    best fitness of the island is recorded so it can be reported when the island finishes.
+    """
+
+    TOPOLOGIES = ["ring", "full"]
+
+    def __init__(
+        self, island: int, inboxes: List[Queue], interval: int, num_migrants: int, topology: str = "ring"
+    ) -> None:
+        """
+        Initialise the migration of an island.
+
+        Parameters:
+            island (int): Index of island
+            inboxes (List[Queue]): Inbox of each island
+            interval (int): Number of generations between migrations
+            num_migrants (int): Number of genomes to send to each neighbour
+            topology (str): Topology of the islands (ring/full)
+        """
+        if topology not in self.TOPOLOGIES:
+            raise ValueError(f"Unknown island topology {topology}, expected one of {self.TOPOLOGIES}")
+
+        self.island = island
+        self.inboxes = inboxes
+        self.interval = interval
+        self.num_migrants = num_migrants
+        self.topology = topology
+        self.num_received = 0
+        self.best_fitness = 0.0
+
+    @property
+    def neighbours(self) -> List[int]:
+        """
+        Return the islands this island sends genomes to.
+
+        Returns:
+            (List[int]): Index of each neighbouring island
+        """
+        num_islands = len(self.inboxes)
+        if num_islands < 2:
+            return []
+
+        if self.topology == "ring":
+            return [(self.island + 1) % num_islands]
+
+        return [island for island in range(num_islands) if island != self.island]
+
+    def due(self, generation: int) -> bool:
+        """
+        Return whether genomes should be sent after a generation.
+
+        Parameters:
+            generation (int): Generation of population
+
+        Returns:
+            (bool): Is a migration due?
+        """
+        return self.interval > 0 and generation % self.interval == 0
+
+    def emigrate(self, genomes: np.ndarray, fitnesses: np.ndarray) -> None:
+        """
+        Send copies of the genomes of the fittest members to each neighbouring island.
+
+        Parameters:
+            genomes (np.ndarray): Genomes with shape (population, genome length)
+            fitnesses (np.ndarray): Fitness of each member
+        """
+        num_migrants = min(self.num_migrants, len(fitnesses))
+        if num_migrants <= 0:
+            return
+
+        fittest = np.sort(np.argpartition(-fitnesses, num_migrants - 1)[:num_migrants])
+        migrants = np.array(genomes[fittest])
+        for neighbour in self.neighbours:
+            self.inboxes[neighbour].put(migrants)
+
+    def immigrate(self, genomes: np.ndarray, fitnesses: np.ndarray) -> int:
+        """
+        Record the best fitness of the last generation, then replace the offspring at the indices
+        of the least fit members of the last generation with the genomes which have arrived in the
+        inbox. At most half of the population is replaced.
+
+        Parameters:
+            genomes (np.ndarray): Genomes of the offspring with shape (population, genome length)
+            fitnesses (np.ndarray): Fitness of each member in the last generation
+
+        Returns:
+            (int): Number of genomes received
+        """
+        self.best_fitness = max(self.best_fitness, float(np.max(fitnesses)))
+        migrants = []
+        while True:
+            try:
+                migrants.append(self.inboxes[self.island].get_nowait())
+            except queue.Empty:
+                break
+
+        if not migrants:
+            return 0
+
+        immigrants = np.concatenate(migrants)[: len(genomes) // 2]
+        least_fit = np.argsort(fitnesses, kind="stable")[: len(immigrants)]
+        genomes[least_fit] = immigrants
+        self.num_received += len(immigrants)
+        return len(immigrants)
+
+
+def island_config(config: Dict[str, Any], island: int) -> SimpleNamespace:
+    """
+    Return the config of an island: a headless application in one process, without checkpoints,
+    the profiler or memory-mapped genomes, which writes its metrics to its own file.
+
+    Parameters:
+        config (Dict[str, Any]): Dictionary of config names and settings
+        island (int): Index of island
+
+    Returns:
+        (SimpleNamespace): Application config of island
+    """
+    island_config = SimpleNamespace(**config)
+    metrics_path = config["GAME"]["metrics"]["path"]
+    if metrics_path is not None:
+        path = Path(metrics_path)
+        metrics_path = str(path.with_name(f"{path.stem}_island{island}{path.suffix}"))
+
+    island_config.GAME = {
+        **config["GAME"],
+        "headless": True,
+        "num_workers": 1,
+        "checkpoint": {**config["GAME"]["checkpoint"], "interval": 0},
+        "profiler": {**config["GAME"]["profiler"], "interval": 0, "overlay": False},
+        "metrics": {**config["GAME"]["metrics"], "path": metrics_path},
+    }
+    island_config.GA = {
+        **config["GA"],
+        "genomes_path": None,
+        "islands": {**config["GA"]["islands"], "num_islands": 1},
+    }
+    return island_config
+
+
+def _run_island(
+    island: int, config: Dict[str, Any], inboxes: List[Queue], results: Queue, num_generations: Optional[int]
+) -> None:
+    """
+    Run the headless game loop of an island in a worker process, then send its result. Migrants
+    which are still buffered for other islands are dropped when the process exits, as the other
+    islands have finished too.
+
+    Parameters:
+        island (int): Index of island
+        config (Dict[str, Any]): Dictionary of config names and settings
+        inboxes (List[Queue]): Inbox of each island
+        results (Queue): Queue to send the result of the island to
+        num_generations (Optional[int]): Number of generations to run, runs forever if None
+    """
+    config_islands = config["GA"]["islands"]
+    app = App.create_app(island_config(config, island))
+    app.migration = Migration(
+        island,
+        inboxes,
+        config_islands["migration_interval"],
+        config_islands["num_migrants"],
+        config_islands["topology"],
+    )
+    app.run_headless(num_generations)
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    results.put(
+        {
+            "island": island,
+            "generation": app.population.generation,
+            "best_fitness": app.migration.best_fitness,
+            "migrants_received": app.migration.num_received,
+        }
+    )
+
+
+class IslandModel:
+    """
+    This class runs an island model across worker processes. Each island is an independent
+    population with its own headless game loop in its own process, so the islands scale with the
+    number of cores, and the islands only share genomes when they migrate. The migrants are sent
+    over an inbox queue of each island, which holds a few genomes every number of generations.
+    """
+
+    RESULT_TIMEOUT = 1.0
+
+    def __init__(self, config: Any, num_islands: int):
+        """
+        Create the inbox of each island.
+
+        Parameters:
+            config (Any): Application config
+            num_islands (int): Number of islands
+        """
+        self.config = {name: getattr(config, name) for name in _CONFIG_NAMES}
+        self.num_islands = num_islands
+        self.context = multiprocessing.get_context("spawn")
+        self.inboxes: List[Queue] = [self.context.Queue() for _ in range(num_islands)]
+        self.results: Queue = self.context.Queue()
+        self.processes: List[SpawnProcess] = []
+
+    def run(self, num_generations: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run every island for a number of generations and return their results.
+
+        Parameters:
+            num_generations (Optional[int]): Number of generations to run, runs forever if None
+
+        Returns:
+            (List[Dict[str, Any]]): Final generation, best fitness and number of genomes received
+                of each island
+
+        Raises:
+            RuntimeError: If an island process exits without sending its result, the other islands
+                are terminated
+        """
+        self.processes = processes = [
+            self.context.Process(
+                target=_run_island, args=(island, self.config, self.inboxes, self.results, num_generations)
+            )
+            for island in range(self.num_islands)
+        ]
+        for process in processes:
+            process.start()
+
+        results: List[Dict[str, Any]] = []
+        try:
+            while len(results) < len(processes):
+                try:
+                    results.append(self.results.get(timeout=self.RESULT_TIMEOUT))
+                except queue.Empty:
+                    failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"Island process exited with code {failed[0]}")
+        except BaseException:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        return sorted(results, key=lambda result: result["island"])
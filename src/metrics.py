@@ -0,0 +1,100 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class MetricsLog:
+    """
+    This class appends a record of training metrics for each generation to a .jsonl file, or to a
+    .csv file if the path ends in .csv.
+
+    Records are buffered in memory and appended to the file every number of records, so the game
+    loop does not write to disk every generation. The file is only opened while the buffer is
+    flushed, and the remaining records are written when the log is closed.
+    """
+
+    def __init__(self, filepath: Optional[Path], flush_interval: int = 10):
+        """
+        Configure where the records are written and how often the buffer is flushed.
+
+        Parameters:
+            filepath (Optional[Path]): Path to append records to, None to disable the log
+            flush_interval (int): Number of records to buffer before appending them to the file
+        """
+        self.filepath = filepath
+        self.flush_interval = flush_interval
+        self.records: List[Dict[str, Any]] = []
+
+    @classmethod
+    def create(cls, config_metrics: Dict[str, Any]) -> "MetricsLog":
+        """
+        Create a metrics log from config file.
+
+        Parameters:
+            config_metrics (Dict(str, Any)): Metrics configuration
+
+        Returns:
+            (MetricsLog): Configured metrics log
+        """
+        filepath = config_metrics["path"]
+        return cls(Path(filepath) if filepath is not None else None, config_metrics["flush_interval"])
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Return whether the log writes records to a file.
+
+        Returns:
+            (bool): Is log enabled?
+        """
+        return self.filepath is not None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Add a record to the buffer and flush the buffer if it is full.
+
+        Parameters:
+            record (Dict[str, Any]): Metrics of one generation
+        """
+        if not self.enabled:
+            return
+
+        self.records.append(record)
+        if len(self.records) >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Append the buffered records to the file. Values of a .csv file which are lists or
+        dictionaries are written as JSON, and the header is written when the file is created.
+        """
+        if self.filepath is None or not self.records:
+            return
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not self.filepath.exists() or self.filepath.stat().st_size == 0
+
+        with open(self.filepath, "a", newline="") as file:
+            if self.filepath.suffix == ".csv":
+                writer = csv.DictWriter(file, fieldnames=list(self.records[0]))
+                if write_header:
+                    writer.writeheader()
+                for record in self.records:
+                    writer.writerow(
+                        {
+                            key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                            for key, value in record.items()
+                        }
+                    )
+            else:
+                for record in self.records:
+                    file.write(json.dumps(record) + "\n")
+
+        self.records = []
+
+    def close(self) -> None:
+        """
+        Append the remaining buffered records to the file.
+        """
+        self.flush()
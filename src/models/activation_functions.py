@@ -1,10 +1,23 @@
-import math
-from typing import Any
+from typing import Callable, Optional, cast
+
+import numpy as np
+import numpy.typing as npt
+
+Activation = Callable[..., np.ndarray]
 
 
 class ActivationFunctions:
+    """
+    This class is a registry of activation functions. Each activation function uses NumPy ufuncs
+    so it can be applied to a whole array at once, as well as to a single value. If an output array
+    is given, the result is written into it instead of allocating a new array, e.g. passing the
+    input array as the output calculates the activation in place.
+    """
+
+    LEAKY_RELU_ALPHA = 0.01
+
     @staticmethod
-    def get_activation(name: str) -> Any:
+    def get_activation(name: str) -> Activation:
         """
         Return activation function from name.
 
@@ -12,50 +25,103 @@ class ActivationFunctions:
             name (str): Name of activation function
 
         Returns:
-            (Any): Activation function
+            (Activation): Activation function
         """
         activation_functions = {
             "linear": ActivationFunctions.linear,
             "relu": ActivationFunctions.relu,
             "sigmoid": ActivationFunctions.sigmoid,
+            "tanh": ActivationFunctions.tanh,
+            "leaky_relu": ActivationFunctions.leaky_relu,
+            "softmax": ActivationFunctions.softmax,
         }
         return activation_functions[name]
 
     @staticmethod
-    def sigmoid(x: float) -> float:
+    def sigmoid(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Sigmoid activation function.
 
         Parameters:
-            x (float): Element to use
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
 
         Returns:
-            (float): 1 / (1 + e^(-x))
+            (np.ndarray): 1 / (1 + e^(-x))
         """
-        return 1 / (1 + math.exp(-x))
+        y = np.negative(x, out=out)
+        y = np.exp(y, out=out)
+        y = np.add(y, 1, out=out)
+        return cast(np.ndarray, np.reciprocal(y, out=out))
 
     @staticmethod
-    def relu(x: float) -> float:
+    def relu(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         ReLU activation function.
 
         Parameters:
-            x (float): Element to use
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
+
+        Returns:
+            (np.ndarray): x if x > 0 else 0
+        """
+        return cast(np.ndarray, np.maximum(x, 0, out=out))
+
+    @staticmethod
+    def leaky_relu(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Leaky ReLU activation function.
+
+        Parameters:
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
+
+        Returns:
+            (np.ndarray): x if x > 0 else alpha * x
+        """
+        return cast(np.ndarray, np.maximum(x, np.multiply(x, ActivationFunctions.LEAKY_RELU_ALPHA), out=out))
+
+    @staticmethod
+    def tanh(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Tanh activation function.
+
+        Parameters:
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
+
+        Returns:
+            (np.ndarray): (e^x - e^(-x)) / (e^x + e^(-x))
+        """
+        return cast(np.ndarray, np.tanh(x, out=out))
+
+    @staticmethod
+    def softmax(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Softmax activation function, calculated along the last axis.
+
+        Parameters:
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
 
         Returns:
-            (float): x if x > 0 else 0
+            (np.ndarray): e^x / sum(e^x)
         """
-        return x * (x > 0)
+        y = np.subtract(x, np.max(x, axis=-1, keepdims=True), out=out)
+        y = np.exp(y, out=out)
+        return cast(np.ndarray, np.divide(y, np.sum(y, axis=-1, keepdims=True), out=out))
 
     @staticmethod
-    def linear(x: float) -> float:
+    def linear(x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Linear activation function.
 
         Parameters:
-            x (float): Element to use
+            x (npt.ArrayLike): Elements to use
+            out (Optional[np.ndarray]): Array to write the result to
 
         Returns:
-            (float): x
+            (np.ndarray): x
         """
-        return x
+        return cast(np.ndarray, np.positive(x, out=out))
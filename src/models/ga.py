@@ -1,19 +1,528 @@
-from typing import Any, List, Optional, cast
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import numpy as np
+import numpy.typing as npt
+
+from src.metrics import MetricsLog
+from src.models.neat import NEATPopulationNetwork
+from src.models.population_nn import PopulationNeuralNetwork
+from src.models.selection import Selection
+from src.objects.bird_swarm import BirdSwarm
+
+SURVIVAL_BINS = 10
+
+Brain = Union[PopulationNeuralNetwork, NEATPopulationNetwork]
+
+
+class MutationScheduler:
+    """
+    This class adapts the mutation rate of a population each generation, from the improvement of
+    the best fitness and the diversity of the genomes.
+
+    The rate is lowered while the best fitness keeps improving, so good genomes are refined rather
+    than disrupted. If the best fitness has not improved for a number of generations, or the
+    diversity of the genomes falls below a threshold, the rate is raised to explore new genomes.
+    The rate can be kept for each layer, in which case the diversity of each layer is used for its
+    own rate. The decision made each generation is stored so it can be written to the metrics log.
+    """
+
+    def __init__(
+        self,
+        mutation_rate: float,
+        num_layers: int = 1,
+        min_rate: float = 0.01,
+        max_rate: float = 0.5,
+        increase: float = 1.5,
+        decrease: float = 0.9,
+        patience: int = 5,
+        diversity_threshold: float = 0.05,
+    ):
+        """
+        Initialise the scheduler with the starting mutation rate of each layer.
+
+        Parameters:
+            mutation_rate (float): Starting mutation rate, range [0, 1]
+            num_layers (int): Number of layers with their own rate, 1 for a rate for every gene
+            min_rate (float): Lowest mutation rate
+            max_rate (float): Highest mutation rate
+            increase (float): Factor to raise the rate by when exploring
+            decrease (float): Factor to lower the rate by when the best fitness improves
+            patience (int): Number of generations without improvement before the rate is raised
+            diversity_threshold (float): Diversity below which the rate is raised
+        """
+        self.rates = np.full(num_layers, mutation_rate, dtype=float)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.patience = patience
+        self.diversity_threshold = diversity_threshold
+        self.best_fitness = -np.inf
+        self.stagnation = 0
+        self.decision = "initial"
+
+    @classmethod
+    def create(cls, config_schedule: Dict[str, Any], mutation_rate: float, num_layers: int) -> "MutationScheduler":
+        """
+        Create a mutation scheduler from config file.
+
+        Parameters:
+            config_schedule (Dict(str, Any)): Mutation schedule configuration
+            mutation_rate (float): Starting mutation rate, range [0, 1]
+            num_layers (int): Number of layers with their own rate, 1 for a rate for every gene
+
+        Returns:
+            (MutationScheduler): Configured mutation scheduler
+        """
+        return cls(
+            mutation_rate,
+            num_layers,
+            config_schedule["min_rate"],
+            config_schedule["max_rate"],
+            config_schedule["increase"],
+            config_schedule["decrease"],
+            config_schedule["patience"],
+            config_schedule["diversity_threshold"],
+        )
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """
+        Return the state of the scheduler so it can be saved in a checkpoint.
+
+        Returns:
+            (Dict[str, Any]): Mutation rates, best fitness, generations without improvement and decision
+        """
+        return {
+            "rates": self.rates.tolist(),
+            "best_fitness": float(self.best_fitness),
+            "stagnation": self.stagnation,
+            "decision": self.decision,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state of the scheduler from a checkpoint.
+
+        Parameters:
+            state (Dict[str, Any]): State returned by the state property
+        """
+        rates = np.array(state["rates"], dtype=float)
+        if rates.shape != self.rates.shape:
+            raise ValueError(f"Checkpoint has {len(rates)} mutation rates, expected {len(self.rates)}")
+
+        self.rates = rates
+        self.best_fitness = state["best_fitness"]
+        self.stagnation = state["stagnation"]
+        self.decision = state["decision"]
+
+    @property
+    def per_layer(self) -> bool:
+        """
+        Return whether each layer has its own rate.
+
+        Returns:
+            (bool): Does each layer have its own rate?
+        """
+        return len(self.rates) > 1
+
+    def update(self, best_fitness: float, diversity: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Update the mutation rates from the best fitness of the generation and the diversity of the
+        genomes.
+
+        Parameters:
+            best_fitness (float): Highest fitness in the generation
+            diversity (Optional[np.ndarray]): Diversity of each layer, or of the whole genome
+
+        Returns:
+            (np.ndarray): Mutation rate of each layer
+        """
+        factors = np.ones(len(self.rates))
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.stagnation = 0
+            factors[:] = self.decrease
+            self.decision = "improved"
+        else:
+            self.stagnation += 1
+            self.decision = "stagnant"
+            if self.stagnation >= self.patience:
+                self.stagnation = 0
+                factors[:] = self.increase
+                self.decision = "stagnated"
+
+        if diversity is not None:
+            low_diversity = np.broadcast_to(diversity < self.diversity_threshold, factors.shape)
+            if np.any(low_diversity):
+                factors[low_diversity] = self.increase
+                self.decision += ", low diversity"
+
+        self.rates = np.clip(self.rates * factors, self.min_rate, self.max_rate)
+        return self.rates
+
+
+class FitnessCache:
+    """
+    This class caches the count of each genome on a course, keyed by a hash of the genome, given by
+    the population's brain, and the seed of the course. The simulation is deterministic, so a genome always
+    survives for the same number of frames on the same course.
+
+    Before a generation is simulated, the members whose genomes were simulated on the same course
+    in the previous generation, e.g. elites on a fixed course, are given their cached counts.
+    Exact clones of another member in the generation are only simulated once and are given the
+    count of the first copy when the generation ends. Only the entries of the last generation are
+    kept, so the cache is never larger than the population.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise an empty cache.
+        """
+        self.entries: Dict[Tuple[bytes, int], int] = {}
+        self.keys: List[Tuple[bytes, int]] = []
+        self.sources = np.array([], dtype=int)
+        self.num_hits = 0
+        self.num_clones = 0
+
+    def lookup(self, digests: List[bytes], seed: int) -> np.ndarray:
+        """
+        Find the counts of the genomes which do not need to be simulated on a course. Cached
+        genomes are given their cached count and clones are given a count of 0 until store() is
+        called.
+
+        Parameters:
+            digests (List[bytes]): Hash of each member's genome
+            seed (int): Seed of course
+
+        Returns:
+            (np.ndarray): Known count of each member, -1 for members which need to be simulated
+        """
+        self.keys = [(digest, seed) for digest in digests]
+        self.sources = np.arange(len(self.keys))
+        known = np.full(len(self.keys), -1, dtype=int)
+        first_index: Dict[Tuple[bytes, int], int] = {}
+
+        for index, key in enumerate(self.keys):
+            if key in self.entries:
+                known[index] = self.entries[key]
+            elif key in first_index:
+                self.sources[index] = first_index[key]
+                known[index] = 0
+            else:
+                first_index[key] = index
+
+        self.num_clones = int(np.count_nonzero(self.sources != np.arange(len(self.keys))))
+        self.num_hits = int(np.count_nonzero(known >= 0)) - self.num_clones
+        return known
+
+    def store(self, counts: np.ndarray) -> np.ndarray:
+        """
+        Give each clone the count of its first copy and replace the cache with the counts of the
+        generation which was looked up last.
+
+        Parameters:
+            counts (np.ndarray): Count of each member after the generation was simulated
+
+        Returns:
+            (np.ndarray): Count of each member including clones
+        """
+        if len(self.keys) != len(counts):
+            return counts
+
+        counts = counts[self.sources]
+        self.entries = dict(zip(self.keys, counts.tolist()))
+        self.keys = []
+        return counts
+
+
+class Speciation:
+    """
+    This class divides a population into species of similar genomes, so new genomes compete with
+    the members of their own species rather than with the whole population.
+
+    Each member joins the species of the nearest representative from the previous generation if
+    their distance is below the threshold. New species are founded from a random sample of the
+    remaining members, each founder being the first member not within the threshold of an earlier
+    founder, and the remaining members within the threshold join the nearest founder. This repeats
+    until every member has a species or there are max_species species, after which the remaining
+    members join the nearest species. The distance between two genomes is the root
+    mean square difference of their genes, each scaled by the range of the gene, and is calculated
+    with dot products over chunks of members, so the distances of large populations never need a
+    Python loop over members or a pairwise distance matrix. The threshold is adapted each
+    generation towards a target number of species.
+
+    The fitness of each member is shared with its species by dividing it by the size of the
+    species. Each species is given a number of offspring in proportion to the sum of its shared
+    fitnesses, and the parents of its offspring are selected from its own members.
+    """
+
+    CHUNK_GENES = 2**20
+    FOUNDER_SAMPLE_SIZE = 1000
+
+    def __init__(
+        self,
+        threshold: float = 0.3,
+        max_species: int = 20,
+        target_species: int = 10,
+        threshold_step: float = 0.1,
+    ):
+        """
+        Initialise speciation without any species.
+
+        Parameters:
+            threshold (float): Distance below which a member joins a species
+            max_species (int): Maximum number of species
+            target_species (int): Number of species to adapt the threshold towards, 0 to keep it
+            threshold_step (float): Fraction of the threshold to raise or lower it by each generation
+        """
+        self.threshold = threshold
+        self.max_species = max_species
+        self.target_species = target_species
+        self.threshold_step = threshold_step
+        self.representatives: Optional[np.ndarray] = None
+        self.species = np.array([], dtype=int)
+
+    @classmethod
+    def create(cls, config_speciation: Dict[str, Any]) -> "Speciation":
+        """
+        Create speciation from config file.
+
+        Parameters:
+            config_speciation (Dict(str, Any)): Speciation configuration
+
+        Returns:
+            (Speciation): Configured speciation
+        """
+        return cls(
+            config_speciation["threshold"],
+            config_speciation["max_species"],
+            config_speciation["target_species"],
+            config_speciation["threshold_step"],
+        )
+
+    @property
+    def num_species(self) -> int:
+        """
+        Return the number of species the population was last divided into.
+
+        Returns:
+            (int): Number of species
+        """
+        return int(np.max(self.species, initial=-1)) + 1
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """
+        Return the threshold and representatives so they can be saved in a checkpoint.
+
+        Returns:
+            (Dict[str, Any]): Threshold and scaled genes of each representative
+        """
+        return {
+            "threshold": self.threshold,
+            "representatives": self.representatives.tolist() if self.representatives is not None else None,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the threshold and representatives from a checkpoint.
+
+        Parameters:
+            state (Dict[str, Any]): State returned by the state property
+        """
+        self.threshold = state["threshold"]
+        representatives = state["representatives"]
+        self.representatives = np.array(representatives, dtype=float) if representatives is not None else None
+
+    def distances(
+        self, genes: np.ndarray, scale: np.ndarray, members: np.ndarray, representatives: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the distance of each member to each representative, over chunks of members.
+
+        Parameters:
+            genes (np.ndarray): Genes of each member with shape (population, genes)
+            scale (np.ndarray): Scale of each gene
+            members (np.ndarray): Indices of members
+            representatives (np.ndarray): Scaled genes of each representative with shape
+                (representatives, genes)
+
+        Returns:
+            (np.ndarray): Distances with shape (members, representatives)
+        """
+        num_genes = genes.shape[1]
+        chunk_size = max(self.CHUNK_GENES // max(num_genes, 1), 1)
+        squares = np.sum(representatives**2, axis=1)
+        distances = np.empty((len(members), len(representatives)))
+
+        for start in range(0, len(members), chunk_size):
+            chunk = genes[members[start : start + chunk_size]] * scale
+            distances[start : start + chunk_size] = (
+                np.sum(chunk**2, axis=1)[:, np.newaxis] - 2 * chunk @ representatives.T + squares
+            )
+
+        return cast(np.ndarray, np.sqrt(np.maximum(distances, 0) / max(num_genes, 1)))
+
+    def found_species(self, candidates: np.ndarray, max_founders: int) -> np.ndarray:
+        """
+        Choose founders of new species from candidate members in turn. Each founder is the first
+        candidate which is not within the threshold of an earlier founder.
+
+        Parameters:
+            candidates (np.ndarray): Scaled genes of each candidate with shape (candidates, genes)
+            max_founders (int): Maximum number of founders
+
+        Returns:
+            (np.ndarray): Indices of founders in the candidates
+        """
+        remaining = np.arange(len(candidates))
+        founders: List[int] = []
+        while len(remaining) and len(founders) < max_founders:
+            founders.append(int(remaining[0]))
+            remaining = remaining[1:]
+            distances = np.sqrt(np.mean((candidates[remaining] - candidates[founders[-1]]) ** 2, axis=1))
+            remaining = remaining[distances >= self.threshold]
+
+        return np.array(founders, dtype=int)
+
+    def speciate(self, genes: np.ndarray, scale: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Divide the members into species, choose a random member of each species as its
+        representative for the next generation and adapt the threshold.
+
+        Parameters:
+            genes (np.ndarray): Genes of each member with shape (population, genes)
+            scale (np.ndarray): Scale of each gene
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (np.ndarray): Species of each member
+        """
+        size, num_genes = genes.shape
+        species = np.full(size, -1, dtype=int)
+        representatives = []
+
+        if self.representatives is not None and self.representatives.shape[1] == num_genes:
+            representatives = list(self.representatives[: self.max_species])
+            distances = self.distances(genes, scale, np.arange(size), np.array(representatives))
+            nearest = np.argmin(distances, axis=1)
+            within = distances[np.arange(size), nearest] < self.threshold
+            species[within] = nearest[within]
+
+        unassigned = rng.permutation(np.flatnonzero(species < 0))
+        while len(unassigned) and len(representatives) < self.max_species:
+            sample = unassigned[: self.FOUNDER_SAMPLE_SIZE]
+            founders = self.found_species(genes[sample] * scale, self.max_species - len(representatives))
+            distances = self.distances(genes, scale, unassigned, genes[sample[founders]] * scale)
+            nearest = np.argmin(distances, axis=1)
+            joined = distances[np.arange(len(unassigned)), nearest] < self.threshold
+            nearest[founders] = np.arange(len(founders))
+            joined[founders] = True
+            species[unassigned[joined]] = len(representatives) + nearest[joined]
+            representatives.extend(genes[sample[founders]] * scale)
+            unassigned = unassigned[~joined]
+
+        if len(unassigned):
+            species[unassigned] = np.argmin(self.distances(genes, scale, unassigned, np.array(representatives)), axis=1)
+
+        _, species = np.unique(species, return_inverse=True)
+        shuffled = rng.permutation(size)
+        _, first = np.unique(species[shuffled], return_index=True)
+        self.representatives = genes[shuffled[first]] * scale
+        self.species = species
+
+        if self.target_species > 0:
+            if self.num_species > self.target_species:
+                self.threshold *= 1 + self.threshold_step
+            elif self.num_species < self.target_species:
+                self.threshold *= 1 - self.threshold_step
+
+        return cast(np.ndarray, species)
+
+    def shared_fitnesses(self, fitnesses: np.ndarray) -> np.ndarray:
+        """
+        Divide the fitness of each member by the size of its species.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+
+        Returns:
+            (np.ndarray): Shared fitness of each member
+        """
+        return cast(np.ndarray, fitnesses / np.bincount(self.species)[self.species])
+
+    def offspring_counts(self, fitnesses: np.ndarray, num_offspring: int) -> np.ndarray:
+        """
+        Divide the offspring between the species in proportion to the sum of their shared
+        fitnesses, or to their sizes if every fitness is zero. The offspring left over after
+        rounding down go to the species with the largest remainders.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+            num_offspring (int): Number of offspring to divide
+
+        Returns:
+            (np.ndarray): Number of offspring of each species
+        """
+        shares = np.bincount(self.species, self.shared_fitnesses(fitnesses))
+        if np.sum(shares) <= 0:
+            shares = np.bincount(self.species).astype(float)
+
+        exact = shares / np.sum(shares) * num_offspring
+        counts = np.floor(exact).astype(int)
+        remainders = np.argsort(counts - exact)[: num_offspring - int(np.sum(counts))]
+        counts[remainders] += 1
+        return cast(np.ndarray, counts)
 
 
 class Population:
     """
     This class creates a population of members. They each have a fitness which is calculated at the
     end of each generation. This is used to select parents for the next generation, individuals
-    with higher fitness scores are more likely to reproduce. Rejection Sampling is used when
-    selecting parents. The mutation rate corresponds to the probabilty a member's genes will
-    mutate during crossover. The new genes are applied and each member and they are reset to their
-    starting conditions ready for the next generation.
+    with higher fitness scores are more likely to reproduce. The fitnesses are snapshot once per
+    generation and every parent is drawn at once by the selection method, e.g. roulette, stochastic
+    universal sampling or tournament selection. A member is never its own parent and its two
+    parents are different members. The mutation rate corresponds to the probabilty a member's
+    genes will mutate during crossover. The new genes are applied and each member and they are
+    reset to their starting conditions ready for the next generation.
+
+    If the population's brains are batched in a PopulationNeuralNetwork, the offspring of every
+    member are generated in one vectorised pass instead of one crossover per member. The brains
+    can also be NEAT genomes batched in a NEATPopulationNetwork, whose topologies evolve too. If the members
+    are stored in a BirdSwarm, the number of members alive and the best member are read from the
+    aggregates the swarm maintains, instead of checking every member.
+
+    If a MetricsLog is given, a record of the fitnesses, survival times and simulation speed of
+    each generation is written to it before reproduction.
+
+    If a MutationScheduler is given, the mutation rate is adapted each generation before
+    reproduction. The scheduler can keep a rate for each layer of the population's brain, which is
+    expanded to a rate for each gene.
+
+    The members with the highest fitnesses are elites which keep their genes unchanged in the next
+    generation, so the best genome is never lost.
+
+    If Speciation is given and the members' brains are batched, the members are divided into
+    species before reproduction, and the offspring of each species are bred from its own members.
     """
 
-    def __init__(self, population: List[Any], mutation_rate: float = 0.05):
+    MAX_RESAMPLES = 10
+
+    def __init__(
+        self,
+        population: List[Any],
+        mutation_rate: float = 0.05,
+        brain: Optional[Brain] = None,
+        selection: str = "roulette",
+        tournament_size: int = 3,
+        swarm: Optional[BirdSwarm] = None,
+        metrics: Optional[MetricsLog] = None,
+        scheduler: Optional[MutationScheduler] = None,
+        elitism: int = 0,
+        speciation: Optional[Speciation] = None,
+    ):
         """
         Initialise the population. A list of members is provided along with a mutation rate which
         corresponds to the probability the genes of each member will mutate.
@@ -21,10 +530,75 @@ class Population:
         Parameters:
             population (List(Any)): List of members in the population
             mutation_rate (float): Probability for members' genes to mutate, range [0, 1]
+            brain (Optional[Brain]): Batched neural networks of the members
+            selection (str): Name of parent selection method (roulette/sus/tournament)
+            tournament_size (int): Number of members in each tournament for tournament selection
+            swarm (Optional[BirdSwarm]): Swarm which stores the members' state
+            metrics (Optional[MetricsLog]): Log to write the metrics of each generation to
+            scheduler (Optional[MutationScheduler]): Scheduler which adapts the mutation rate
+            elitism (int): Number of members with the highest fitnesses to keep unchanged
+            speciation (Optional[Speciation]): Speciation which divides the members into species
         """
         self.population = population
         self.mutation_rate = mutation_rate
+        self.brain = brain
+        self.swarm = swarm
+        self.selection = Selection.get_selection(selection, tournament_size)
+        self.rng = np.random.default_rng()
         self.generation = 1
+        self.metrics = metrics
+        self.scheduler = scheduler
+        self.elitism = elitism
+        self.speciation = speciation
+        self.diversity: Optional[np.ndarray] = None
+        self.generation_start_time = time.perf_counter()
+
+    @classmethod
+    def create(
+        cls,
+        config_ga: Dict[str, Any],
+        population: List[Any],
+        brain: Optional[Brain] = None,
+        swarm: Optional[BirdSwarm] = None,
+        metrics: Optional[MetricsLog] = None,
+    ) -> "Population":
+        """
+        Create a population from config file.
+
+        Parameters:
+            config_ga (Dict(str, Any)): Genetic algorithm configuration
+            population (List(Any)): List of members in the population
+            brain (Optional[Brain]): Batched neural networks of the members
+            swarm (Optional[BirdSwarm]): Swarm which stores the members' state
+            metrics (Optional[MetricsLog]): Log to write the metrics of each generation to
+
+        Returns:
+            (Population): Configured population
+        """
+        scheduler = None
+        config_schedule = config_ga["mutation_schedule"]
+        if config_schedule["enabled"]:
+            num_layers = 1
+            if isinstance(brain, PopulationNeuralNetwork) and config_schedule["per_layer"]:
+                num_layers = len(brain.layer_lengths)
+            scheduler = MutationScheduler.create(config_schedule, config_ga["mutation_rate"], num_layers)
+
+        speciation = None
+        if config_ga["speciation"]["enabled"]:
+            speciation = Speciation.create(config_ga["speciation"])
+
+        return cls(
+            population,
+            config_ga["mutation_rate"],
+            brain,
+            config_ga["selection"],
+            config_ga["tournament_size"],
+            swarm,
+            metrics,
+            scheduler,
+            config_ga["elitism"],
+            speciation,
+        )
 
     @property
     def best_member(self) -> Any:
@@ -35,6 +609,9 @@ class Population:
         Returns:
             best_member (Any): Member with highest fitness or first one in population
         """
+        if self.swarm is not None:
+            return self.population[self.swarm.best_index]
+
         best_member = None
         best_fitness = 0
 
@@ -56,6 +633,9 @@ class Population:
         Returns:
             num_alive (int): Number of members alive in population
         """
+        if self.swarm is not None:
+            return self.swarm.num_alive
+
         num_alive = 0
         for member in self.population:
             num_alive += member.alive
@@ -72,50 +652,282 @@ class Population:
         """
         return self.population[np.random.randint(len(self.population))]
 
+    @property
+    def fitnesses(self) -> np.ndarray:
+        """
+        Return a snapshot of the fitness of each member in the population.
+
+        Returns:
+            (np.ndarray): Fitness of each member
+        """
+        return np.array([member.fitness for member in self.population], dtype=float)
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """
+        Return the state of the population which is not stored in the genomes, so it can be saved
+        in a checkpoint.
+
+        Returns:
+            (Dict[str, Any]): State of the mutation scheduler and speciation, if there are any
+        """
+        state = {}
+        if self.scheduler is not None:
+            state["scheduler"] = self.scheduler.state
+        if self.speciation is not None:
+            state["speciation"] = self.speciation.state
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state of the population which is not stored in the genomes from a checkpoint.
+
+        Parameters:
+            state (Dict[str, Any]): State returned by the state property
+        """
+        if self.scheduler is not None and "scheduler" in state:
+            self.scheduler.load_state(state["scheduler"])
+            self.mutation_rate = float(np.mean(self.scheduler.rates))
+        if self.speciation is not None and "speciation" in state:
+            self.speciation.load_state(state["speciation"])
+
+    @property
+    def gene_mutation_rates(self) -> npt.ArrayLike:
+        """
+        Return the mutation rate to use for the population's brain, which is a rate for each gene if
+        the scheduler keeps a rate for each layer.
+
+        Returns:
+            (npt.ArrayLike): Mutation rate, or mutation rate of each gene
+        """
+        if (
+            self.scheduler is None
+            or not self.scheduler.per_layer
+            or not isinstance(self.brain, PopulationNeuralNetwork)
+        ):
+            return self.mutation_rate
+
+        return np.repeat(self.scheduler.rates, self.brain.layer_lengths)
+
+    def update_mutation_rate(self, fitnesses: np.ndarray) -> None:
+        """
+        Update the mutation rate with the scheduler from the best fitness of the generation and the
+        diversity of the population's brain.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+        """
+        if self.scheduler is None:
+            return
+
+        if self.brain is not None:
+            self.diversity = self.brain.diversity(self.scheduler.per_layer, self.rng)
+
+        rates = self.scheduler.update(float(np.max(fitnesses)), self.diversity)
+        self.mutation_rate = float(np.mean(rates))
+
+    @property
+    def counts(self) -> np.ndarray:
+        """
+        Return the number of frames each member in the population survived for.
+
+        Returns:
+            (np.ndarray): Count of each member
+        """
+        if self.swarm is not None:
+            return self.swarm.count.copy()
+
+        return np.array([member.count for member in self.population])
+
+    def generation_record(self, fitnesses: np.ndarray) -> Dict[str, Any]:
+        """
+        Return the training metrics of the current generation: fitness statistics, a histogram of
+        the members' survival times, the number of frames simulated, the wall time since the
+        generation started, the simulated frames per second and the mutation rate. If the mutation
+        rate is scheduled, the decision of the scheduler and the diversity of the genomes are added.
+        If the members were divided into species, the number of species and threshold are added.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+
+        Returns:
+            (Dict[str, Any]): Metrics of generation
+        """
+        counts = self.counts
+        wall_time = time.perf_counter() - self.generation_start_time
+        frames = int(np.max(counts))
+        p10, p25, median, p75, p90 = np.percentile(fitnesses, [10, 25, 50, 75, 90])
+        histogram, bin_edges = np.histogram(counts, bins=SURVIVAL_BINS)
+
+        record = {
+            "generation": self.generation,
+            "best_fitness": float(np.max(fitnesses)),
+            "mean_fitness": float(np.mean(fitnesses)),
+            "median_fitness": float(median),
+            "p10_fitness": float(p10),
+            "p25_fitness": float(p25),
+            "p75_fitness": float(p75),
+            "p90_fitness": float(p90),
+            "survival_histogram": {"bin_edges": bin_edges.tolist(), "counts": histogram.tolist()},
+            "frames": frames,
+            "bird_frames": int(np.sum(counts)),
+            "wall_time": wall_time,
+            "frames_per_sec": frames / wall_time if wall_time > 0 else 0.0,
+            "mutation_rate": self.mutation_rate,
+            "elites": min(self.elitism, len(fitnesses)),
+        }
+
+        if self.scheduler is not None:
+            record["mutation_rates"] = self.scheduler.rates.tolist()
+            record["mutation_decision"] = self.scheduler.decision
+            record["diversity"] = self.diversity.tolist() if self.diversity is not None else None
+
+        if self.speciation is not None and self.brain is not None:
+            record["species"] = self.speciation.num_species
+            record["species_threshold"] = self.speciation.threshold
+
+        return record
+
     def evaluate(self) -> None:
         """
-        Calculate the fitness of each member in the population. Then, use the fitnesses of each
-        member to select parents to pass their genes on to the next generation via crossover and
-        mutation. Once the new genetics have been generated for each member, apply them and reset
-        them to their starting conditions i.e. reset their positions.
+        Calculate the fitness of each member in the population and write the metrics of the
+        generation to the metrics log. Then, use the fitnesses of each member to select parents to
+        pass their genes on to the next generation via crossover and mutation. Once the new
+        genetics have been generated for each member, apply them and reset them to their starting
+        conditions i.e. reset their positions. If the mutation rate is scheduled, it is updated
+        before reproduction. Elites keep their genes and are only reset. If the members are divided
+        into species, the parents of each offspring are selected from one species.
         """
-        for member in self.population:
-            parentA = self.select_parent(member)
-            parentB = self.select_parent(member, parentA)
+        fitnesses = self.fitnesses
+        self.update_mutation_rate(fitnesses)
+        elites = self.select_elites(fitnesses)
 
-            member.crossover(parentA, parentB, self.mutation_rate)
+        if self.speciation is not None and self.brain is not None:
+            genes, scale = self.brain.compatibility_genes()
+            self.speciation.speciate(genes, scale, self.rng)
+            parents_a, parents_b = self.select_species_parents(fitnesses, elites, self.speciation)
+        else:
+            parents_a, parents_b = self.select_parents(fitnesses)
 
-        for member in self.population:
-            member.apply()
-            member.reset()
+        if self.metrics is not None and self.metrics.enabled:
+            self.metrics.write(self.generation_record(fitnesses))
+
+        if self.brain is None:
+            offspring = np.setdiff1d(np.arange(len(self.population)), elites)
+            for index in offspring:
+                member = self.population[index]
+                member.crossover(
+                    self.population[parents_a[index]], self.population[parents_b[index]], self.mutation_rate
+                )
+
+            for index in offspring:
+                self.population[index].apply()
+        else:
+            self.brain.crossover(parents_a, parents_b, self.gene_mutation_rates, self.rng, elites)
+
+        if self.swarm is None:
+            for member in self.population:
+                member.reset()
+        else:
+            self.swarm.reset()
 
         self.generation += 1
+        self.generation_start_time = time.perf_counter()
+
+    def select_elites(self, fitnesses: np.ndarray) -> np.ndarray:
+        """
+        Select the members with the highest fitnesses which keep their genes.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+
+        Returns:
+            (np.ndarray): Indices of elites
+        """
+        num_elites = min(self.elitism, len(fitnesses))
+        if num_elites <= 0:
+            return np.array([], dtype=int)
 
-    def rejection_sampling(self, member: Any) -> bool:
+        return np.sort(np.argpartition(-fitnesses, num_elites - 1)[:num_elites])
+
+    def select_parents(self, fitnesses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Use Rejection Sampling to accept or reject a member.
+        Select two parents for every member of the population using the selection method. Parents
+        which are the member itself, or a second parent which is the same as the first, are drawn
+        again together up to MAX_RESAMPLES times. Any which still collide are kept, e.g. if only
+        one member has a non-zero fitness.
 
         Parameters:
-            member (Any): Member to check against algorithm
+            fitnesses (np.ndarray): Fitness of each member
 
         Returns:
-            (bool): True if member passes Rejection sampling.
+            (Tuple[np.ndarray, np.ndarray]): Indices of the first and second parent of each member
         """
-        return cast(bool, np.random.uniform(0, 1) < member.fitness / self.best_member.fitness)
+        size = len(self.population)
+        parents = self.selection(fitnesses, 2 * size, self.rng)
+        parents_a, parents_b = parents[:size], parents[size:]
+        members = np.arange(size)
+
+        for _ in range(self.MAX_RESAMPLES):
+            collide_a = parents_a == members
+            collide_b = (parents_b == members) | (parents_b == parents_a)
+            num_collide_a = int(np.count_nonzero(collide_a))
+            num_collide_b = int(np.count_nonzero(collide_b))
+            if num_collide_a == 0 and num_collide_b == 0:
+                break
 
-    def select_parent(self, member: Any, other_parent: Optional[Any] = None) -> Any:
+            if num_collide_a:
+                parents_a[collide_a] = self.selection(fitnesses, num_collide_a, self.rng)
+            if num_collide_b:
+                parents_b[collide_b] = self.selection(fitnesses, num_collide_b, self.rng)
+
+        return parents_a, parents_b
+
+    def select_species_parents(
+        self, fitnesses: np.ndarray, elites: np.ndarray, speciation: Speciation
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Select a random parent from the population.
+        Select two parents from the same species for every member which is not an elite, using the
+        selection method on the fitnesses of the species.
+        Second parents which are the same as the first are drawn again up to MAX_RESAMPLES times.
+        Elites are their own parents, as they are kept unchanged.
 
         Parameters:
-            member (Any): Member of population to select parents for
-            other_parent (Optional(Any)): Other parent if selected
+            fitnesses (np.ndarray): Fitness of each member
+            elites (np.ndarray): Indices of elites
+            speciation (Speciation): Speciation which has divided the members into species
 
         Returns:
-            parent(Any): Member of population if passed Rejection Sampling
+            (Tuple[np.ndarray, np.ndarray]): Indices of the first and second parent of each member
         """
-        while True:
-            potential_parent = self.random_member
-            if potential_parent != member and potential_parent != other_parent:
-                if self.rejection_sampling(potential_parent):
-                    return potential_parent
+        size = len(self.population)
+        species = speciation.species
+        offspring = np.setdiff1d(np.arange(size), elites)
+        counts = speciation.offspring_counts(fitnesses, len(offspring))
+
+        parents_a = np.arange(size)
+        parents_b = np.arange(size)
+        order = np.argsort(species, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(species))])
+        start = 0
+
+        for species_index in np.flatnonzero(counts):
+            members = order[bounds[species_index] : bounds[species_index + 1]]
+            count = int(counts[species_index])
+            member_fitnesses = fitnesses[members]
+            species_a = members[self.selection(member_fitnesses, count, self.rng)]
+            species_b = members[self.selection(member_fitnesses, count, self.rng)]
+
+            for _ in range(self.MAX_RESAMPLES if len(members) > 1 else 0):
+                collide = species_b == species_a
+                num_collide = int(np.count_nonzero(collide))
+                if num_collide == 0:
+                    break
+                species_b[collide] = members[self.selection(member_fitnesses, num_collide, self.rng)]
+
+            children = offspring[start : start + count]
+            parents_a[children] = species_a
+            parents_b[children] = species_b
+            start += count
+
+        return parents_a, parents_b
@@ -1,9 +1,10 @@
 from typing import List
 
 import numpy as np
+import numpy.typing as npt
 
 from src.models.activation_functions import ActivationFunctions
-from src.utils.matrix_utils import select_gene
+from src.utils.matrix_utils import select_genes
 
 
 class Layer:
@@ -12,9 +13,15 @@ class Layer:
     nodes. They also have a weights matrix and a bias matrix for the feedforward algorithm.
     Each node is mapped through an activation function.
 
+    Node values are stored as 1D arrays and activation functions are applied to the whole array in
+    place, so the cost of the feedforward algorithm is dominated by the matrix multiplication.
+    The weights, biases and node values all use the layer's dtype, e.g. float32 halves their
+    memory.
+
     The crossover() method mixes the weights and biases of two neural networks with a chance for
     any given value to be chosen at random, determined by the mutation rate. The apply() method
-    overwrites the weights and biases with the newly calculated ones.
+    overwrites the weights and biases with the newly calculated ones in place, so the weights and
+    biases can be views of a population's genome array.
     """
 
     def __init__(
@@ -24,6 +31,7 @@ class Layer:
         activation: str = "linear",
         weights_range: List[float] = [-1, 1],
         bias_range: List[float] = [-1, 1],
+        dtype: npt.DTypeLike = "float64",
     ):
         """
         Create a new layer with the following properties.
@@ -34,15 +42,17 @@ class Layer:
             activation (str): Activation function to use
             weights_range (List[float]): Range to use for elements random weights matrix
             bias_range (List[float]): Range to use for elements random bias matrix
+            dtype (npt.DTypeLike): Data type of weights, biases and node values
         """
         self.name = name
         self.num_nodes = num_nodes
         self.activation = ActivationFunctions.get_activation(activation)
         self.weights_range = weights_range
         self.bias_range = bias_range
+        self.dtype = np.dtype(dtype)
 
     @classmethod
-    def input_layer(cls, name: str, values: np.ndarray, activation: str) -> "Layer":
+    def input_layer(cls, name: str, values: np.ndarray, activation: str, dtype: npt.DTypeLike = "float64") -> "Layer":
         """
         Generate input layer with list of values.
 
@@ -50,11 +60,12 @@ class Layer:
             name (str): Name of layer
             values (List[float]): Values to assign to nodes
             activation (str): Activation function to use
+            dtype (npt.DTypeLike): Data type of node values
 
         Returns:
             (Layer): Layer with assigned node values
         """
-        layer = cls(name, len(values), activation)
+        layer = cls(name, len(values), activation, dtype=dtype)
         layer.set_values(values)
         return layer
 
@@ -66,8 +77,10 @@ class Layer:
         Parameters:
             cols (int): Number of columns for weights matrix
         """
-        self.weights = np.random.uniform(self.weights_range[0], self.weights_range[1], size=(self.num_nodes, cols))
-        self.bias = np.random.uniform(self.bias_range[0], self.bias_range[1], size=(self.num_nodes, 1))
+        self.weights = np.random.uniform(
+            self.weights_range[0], self.weights_range[1], size=(self.num_nodes, cols)
+        ).astype(self.dtype)
+        self.bias = np.random.uniform(self.bias_range[0], self.bias_range[1], size=self.num_nodes).astype(self.dtype)
 
     def set_values(self, values: np.ndarray) -> None:
         """
@@ -76,7 +89,8 @@ class Layer:
         Parameters:
             values (List[float]): Values to assign to nodes
         """
-        self.values = np.matrix([[self.activation(v)] for v in values])
+        node_values = np.array(values, dtype=self.dtype)
+        self.values = self.activation(node_values, out=node_values)
 
     def feedforward(self, values: np.ndarray) -> None:
         """
@@ -88,13 +102,14 @@ class Layer:
         N = Number of nodes
 
         Feedforward: M_(i) = W_(i) x M_(i-1) + B_(i)
-        Shape: (N_(i), 1) = (N_(i), N_(i-1)) x (N_(i-1), 1) + (N_(i), 1)
+        Shape: (N_(i),) = (N_(i), N_(i-1)) x (N_(i-1),) + (N_(i),)
 
         Parameters:
             values (np.ndarray): Node values from previous layer
         """
-        self.values = self.weights.dot(values) + self.bias
-        self.values = np.vectorize(self.activation)(self.values)
+        node_values = self.weights.dot(values)
+        node_values += self.bias
+        self.values = self.activation(node_values, out=node_values)
 
     def crossover(self, layer: "Layer", other_layer: "Layer", mutation_rate: float) -> None:
         """
@@ -105,7 +120,7 @@ class Layer:
             other_layer (Layer): Other layer to use
             mutation_rate (float): Probability for random mutation, range [0, 1]
         """
-        self.new_weights = np.vectorize(select_gene)(
+        self.new_weights = select_genes(
             layer.weights,
             other_layer.weights,
             mutation_rate,
@@ -113,7 +128,7 @@ class Layer:
             self.weights_range[1],
         )
 
-        self.new_bias = np.vectorize(select_gene)(
+        self.new_bias = select_genes(
             layer.bias,
             other_layer.bias,
             mutation_rate,
@@ -123,7 +138,7 @@ class Layer:
 
     def apply(self) -> None:
         """
-        Overwrite weights and bias matrices with new values.
+        Overwrite weights and bias matrices with new values in place.
         """
-        self.weights = self.new_weights
-        self.bias = self.new_bias
+        self.weights[:] = self.new_weights
+        self.bias[:] = self.new_bias
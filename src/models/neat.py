@@ -0,0 +1,883 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.activation_functions import Activation, ActivationFunctions
+
+Level = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def group_levels(node_levels: np.ndarray, sources: np.ndarray, targets: np.ndarray) -> List[Level]:
+    """
+    Group nodes and the connections into them by the level of the nodes. The nodes keep their
+    order within each level, and input nodes, which have a level of -1, are left out.
+
+    Parameters:
+        node_levels (np.ndarray): Level of each node
+        sources (np.ndarray): Index of the node each connection starts at
+        targets (np.ndarray): Index of the node each connection ends at
+
+    Returns:
+        (List[Level]): Index of each node in a level, and the source node, position of the target
+            node in the level, and index of each connection into the level
+    """
+    num_levels = int(np.max(node_levels)) + 1
+    computed = np.flatnonzero(node_levels >= 0)
+    order = computed[np.argsort(node_levels[computed], kind="stable")]
+    node_bounds = np.concatenate([[0], np.cumsum(np.bincount(node_levels[order], minlength=num_levels))])
+    positions = np.zeros(len(node_levels), dtype=int)
+    positions[order] = np.arange(len(order)) - node_bounds[node_levels[order]]
+
+    connection_levels = node_levels[targets]
+    connection_order = np.argsort(connection_levels, kind="stable")
+    connection_bounds = np.concatenate([[0], np.cumsum(np.bincount(connection_levels, minlength=num_levels))])
+
+    levels = []
+    for level in range(num_levels):
+        connections = connection_order[connection_bounds[level] : connection_bounds[level + 1]]
+        levels.append(
+            (
+                order[node_bounds[level] : node_bounds[level + 1]],
+                sources[connections],
+                positions[targets[connections]],
+                connections,
+            )
+        )
+    return levels
+
+
+def cross_genes(
+    ids: List[np.ndarray],
+    values: List[List[np.ndarray]],
+    parents_a: np.ndarray,
+    parents_b: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Cross over the genes of many pairs of genomes at once. Each child has the genes of its first
+    parent, and the value of each gene which the second parent also has is taken from either parent
+    at random. The genes of the second parents are found by sorting the genes of every genome by
+    their genome and id, so no genome is aligned on its own.
+
+    Parameters:
+        ids (List[np.ndarray]): Innovation numbers or node ids of the genes of each genome
+        values (List[List[np.ndarray]]): Values of the genes of each genome, e.g. weights, which
+            are swapped together
+        parents_a (np.ndarray): Index of the first parent of each child
+        parents_b (np.ndarray): Index of the second parent of each child
+        rng (np.random.Generator): Random number generator to use
+
+    Returns:
+        (Tuple[List[np.ndarray], np.ndarray]): Concatenated values of the children's genes, and
+            the index after the last gene of each child
+    """
+    lengths = np.array([len(genome_ids) for genome_ids in ids])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    flat_ids = np.concatenate(ids)
+    stride = int(np.max(flat_ids)) + 1
+    keys = np.repeat(np.arange(len(ids), dtype=np.int64) * stride, lengths) + flat_ids
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    counts = lengths[parents_a]
+    ends = np.cumsum(counts)
+    genes = np.repeat(offsets[parents_a] - (ends - counts), counts) + np.arange(ends[-1])
+    queries = np.repeat(parents_b.astype(np.int64) * stride, counts) + flat_ids[genes]
+    positions = np.minimum(np.searchsorted(sorted_keys, queries), len(sorted_keys) - 1)
+    swap = (sorted_keys[positions] == queries) & (rng.random(len(genes)) < 0.5)
+    genes = np.where(swap, order[positions], genes)
+    return [np.concatenate(genome_values)[genes] for genome_values in values], ends
+
+
+class InnovationTracker:
+    """
+    This class numbers the structural innovations of a population of NEAT genomes. Each new
+    connection between two nodes is given an innovation number, and each connection which is split
+    by a new node is given the id of the new node. The same innovation is always given the same
+    number, so the genes of different genomes can be aligned by their innovation numbers.
+    """
+
+    def __init__(self, num_nodes: int):
+        """
+        Initialise the tracker after the input and output nodes, which every genome shares.
+
+        Parameters:
+            num_nodes (int): Number of input and output nodes
+        """
+        self.next_node = num_nodes
+        self.next_innovation = 0
+        self.connections: Dict[Tuple[int, int], int] = {}
+        self.splits: Dict[int, int] = {}
+
+    def connection(self, in_node: int, out_node: int) -> int:
+        """
+        Return the innovation number of a connection between two nodes.
+
+        Parameters:
+            in_node (int): Id of node the connection starts at
+            out_node (int): Id of node the connection ends at
+
+        Returns:
+            (int): Innovation number of connection
+        """
+        key = (in_node, out_node)
+        if key not in self.connections:
+            self.connections[key] = self.next_innovation
+            self.next_innovation += 1
+        return self.connections[key]
+
+    def split(self, innovation: int) -> int:
+        """
+        Return the id of the node which splits a connection.
+
+        Parameters:
+            innovation (int): Innovation number of connection
+
+        Returns:
+            (int): Id of node
+        """
+        if innovation not in self.splits:
+            self.splits[innovation] = self.new_node()
+        return self.splits[innovation]
+
+    def new_node(self) -> int:
+        """
+        Return the id of a node which has not been used before.
+
+        Returns:
+            (int): Id of node
+        """
+        node = self.next_node
+        self.next_node += 1
+        return node
+
+
+class FeedforwardPlan:
+    """
+    This class is the compiled evaluation plan of a NEAT genome. Each node's depth is the length of
+    the longest path to it from an input node. The hidden nodes are sorted topologically into
+    levels by their depth, so every connection into a level comes from an input node or an earlier
+    level, and the output nodes form the last level. Each level is calculated with one gather of
+    its source values, one weighted bincount into its nodes and one activation.
+
+    The plan only stores the indices of the genome's nodes and connections, so it stays valid when
+    the weights and biases change and only has to be compiled again when the topology changes.
+    """
+
+    def __init__(
+        self,
+        num_inputs: int,
+        num_outputs: int,
+        depths: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+    ):
+        """
+        Initialise the plan with the level of each node.
+
+        Parameters:
+            num_inputs (int): Number of input nodes
+            num_outputs (int): Number of output nodes
+            depths (np.ndarray): Depth of each node
+            sources (np.ndarray): Index of the node each connection starts at
+            targets (np.ndarray): Index of the node each connection ends at
+        """
+        num_fixed = num_inputs + num_outputs
+        self.num_nodes = len(depths)
+        self.inputs = np.arange(num_inputs)
+        self.outputs = np.arange(num_inputs, num_fixed)
+        self.depths = depths
+        self.sources = sources
+        self.targets = targets
+        self.num_hidden_levels = int(np.max(depths[num_fixed:], initial=0))
+
+        self.node_levels = depths - 1
+        self.node_levels[self.outputs] = self.num_hidden_levels
+        self.cached_levels: Optional[List[Level]] = None
+
+    @property
+    def levels(self) -> List[Level]:
+        """
+        Return the nodes and connections of the genome grouped by level. The levels are only
+        grouped when a single genome is evaluated, as a population groups its genomes' nodes
+        together.
+
+        Returns:
+            (List[Level]): Index of each node in a level, and the source node, position of the
+                target node in the level, and index of each connection into the level
+        """
+        if self.cached_levels is None:
+            self.cached_levels = group_levels(self.node_levels, self.sources, self.targets)
+        return self.cached_levels
+
+
+class NEATGenome:
+    """
+    This class is a NEAT genome made of node genes and connection genes. The nodes are identified
+    by their ids: the input nodes come first, then the output nodes, then hidden nodes added by
+    mutations. Each connection has the innovation number given to it by an InnovationTracker, a
+    weight, and an enabled flag. Connections never end at an input node or start at an output node
+    and never create a cycle, so every genome is a feedforward network.
+
+    The add_connection() and add_node() methods grow the topology, and crossover() aligns the
+    connections of two genomes by their innovation numbers. The genome is compiled into a
+    FeedforwardPlan when it is first evaluated, and the plan is cached until the topology changes.
+    A child of crossover has the topology of its first parent, so it shares the parent's plan.
+    """
+
+    def __init__(
+        self,
+        num_inputs: int,
+        num_outputs: int,
+        nodes: np.ndarray,
+        biases: np.ndarray,
+        innovations: np.ndarray,
+        connections: np.ndarray,
+        weights: np.ndarray,
+        enabled: np.ndarray,
+        weights_range: List[float] = [-1, 1],
+        bias_range: List[float] = [-1, 1],
+        plan: Optional[FeedforwardPlan] = None,
+    ):
+        """
+        Create a genome from its genes. The arrays of node and connection ids are never modified in
+        place, so genomes with the same topology can share them.
+
+        Parameters:
+            num_inputs (int): Number of input nodes
+            num_outputs (int): Number of output nodes
+            nodes (np.ndarray): Id of each node, starting with the input and output nodes
+            biases (np.ndarray): Bias of each node
+            innovations (np.ndarray): Innovation number of each connection
+            connections (np.ndarray): Ids of the nodes each connection starts and ends at, with
+                shape (connections, 2)
+            weights (np.ndarray): Weight of each connection
+            enabled (np.ndarray): Is each connection enabled?
+            weights_range (List[float]): Range of random weights
+            bias_range (List[float]): Range of random biases
+            plan (Optional[FeedforwardPlan]): Compiled plan of a genome with the same topology
+        """
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.nodes = nodes
+        self.biases = biases
+        self.innovations = innovations
+        self.connections = connections
+        self.weights = weights
+        self.enabled = enabled
+        self.weights_range = weights_range
+        self.bias_range = bias_range
+        self.cached_plan = plan
+
+    @classmethod
+    def create(
+        cls,
+        num_inputs: int,
+        num_outputs: int,
+        tracker: InnovationTracker,
+        weights_range: List[float] = [-1, 1],
+        bias_range: List[float] = [-1, 1],
+        rng: Optional[np.random.Generator] = None,
+    ) -> "NEATGenome":
+        """
+        Create a minimal genome with every input node connected to every output node, and random
+        weights and biases.
+
+        Parameters:
+            num_inputs (int): Number of input nodes
+            num_outputs (int): Number of output nodes
+            tracker (InnovationTracker): Tracker to number the connections with
+            weights_range (List[float]): Range of random weights
+            bias_range (List[float]): Range of random biases
+            rng (Optional[np.random.Generator]): Random number generator to use
+
+        Returns:
+            (NEATGenome): Minimal genome
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        nodes = np.arange(num_inputs + num_outputs)
+        connections = np.array(
+            [(in_node, out_node) for out_node in nodes[num_inputs:] for in_node in nodes[:num_inputs]], dtype=int
+        ).reshape(-1, 2)
+        innovations = np.array([tracker.connection(int(a), int(b)) for a, b in connections], dtype=int)
+
+        return cls(
+            num_inputs,
+            num_outputs,
+            nodes,
+            np.concatenate([np.zeros(num_inputs), rng.uniform(bias_range[0], bias_range[1], num_outputs)]),
+            innovations,
+            connections,
+            rng.uniform(weights_range[0], weights_range[1], len(connections)),
+            np.ones(len(connections), dtype=bool),
+            weights_range,
+            bias_range,
+        )
+
+    @property
+    def plan(self) -> FeedforwardPlan:
+        """
+        Return the compiled plan of the genome, compiling it if the topology has changed.
+
+        Returns:
+            (FeedforwardPlan): Evaluation plan
+        """
+        if self.cached_plan is None:
+            self.cached_plan = self.compile()
+        return self.cached_plan
+
+    @property
+    def effective_weights(self) -> np.ndarray:
+        """
+        Return the weight of each connection, or 0 if it is disabled.
+
+        Returns:
+            (np.ndarray): Weight of each connection
+        """
+        return np.where(self.enabled, self.weights, 0.0)
+
+    def node_indices(self, node_ids: np.ndarray) -> np.ndarray:
+        """
+        Return the index of each node id in the genome's nodes.
+
+        Parameters:
+            node_ids (np.ndarray): Ids of nodes
+
+        Returns:
+            (np.ndarray): Index of each node
+        """
+        order = np.argsort(self.nodes)
+        return order[np.searchsorted(self.nodes, node_ids, sorter=order)]
+
+    def compile(self) -> FeedforwardPlan:
+        """
+        Calculate the depth of each node and compile the plan. The depths are relaxed with every
+        connection at once until they stop changing, which takes one pass per level. Disabled
+        connections are kept in the plan with a weight of 0, so enabling or disabling a connection
+        does not change the plan.
+
+        Returns:
+            (FeedforwardPlan): Evaluation plan
+        """
+        sources = self.node_indices(self.connections[:, 0])
+        targets = self.node_indices(self.connections[:, 1])
+
+        depths = np.zeros(len(self.nodes), dtype=int)
+        for _ in range(len(self.nodes)):
+            new_depths = np.zeros_like(depths)
+            np.maximum.at(new_depths, targets, depths[sources] + 1)
+            if np.array_equal(new_depths, depths):
+                break
+            depths = new_depths
+
+        return FeedforwardPlan(self.num_inputs, self.num_outputs, depths, sources, targets)
+
+    def feedforward(
+        self,
+        inputs: np.ndarray,
+        hidden_activation: Activation = ActivationFunctions.relu,
+        output_activation: Activation = ActivationFunctions.linear,
+    ) -> np.ndarray:
+        """
+        Pass the inputs through the genome's compiled plan to calculate its outputs.
+
+        Parameters:
+            inputs (np.ndarray): Input values
+            hidden_activation (Activation): Activation function of hidden nodes
+            output_activation (Activation): Activation function of output nodes
+
+        Returns:
+            (np.ndarray): Output values
+        """
+        plan = self.plan
+        weights = self.effective_weights
+        values = np.zeros(plan.num_nodes)
+        values[plan.inputs] = inputs
+
+        for level_index, (nodes, sources, positions, connections) in enumerate(plan.levels):
+            sums = np.bincount(positions, values[sources] * weights[connections], minlength=len(nodes))
+            sums += self.biases[nodes]
+            activation = output_activation if level_index == len(plan.levels) - 1 else hidden_activation
+            values[nodes] = activation(sums, out=sums)
+
+        return cast(np.ndarray, values[plan.outputs])
+
+    def add_connection(self, tracker: InnovationTracker, rng: np.random.Generator) -> bool:
+        """
+        Connect two unconnected nodes with a random weight. A connection can start at an input or
+        hidden node, and end at an output node or a hidden node deeper than the node it starts at,
+        so it never creates a cycle.
+
+        Parameters:
+            tracker (InnovationTracker): Tracker to number the connection with
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (bool): Was a connection added?
+        """
+        plan = self.plan
+        can_start = np.ones(plan.num_nodes, dtype=bool)
+        can_start[plan.outputs] = False
+        is_output = ~can_start
+        can_end = np.ones(plan.num_nodes, dtype=bool)
+        can_end[plan.inputs] = False
+
+        candidates = can_start[:, np.newaxis] & can_end & (is_output | (plan.depths[:, np.newaxis] < plan.depths))
+        candidates[plan.sources, plan.targets] = False
+        candidates = np.flatnonzero(candidates)
+        if len(candidates) == 0:
+            return False
+
+        source, target = np.divmod(candidates[rng.integers(len(candidates))], plan.num_nodes)
+        in_node, out_node = int(self.nodes[source]), int(self.nodes[target])
+        self.append_connection(
+            tracker.connection(in_node, out_node),
+            in_node,
+            out_node,
+            rng.uniform(self.weights_range[0], self.weights_range[1]),
+        )
+        self.cached_plan = None
+        return True
+
+    def add_node(self, tracker: InnovationTracker, rng: np.random.Generator) -> bool:
+        """
+        Split a random enabled connection with a new node. The connection is disabled and replaced
+        by a connection into the new node with a weight of 1, and a connection out of the new node
+        with the weight of the old connection.
+
+        Parameters:
+            tracker (InnovationTracker): Tracker to number the node and connections with
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (bool): Was a node added?
+        """
+        candidates = np.flatnonzero(self.enabled)
+        if len(candidates) == 0:
+            return False
+
+        connection = int(candidates[rng.integers(len(candidates))])
+        in_node, out_node = self.connections[connection].tolist()
+        node = tracker.split(int(self.innovations[connection]))
+        if node in self.nodes:
+            node = tracker.new_node()
+
+        self.enabled = self.enabled.copy()
+        self.enabled[connection] = False
+        self.nodes = np.append(self.nodes, node)
+        self.biases = np.append(self.biases, 0.0)
+        self.append_connection(tracker.connection(in_node, node), in_node, node, 1.0)
+        self.append_connection(tracker.connection(node, out_node), node, out_node, float(self.weights[connection]))
+        self.cached_plan = None
+        return True
+
+    def append_connection(self, innovation: int, in_node: int, out_node: int, weight: float) -> None:
+        """
+        Add an enabled connection gene. New arrays are created, so genomes sharing the old arrays
+        are unchanged.
+
+        Parameters:
+            innovation (int): Innovation number of connection
+            in_node (int): Id of node the connection starts at
+            out_node (int): Id of node the connection ends at
+            weight (float): Weight of connection
+        """
+        self.innovations = np.append(self.innovations, innovation)
+        self.connections = np.append(self.connections, [[in_node, out_node]], axis=0)
+        self.weights = np.append(self.weights, weight)
+        self.enabled = np.append(self.enabled, True)
+
+    def mutate_weights(self, mutation_rate: float, rng: np.random.Generator) -> None:
+        """
+        Replace each weight and bias with a random value with a probability of mutation_rate. The
+        biases of the input nodes are not used and stay 0.
+
+        Parameters:
+            mutation_rate (float): Probability for random mutation, range [0, 1]
+            rng (np.random.Generator): Random number generator to use
+        """
+        mutate_weights = rng.random(len(self.weights)) < mutation_rate
+        self.weights[mutate_weights] = rng.uniform(
+            self.weights_range[0], self.weights_range[1], np.count_nonzero(mutate_weights)
+        )
+
+        mutate_biases = rng.random(len(self.biases)) < mutation_rate
+        mutate_biases[: self.num_inputs] = False
+        self.biases[mutate_biases] = rng.uniform(
+            self.bias_range[0], self.bias_range[1], np.count_nonzero(mutate_biases)
+        )
+
+    @staticmethod
+    def matching_genes(ids: np.ndarray, other_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the indices of the genes which two genomes share, by their innovation numbers or
+        node ids. Genes in the same order, e.g. of genomes with the same topology, are not aligned.
+
+        Parameters:
+            ids (np.ndarray): Ids of genes of first genome
+            other_ids (np.ndarray): Ids of genes of second genome
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): Index of each shared gene in each genome
+        """
+        if ids is other_ids or np.array_equal(ids, other_ids):
+            indices = np.arange(len(ids))
+            return indices, indices
+
+        _, indices, other_indices = np.intersect1d(ids, other_ids, assume_unique=True, return_indices=True)
+        return indices, other_indices
+
+    def crossover(self, other: "NEATGenome", rng: np.random.Generator) -> "NEATGenome":
+        """
+        Create a child with the topology of this genome. The weight and enabled flag of each
+        connection which both genomes have, and the bias of each node which both genomes have, are
+        taken from either genome at random. The other genes are taken from this genome.
+
+        Parameters:
+            other (NEATGenome): Other parent
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (NEATGenome): Child genome
+        """
+        weights = self.weights.copy()
+        enabled = self.enabled.copy()
+        own, others = self.matching_genes(self.innovations, other.innovations)
+        swap = rng.random(len(own)) < 0.5
+        weights[own[swap]] = other.weights[others[swap]]
+        enabled[own[swap]] = other.enabled[others[swap]]
+
+        biases = self.biases.copy()
+        own, others = self.matching_genes(self.nodes, other.nodes)
+        swap = rng.random(len(own)) < 0.5
+        biases[own[swap]] = other.biases[others[swap]]
+
+        return NEATGenome(
+            self.num_inputs,
+            self.num_outputs,
+            self.nodes,
+            biases,
+            self.innovations,
+            self.connections,
+            weights,
+            enabled,
+            self.weights_range,
+            self.bias_range,
+            self.plan,
+        )
+
+    def copy(self) -> "NEATGenome":
+        """
+        Return a copy of the genome which shares its topology and plan.
+
+        Returns:
+            (NEATGenome): Copy of genome
+        """
+        return NEATGenome(
+            self.num_inputs,
+            self.num_outputs,
+            self.nodes,
+            self.biases.copy(),
+            self.innovations,
+            self.connections,
+            self.weights.copy(),
+            self.enabled.copy(),
+            self.weights_range,
+            self.bias_range,
+            self.cached_plan,
+        )
+
+    @property
+    def digest(self) -> bytes:
+        """
+        Return a hash of the genome's topology, weights and biases.
+
+        Returns:
+            (bytes): Digest of genome
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (self.nodes, self.biases, self.innovations, self.effective_weights):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.digest()
+
+
+class NEATPopulationNetwork:
+    """
+    This class runs the NEAT genomes of a whole population at once. The compiled plans of every
+    genome are merged into one population plan: the nodes of every genome are stored in one value
+    array, and the nth level of every genome is merged into the nth level of the population. Each
+    frame then costs a few array operations per level, however many genomes there are, so minimal
+    networks are calculated at least as fast as the dense networks of a PopulationNeuralNetwork.
+    The output level is activated with one row per genome, so e.g. softmax is applied per genome.
+
+    The crossover() method has the same signature as PopulationNeuralNetwork.crossover(), so a
+    Population can evolve either. Each child is mutated after crossover: its weights and biases
+    are mutated with the mutation rate, and nodes and connections are added with their own rates.
+    The genes of every child are crossed over and mutated at once, so only the children which gain
+    a node or connection are mutated one at a time.
+    The population plan is rebuilt after each generation from the genomes' cached plans, so only
+    the genomes whose topology changed are compiled again.
+    """
+
+    DIVERSITY_SAMPLE_SIZE = 1000
+
+    def __init__(
+        self,
+        genomes: List[NEATGenome],
+        tracker: InnovationTracker,
+        hidden_activation: str = "relu",
+        output_activation: str = "linear",
+        input_activation: str = "linear",
+        add_connection_rate: float = 0.05,
+        add_node_rate: float = 0.03,
+    ):
+        """
+        Create a batched network from a list of genomes with the same inputs and outputs.
+
+        Parameters:
+            genomes (List[NEATGenome]): Genome of each member in the population
+            tracker (InnovationTracker): Tracker of the genomes' innovations
+            hidden_activation (str): Activation function of hidden nodes
+            output_activation (str): Activation function of output nodes
+            input_activation (str): Activation function of input values
+            add_connection_rate (float): Probability for a child to gain a connection, range [0, 1]
+            add_node_rate (float): Probability for a child to gain a node, range [0, 1]
+        """
+        self.genomes = genomes
+        self.tracker = tracker
+        self.hidden_activation = ActivationFunctions.get_activation(hidden_activation)
+        self.output_activation = ActivationFunctions.get_activation(output_activation)
+        self.input_activation = ActivationFunctions.get_activation(input_activation)
+        self.add_connection_rate = add_connection_rate
+        self.add_node_rate = add_node_rate
+        self.build()
+
+    @classmethod
+    def create(
+        cls, config_nn: Dict[str, Any], population_size: int, rng: Optional[np.random.Generator] = None
+    ) -> "NEATPopulationNetwork":
+        """
+        Create a population of minimal genomes from config file.
+
+        Parameters:
+            config_nn (Dict(str, Any)): Neural network configuration
+            population_size (int): Number of members in population
+            rng (Optional[np.random.Generator]): Random number generator to use
+
+        Returns:
+            (NEATPopulationNetwork): Batched network of minimal genomes
+        """
+        num_inputs = config_nn["input_layer"]["num_nodes"]
+        num_outputs = config_nn["output_layer"]["num_nodes"]
+        weights_range = [config_nn["weights_range"]["low"], config_nn["weights_range"]["high"]]
+        bias_range = [config_nn["bias_range"]["low"], config_nn["bias_range"]["high"]]
+        tracker = InnovationTracker(num_inputs + num_outputs)
+        config_neat = config_nn["neat"]
+
+        return cls(
+            [
+                NEATGenome.create(num_inputs, num_outputs, tracker, weights_range, bias_range, rng)
+                for _ in range(population_size)
+            ],
+            tracker,
+            config_neat["hidden_activation"],
+            config_nn["output_layer"]["activation"],
+            config_nn["input_layer"]["activation"],
+            config_neat["add_connection_rate"],
+            config_neat["add_node_rate"],
+        )
+
+    def build(self) -> None:
+        """
+        Merge the compiled plans of every genome into the population plan, with the weights and
+        biases of the current genomes. The nodes and connections of every genome are concatenated
+        and grouped by level at once, and the output nodes of every genome are put in the last
+        level.
+        """
+        plans = [genome.plan for genome in self.genomes]
+        num_nodes = np.array([plan.num_nodes for plan in plans])
+        node_offsets = np.concatenate([[0], np.cumsum(num_nodes)[:-1]])
+        connection_offsets = np.repeat(node_offsets, [len(plan.sources) for plan in plans])
+
+        node_levels = np.concatenate([plan.node_levels for plan in plans])
+        node_levels[node_offsets[:, np.newaxis] + plans[0].outputs] = max(plan.num_hidden_levels for plan in plans)
+        sources = np.concatenate([plan.sources for plan in plans]) + connection_offsets
+        targets = np.concatenate([plan.targets for plan in plans]) + connection_offsets
+        weights = np.concatenate([genome.weights for genome in self.genomes])
+        weights[~np.concatenate([genome.enabled for genome in self.genomes])] = 0.0
+        biases = np.concatenate([genome.biases for genome in self.genomes])
+
+        self.values = np.zeros(len(node_levels))
+        self.inputs = node_offsets[:, np.newaxis] + plans[0].inputs
+        self.levels = [
+            (nodes, level_sources, positions, weights[connections], biases[nodes])
+            for nodes, level_sources, positions, connections in group_levels(node_levels, sources, targets)
+        ]
+
+    def feedforward(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Pass the inputs of every genome through the population plan to calculate their outputs.
+
+        Parameters:
+            inputs (np.ndarray): Input values with shape (population, input nodes)
+
+        Returns:
+            (np.ndarray): Output values with shape (population, output nodes)
+        """
+        values = self.values
+        values[self.inputs] = self.input_activation(inputs)
+
+        for nodes, sources, positions, weights, biases in self.levels[:-1]:
+            sums = np.bincount(positions, values[sources] * weights, minlength=len(nodes))
+            sums += biases
+            values[nodes] = self.hidden_activation(sums, out=sums)
+
+        nodes, sources, positions, weights, biases = self.levels[-1]
+        sums = np.bincount(positions, values[sources] * weights, minlength=len(nodes))
+        sums += biases
+        outputs = sums.reshape(len(self.genomes), -1)
+        return self.output_activation(outputs, out=outputs)
+
+    def crossover(
+        self,
+        parents_a: np.ndarray,
+        parents_b: np.ndarray,
+        mutation_rate: npt.ArrayLike,
+        rng: Optional[np.random.Generator] = None,
+        keep: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Replace each genome by a mutated child of its two parents, then rebuild the population
+        plan. The genomes to keep, e.g. elites, are left unchanged.
+
+        Parameters:
+            parents_a (np.ndarray): Index of the first parent of each genome
+            parents_b (np.ndarray): Index of the second parent of each genome
+            mutation_rate (npt.ArrayLike): Probability for random mutation, range [0, 1], a rate
+                for each gene is averaged as the genomes have different lengths
+            rng (Optional[np.random.Generator]): Random number generator to use
+            keep (Optional[np.ndarray]): Indices of genomes to leave unchanged
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        rate = float(np.mean(np.asarray(mutation_rate)))
+        is_child = np.ones(len(parents_a), dtype=bool)
+        if keep is not None:
+            is_child[keep] = False
+        children = np.flatnonzero(is_child)
+        if len(children) == 0:
+            return
+
+        parents_a = np.asarray(parents_a)[children]
+        parents_b = np.asarray(parents_b)[children]
+        (weights, enabled), connection_ends = cross_genes(
+            [genome.innovations for genome in self.genomes],
+            [[genome.weights for genome in self.genomes], [genome.enabled for genome in self.genomes]],
+            parents_a,
+            parents_b,
+            rng,
+        )
+        (biases,), node_ends = cross_genes(
+            [genome.nodes for genome in self.genomes],
+            [[genome.biases for genome in self.genomes]],
+            parents_a,
+            parents_b,
+            rng,
+        )
+
+        weights_range = self.genomes[0].weights_range
+        bias_range = self.genomes[0].bias_range
+        mutate_weights = rng.random(len(weights)) < rate
+        weights[mutate_weights] = rng.uniform(weights_range[0], weights_range[1], np.count_nonzero(mutate_weights))
+        num_nodes = np.diff(node_ends, prepend=0)
+        node_positions = np.arange(len(biases)) - np.repeat(node_ends - num_nodes, num_nodes)
+        mutate_biases = (rng.random(len(biases)) < rate) & (node_positions >= self.genomes[0].num_inputs)
+        biases[mutate_biases] = rng.uniform(bias_range[0], bias_range[1], np.count_nonzero(mutate_biases))
+
+        genomes = list(self.genomes)
+        connection_bounds = np.concatenate([[0], connection_ends]).tolist()
+        node_bounds = np.concatenate([[0], node_ends]).tolist()
+        for index, (child, parent) in enumerate(zip(children.tolist(), parents_a.tolist())):
+            genome = self.genomes[parent]
+            connections = slice(connection_bounds[index], connection_bounds[index + 1])
+            genomes[child] = NEATGenome(
+                genome.num_inputs,
+                genome.num_outputs,
+                genome.nodes,
+                biases[node_bounds[index] : node_bounds[index + 1]],
+                genome.innovations,
+                genome.connections,
+                weights[connections],
+                enabled[connections],
+                weights_range,
+                bias_range,
+                genome.plan,
+            )
+
+        for child in children[rng.random(len(children)) < self.add_connection_rate]:
+            genomes[child].add_connection(self.tracker, rng)
+        for child in children[rng.random(len(children)) < self.add_node_rate]:
+            genomes[child].add_node(self.tracker, rng)
+
+        self.genomes = genomes
+        self.build()
+
+    def diversity(self, per_layer: bool = False, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Return the diversity of the genomes: the mean standard deviation of the weight of each
+        innovation across the genomes which have it, relative to the range of random weights. The
+        standard deviations are calculated over a random sample of genomes.
+
+        Parameters:
+            per_layer (bool): Unused, the genomes have no layers
+            rng (Optional[np.random.Generator]): Random number generator to sample genomes with
+
+        Returns:
+            (np.ndarray): Single diversity
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        size = len(self.genomes)
+        members = rng.choice(size, size=min(size, self.DIVERSITY_SAMPLE_SIZE), replace=False)
+        innovations = np.concatenate([self.genomes[member].innovations for member in members])
+        weights = np.concatenate([self.genomes[member].weights for member in members])
+
+        counts = np.bincount(innovations)
+        means = np.bincount(innovations, weights) / np.maximum(counts, 1)
+        squares = np.bincount(innovations, weights**2) / np.maximum(counts, 1)
+        spread = np.sqrt(np.maximum(squares - means**2, 0))[counts > 0]
+        low, high = self.genomes[0].weights_range
+        return np.array([np.mean(spread) / (high - low)])
+
+    def compatibility_genes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the genes to measure the distance between genomes with: the weight of each
+        innovation in each genome, which is 0 if the genome does not have it or it is disabled, and
+        the scale of each weight, the inverse of the range of random weights.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): Weights with shape (population, innovations), and
+                scale of each weight
+        """
+        rows = np.repeat(np.arange(len(self.genomes)), [len(genome.innovations) for genome in self.genomes])
+        genes = np.zeros((len(self.genomes), self.tracker.next_innovation))
+        genes[rows, np.concatenate([genome.innovations for genome in self.genomes])] = np.concatenate(
+            [genome.effective_weights for genome in self.genomes]
+        )
+        low, high = self.genomes[0].weights_range
+        return genes, np.full(self.tracker.next_innovation, 1 / (high - low))
+
+    def genome_digests(self) -> List[bytes]:
+        """
+        Return a hash of each genome.
+
+        Returns:
+            (List[bytes]): Digest of each genome
+        """
+        return [genome.digest for genome in self.genomes]
@@ -45,6 +45,7 @@ class NeuralNetwork:
                 name=nn_config["input_layer"]["name"],
                 values=np.array([0] * nn_config["input_layer"]["num_nodes"]),
                 activation=nn_config["input_layer"]["activation"],
+                dtype=nn_config["dtype"],
             )
         ]
 
@@ -54,6 +55,7 @@ class NeuralNetwork:
                     name=layer["name"],
                     num_nodes=layer["num_nodes"],
                     activation=layer["activation"],
+                    dtype=nn_config["dtype"],
                 )
             )
 
@@ -62,6 +64,7 @@ class NeuralNetwork:
                 name=nn_config["output_layer"]["name"],
                 num_nodes=nn_config["output_layer"]["num_nodes"],
                 activation=nn_config["output_layer"]["activation"],
+                dtype=nn_config["dtype"],
             ),
         )
 
@@ -0,0 +1,275 @@
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Tuple, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.nn import NeuralNetwork
+from src.utils.matrix_utils import select_genes
+
+
+class PopulationNeuralNetwork:
+    """
+    This class runs the neural networks of a whole population at once. The weights and biases of
+    every network are stored in one contiguous genome array with shape (population, genome length),
+    which holds the flattened weights and bias of each layer in turn. The genome array can be
+    memory-mapped from a file, so large populations do not have to fit in memory. The genome array
+    and the values calculated in feedforward() use the dtype of the networks' layers.
+
+    The weights of each layer are a view of the genome array with shape (population, nodes,
+    inputs), so each layer is calculated with a single batched matrix multiplication for all
+    networks. The layers of each network are pointed at views of the same arrays, so the networks
+    and the population share the same weights without copying them.
+
+    The crossover() method creates the offspring of the population in chunks of members, so the
+    temporary arrays stay small for large populations, then writes them into the genome array in
+    place, so the networks' views stay valid. If the genome array is memory-mapped, the offspring
+    are written to a second memory-mapped scratch file next to it rather than to memory.
+    """
+
+    CROSSOVER_CHUNK_GENES = 2**20
+    DIVERSITY_SAMPLE_SIZE = 1000
+
+    def __init__(self, networks: List[NeuralNetwork], genomes_path: Optional[Path] = None):
+        """
+        Create a batched neural network from a list of networks with the same layer sizes.
+
+        Parameters:
+            networks (List[NeuralNetwork]): Neural networks of each member in the population
+            genomes_path (Optional[Path]): Path of .npy file to memory-map the genomes to, the
+                genomes are kept in memory if None
+        """
+        self.networks = networks
+        self.layers = networks[0].layers
+        self.dtype = self.layers[0].dtype
+        self.genomes_path = genomes_path
+        self.offspring: Optional[np.ndarray] = None
+        self.input_values: Optional[np.ndarray] = None
+        self.load()
+
+    def create_genomes(self, genome_length: int, genomes_path: Optional[Path] = None) -> np.ndarray:
+        """
+        Allocate a genome array, memory-mapped to a file if a path was given.
+
+        Parameters:
+            genome_length (int): Number of weights and biases in each network
+            genomes_path (Optional[Path]): Path of .npy file to memory-map the genomes to
+
+        Returns:
+            (np.ndarray): Empty genomes with shape (population, genome length)
+        """
+        shape = (len(self.networks), genome_length)
+        if genomes_path is None:
+            return np.empty(shape, dtype=self.dtype)
+
+        genomes_path.parent.mkdir(parents=True, exist_ok=True)
+        return cast(np.ndarray, np.lib.format.open_memmap(genomes_path, mode="w+", dtype=self.dtype, shape=shape))
+
+    @property
+    def offspring_path(self) -> Optional[Path]:
+        """
+        Return the path of the scratch file the offspring are memory-mapped to, if the genomes are
+        memory-mapped.
+
+        Returns:
+            (Optional[Path]): Path of .npy file next to the genomes, or None
+        """
+        if self.genomes_path is None:
+            return None
+
+        return self.genomes_path.with_name(f"{self.genomes_path.stem}.offspring.npy")
+
+    def create_offspring(self) -> np.ndarray:
+        """
+        Return the array to write the offspring to during crossover. The scratch file of a
+        memory-mapped population is created once and reused every generation.
+
+        Returns:
+            (np.ndarray): Empty offspring with shape (population, genome length)
+        """
+        if self.genomes_path is None:
+            return self.create_genomes(self.genome_length)
+
+        if self.offspring is None:
+            self.offspring = self.create_genomes(self.genome_length, self.offspring_path)
+        return self.offspring
+
+    def load(self) -> None:
+        """
+        Copy the weights and biases of each network into the genome array, and replace each
+        network's weights and biases with views of it. The lower and upper limits of each gene for
+        random mutations are taken from the ranges of its layer.
+        """
+        size = len(self.networks)
+        shapes = [self.layers[layer_index].weights.shape for layer_index in range(1, len(self.layers))]
+        genome_length = sum(rows * cols + rows for rows, cols in shapes)
+
+        self.genomes = self.create_genomes(genome_length, self.genomes_path)
+        self.genes_low = np.empty(genome_length)
+        self.genes_high = np.empty(genome_length)
+        self.weights = []
+        self.bias = []
+        self.layer_lengths = [rows * cols + rows for rows, cols in shapes]
+
+        start = 0
+        for layer_index, (rows, cols) in enumerate(shapes, start=1):
+            layer = self.layers[layer_index]
+
+            stop = start + rows * cols
+            weights = self.genomes[:, start:stop].reshape(size, rows, cols)
+            self.genes_low[start:stop], self.genes_high[start:stop] = layer.weights_range
+
+            start, stop = stop, stop + rows
+            bias = self.genomes[:, start:stop]
+            self.genes_low[start:stop], self.genes_high[start:stop] = layer.bias_range
+            start = stop
+
+            for nn_index, nn in enumerate(self.networks):
+                weights[nn_index] = nn.layers[layer_index].weights
+                bias[nn_index] = nn.layers[layer_index].bias
+                nn.layers[layer_index].weights = weights[nn_index]
+                nn.layers[layer_index].bias = bias[nn_index]
+
+            self.weights.append(weights)
+            self.bias.append(bias)
+
+    @property
+    def genome_length(self) -> int:
+        """
+        Return the number of weights and biases in each network.
+
+        Returns:
+            (int): Length of each network's genome
+        """
+        return int(self.genomes.shape[1])
+
+    def get_genomes(self) -> np.ndarray:
+        """
+        Return a copy of the genome array in memory. Use the genomes attribute to read the
+        genomes of a large population without copying them.
+
+        Returns:
+            (np.ndarray): Genomes with shape (population, genome length)
+        """
+        return np.array(self.genomes)
+
+    def set_genomes(self, genomes: np.ndarray) -> None:
+        """
+        Overwrite the genome array in place.
+
+        Parameters:
+            genomes (np.ndarray): Genomes with shape (population, genome length)
+        """
+        self.genomes[:] = genomes
+
+    def genome_digests(self) -> List[bytes]:
+        """
+        Return a hash of the weights and biases of each network.
+
+        Returns:
+            (List[bytes]): Digest of each network's genome
+        """
+        return [hashlib.blake2b(genome.tobytes(), digest_size=16).digest() for genome in self.genomes]
+
+    def diversity(self, per_layer: bool = False, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Return the diversity of the genomes: the mean standard deviation of each gene across the
+        population, relative to the range the gene is initialised in. The standard deviations are
+        calculated over a random sample of members, so large populations are not copied.
+
+        Parameters:
+            per_layer (bool): Return the diversity of each layer instead of the whole genome?
+            rng (Optional[np.random.Generator]): Random number generator to sample members with
+
+        Returns:
+            (np.ndarray): Diversity of each layer, or a single diversity if per_layer is False
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        size = len(self.genomes)
+        members = np.sort(rng.choice(size, size=min(size, self.DIVERSITY_SAMPLE_SIZE), replace=False))
+        spread = np.std(self.genomes[members], axis=0) / (self.genes_high - self.genes_low)
+
+        if not per_layer:
+            return np.array([np.mean(spread)])
+
+        return np.array([np.mean(layer) for layer in np.split(spread, np.cumsum(self.layer_lengths)[:-1])])
+
+    def compatibility_genes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the genes to measure the distance between networks with: the genome array, which is
+        not copied, and the scale of each gene, the inverse of the range it is initialised in.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): Genomes with shape (population, genome length), and
+                scale of each gene
+        """
+        return self.genomes, 1 / (self.genes_high - self.genes_low)
+
+    def feedforward(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Pass the inputs of every network through the layers to calculate their outputs. The input
+        layer's activation is written into an input array which is reused every call.
+
+        Feedforward: M_(i) = W_(i) x M_(i-1) + B_(i)
+        Shape: (P, N_(i)) = (P, N_(i), N_(i-1)) x (P, N_(i-1)) + (P, N_(i))
+
+        Parameters:
+            inputs (np.ndarray): Input values with shape (population, input nodes)
+
+        Returns:
+            (np.ndarray): Output values with shape (population, output nodes)
+        """
+        if self.input_values is None or self.input_values.shape != np.shape(inputs):
+            self.input_values = np.empty(np.shape(inputs), dtype=self.dtype)
+        values = self.layers[0].activation(inputs, out=self.input_values)
+
+        for layer_index in range(1, len(self.layers)):
+            values = np.matmul(self.weights[layer_index - 1], values[:, :, np.newaxis])[:, :, 0]
+            values += self.bias[layer_index - 1]
+            values = self.layers[layer_index].activation(values, out=values)
+
+        return values
+
+    def crossover(
+        self,
+        parents_a: np.ndarray,
+        parents_b: np.ndarray,
+        mutation_rate: npt.ArrayLike,
+        rng: Optional[np.random.Generator] = None,
+        keep: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Crossover the weights and biases of the population. Each network is replaced by a mix of
+        its two parents, with each element having a chance to be random, determined by
+        mutation_rate. The networks to keep, e.g. elites, are left unchanged.
+
+        Parameters:
+            parents_a (np.ndarray): Index of the first parent of each network
+            parents_b (np.ndarray): Index of the second parent of each network
+            mutation_rate (npt.ArrayLike): Probability for random mutation, range [0, 1], or the
+                probability of each gene
+            rng (Optional[np.random.Generator]): Random number generator to use
+            keep (Optional[np.ndarray]): Indices of networks to leave unchanged
+        """
+        offspring = self.create_offspring()
+        chunk_size = max(self.CROSSOVER_CHUNK_GENES // self.genome_length, 1)
+
+        for start in range(0, len(offspring), chunk_size):
+            stop = start + chunk_size
+            offspring[start:stop] = select_genes(
+                self.genomes[parents_a[start:stop]],
+                self.genomes[parents_b[start:stop]],
+                mutation_rate,
+                self.genes_low,
+                self.genes_high,
+                rng,
+            )
+
+        if keep is not None and len(keep):
+            offspring[keep] = self.genomes[keep]
+
+        for start in range(0, len(offspring), chunk_size):
+            self.genomes[start : start + chunk_size] = offspring[start : start + chunk_size]
@@ -0,0 +1,100 @@
+from functools import partial
+from typing import Callable, Dict, cast
+
+import numpy as np
+
+SelectionMethod = Callable[[np.ndarray, int, np.random.Generator], np.ndarray]
+
+
+class Selection:
+    """
+    This class is a registry of parent selection methods. Each method takes a snapshot of the
+    population's fitnesses and returns the indices of the selected parents, drawing every parent at
+    once with vectorised NumPy operations. If every fitness is zero, parents are selected uniformly
+    at random, so selection always finishes in bounded time.
+    """
+
+    @staticmethod
+    def get_selection(name: str, tournament_size: int = 3) -> SelectionMethod:
+        """
+        Return selection method from name.
+
+        Parameters:
+            name (str): Name of selection method
+            tournament_size (int): Number of members in each tournament for tournament selection
+
+        Returns:
+            (SelectionMethod): Selection method
+        """
+        selection_methods: Dict[str, SelectionMethod] = {
+            "roulette": Selection.roulette,
+            "sus": Selection.stochastic_universal_sampling,
+            "tournament": partial(Selection.tournament, tournament_size=tournament_size),
+        }
+        return selection_methods[name]
+
+    @staticmethod
+    def roulette(fitnesses: np.ndarray, num_parents: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Fitness proportional selection, using the cumulative sum of the fitnesses. A random value
+        which rounds up to the total fitness selects the last member.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+            num_parents (int): Number of parents to select
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (np.ndarray): Indices of selected parents
+        """
+        cumulative_fitnesses = np.cumsum(fitnesses)
+        total_fitness = cumulative_fitnesses[-1]
+        if total_fitness <= 0:
+            return rng.integers(len(fitnesses), size=num_parents)
+
+        parents = np.searchsorted(cumulative_fitnesses, rng.random(num_parents) * total_fitness, side="right")
+        return cast(np.ndarray, np.minimum(parents, len(fitnesses) - 1))
+
+    @staticmethod
+    def stochastic_universal_sampling(fitnesses: np.ndarray, num_parents: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Fitness proportional selection using evenly spaced pointers from a single random offset,
+        which gives less spread than roulette selection. The parents are returned shuffled.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+            num_parents (int): Number of parents to select
+            rng (np.random.Generator): Random number generator to use
+
+        Returns:
+            (np.ndarray): Indices of selected parents
+        """
+        cumulative_fitnesses = np.cumsum(fitnesses)
+        total_fitness = cumulative_fitnesses[-1]
+        if total_fitness <= 0:
+            return rng.integers(len(fitnesses), size=num_parents)
+
+        step = total_fitness / num_parents
+        pointers = (rng.random() + np.arange(num_parents)) * step
+        parents = np.searchsorted(cumulative_fitnesses, pointers, side="right")
+        return rng.permutation(np.minimum(parents, len(fitnesses) - 1))
+
+    @staticmethod
+    def tournament(
+        fitnesses: np.ndarray, num_parents: int, rng: np.random.Generator, tournament_size: int = 3
+    ) -> np.ndarray:
+        """
+        Select each parent as the fittest of a number of members chosen at random.
+
+        Parameters:
+            fitnesses (np.ndarray): Fitness of each member
+            num_parents (int): Number of parents to select
+            rng (np.random.Generator): Random number generator to use
+            tournament_size (int): Number of members in each tournament
+
+        Returns:
+            (np.ndarray): Indices of selected parents
+        """
+        candidates = rng.integers(len(fitnesses), size=(num_parents, tournament_size))
+        winners = np.argmax(fitnesses[candidates], axis=1)
+        return cast(np.ndarray, candidates[np.arange(num_parents), winners])
@@ -1,9 +1,10 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pygame
 
 from src.models.nn import NeuralNetwork
+from src.objects.bird_swarm import BirdSwarm
 from src.objects.pipe import Pipe
 from src.utils.pipe_utils import get_closest_pipe
 
@@ -11,11 +12,13 @@ from src.utils.pipe_utils import get_closest_pipe
 class Bird:
     """
     This class creates a bird object which has a starting x and y position. The size of the bird is
-    set using the width and height parameters.
+    set using the width and height parameters. The bird's position, velocity, alive state and count
+    are stored in a BirdSwarm, so a whole population can be updated at once by its swarm while each
+    bird keeps the same interface.
 
     The bird is drawn to the display in the draw() method. The update() method performs physics
-    calculations and updates the bird's position, velocity, and alive state accordingly. The bird
-    dies if it collides with a pipe.
+    calculations and updates the bird's position, velocity, and alive state accordingly, without
+    drawing. The bird dies if it collides with a pipe.
 
     The bird is assigned a neural network which acts as its brain and determines when the bird
     should 'jump' based on its current position and the position of the nearest pipe. This brain
@@ -23,72 +26,93 @@ class Bird:
     incremented by 1 each time the update() method is called.
     """
 
-    def __init__(
-        self,
-        x: float,
-        y: float,
-        width: float,
-        height: float,
-        grav: float,
-        lift: float,
-        min_velocity: float,
-        config_nn: Dict[str, Any],
-    ):
+    def __init__(self, swarm: BirdSwarm, index: int, config_nn: Dict[str, Any]):
         """
-        Initialise bird with a starting position, a width and a height.
+        Initialise bird as a view of one element of a swarm of birds.
 
         Parameters:
-            x (float): x coordinate of bird's start position
-            y (float): y coordinate of bird's start position
-            width (float): Width of bird
-            height (float): Height of bird
+            swarm (BirdSwarm): Swarm which stores the bird's state
+            index (int): Index of bird in swarm
             config_nn (Dict(str, Any)): Neural network config
         """
-        self.x = x
-        self.y = y
-        self.start_y = y
-        self.width = width
-        self.height = height
-        self.GRAV = grav
-        self.LIFT = lift
-        self.MIN_VELOCITY = min_velocity
+        self.swarm = swarm
+        self.index = index
+        self.x = swarm.x
+        self.start_y = swarm.start_y
+        self.width = swarm.width
+        self.height = swarm.height
+        self.GRAV = swarm.GRAV
+        self.LIFT = swarm.LIFT
+        self.MIN_VELOCITY = swarm.MIN_VELOCITY
         self.screen = pygame.display.get_surface()
         self.color = self.random_color()
-        self.screen_width = self.screen.get_size()[0]
-        self.screen_height = self.screen.get_size()[1]
+        self.screen_width = swarm.screen_width
+        self.screen_height = swarm.screen_height
 
         self.nn = NeuralNetwork.initialise_neural_network(
             config_nn,
         )
 
     @classmethod
-    def create(cls, config_bird: Dict[str, Any], config_nn: Dict[str, Any]) -> "Bird":
+    def create(
+        cls,
+        config_bird: Dict[str, Any],
+        config_nn: Dict[str, Any],
+        swarm: Optional[BirdSwarm] = None,
+        index: int = 0,
+    ) -> "Bird":
         """
-        Create a bird from config files.
+        Create a bird from config files. If no swarm is given, the bird gets a swarm of its own.
 
         Parameters:
             config_bird (Dict(str, Any)): Bird configuration
             config_nn (Dict(str, Any)): Neural network configuration
+            swarm (Optional(BirdSwarm)): Swarm which stores the bird's state
+            index (int): Index of bird in swarm
 
         Returns:
             (Bird): Configured bird with neural network
         """
-        bird = cls(
-            config_bird["x"],
-            config_bird["y"],
-            config_bird["width"],
-            config_bird["height"],
-            config_bird["grav"],
-            config_bird["lift"],
-            config_bird["min_velocity"],
-            config_nn,
-        )
-        bird.velocity = float(0)
-        bird.alive = True
-        bird.count = 0
-        bird.rect = pygame.Rect(config_bird["x"], config_bird["y"], config_bird["width"], config_bird["height"])
+        if swarm is None:
+            swarm = BirdSwarm.create(config_bird, 1, pygame.display.get_surface().get_size(), config_nn["dtype"])
+
+        return cls(swarm, index, config_nn)
+
+    @property
+    def y(self) -> float:
+        return float(self.swarm.y[self.index])
+
+    @y.setter
+    def y(self, y: float) -> None:
+        self.swarm.y[self.index] = y
+
+    @property
+    def velocity(self) -> float:
+        return float(self.swarm.velocity[self.index])
+
+    @velocity.setter
+    def velocity(self, velocity: float) -> None:
+        self.swarm.velocity[self.index] = velocity
+
+    @property
+    def alive(self) -> bool:
+        return bool(self.swarm.alive[self.index])
+
+    @alive.setter
+    def alive(self, alive: bool) -> None:
+        self.swarm.set_alive(self.index, alive)
+
+    @property
+    def count(self) -> int:
+        return int(self.swarm.count[self.index])
+
+    @count.setter
+    def count(self, count: int) -> None:
+        self.swarm.set_count(self.index, count)
 
-        return bird
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.x, self.y, self.width, self.height)
 
     @staticmethod
     def random_color() -> tuple:
@@ -111,13 +135,18 @@ class Bird:
         """
         Set bird's alive state to false.
         """
-        self.alive = False
+        self.swarm.kill(self.index)
 
-    def draw(self) -> None:
+    def draw(self) -> pygame.Rect:
         """
         Draw bird on the display.
+
+        Returns:
+            (pygame.Rect): Rectangle of the bird
         """
-        pygame.draw.rect(self.screen, self.color, self.rect)
+        rect = self.rect
+        pygame.draw.rect(self.screen, self.color, rect)
+        return rect
 
     def jump(self) -> None:
         """
@@ -125,13 +154,32 @@ class Bird:
         """
         self.velocity += self.LIFT
 
-    def update(self, pipes: List[Pipe]) -> None:
+    def get_inputs(self, nearest_pipe: Optional[Pipe]) -> np.ndarray:
+        """
+        Get the inputs for the bird's neural network from its position, velocity and the position
+        of the nearest pipe.
+
+        Parameters:
+            nearest_pipe (Optional(Pipe)): Pipe closest to and in front of the bird
+
+        Returns:
+            (np.ndarray): Neural network inputs
+        """
+        inputs = np.empty(5, dtype=self.swarm.dtype)
+        inputs[0] = self.y / self.screen_height
+        inputs[1] = self.velocity / self.MIN_VELOCITY
+        inputs[2:] = self.swarm.get_pipe_inputs(nearest_pipe)
+        return inputs
+
+    def update(self, pipes: List[Pipe], output: Optional[np.ndarray] = None) -> None:
         """
         Perform physics calculations on bird, check for collisions with pipe and update bird
-        accordingly.
+        accordingly. If the output of the bird's neural network has already been calculated, e.g.
+        for the whole population at once, it is used instead of calling the neural network.
 
         Parameters:
             pipes (List(Pipe)): List of pipes currently on the display
+            output (Optional(np.ndarray)): Precalculated neural network output
         """
         if not self.alive:
             return
@@ -140,25 +188,13 @@ class Bird:
             self.kill()
             return
 
-        inputs = [
-            self.y / self.screen_height,
-            self.velocity / self.MIN_VELOCITY,
-            0,
-            0,
-            0,
-        ]
-
         nearest_pipe = get_closest_pipe(pipes, self.x)
-        if nearest_pipe is not None:
-            if self.collide_with_pipe(nearest_pipe):
-                self.kill()
-                return
-            else:
-                inputs[2] = nearest_pipe.top / self.screen_height
-                inputs[3] = nearest_pipe.bottom / self.screen_height
-                inputs[4] = nearest_pipe.x / self.screen_width
+        if nearest_pipe is not None and self.collide_with_pipe(nearest_pipe):
+            self.kill()
+            return
 
-        output = self.nn.feedforward(np.array(inputs))
+        if output is None:
+            output = self.nn.feedforward(self.get_inputs(nearest_pipe))
 
         if output[0] > output[1]:
             self.jump()
@@ -167,8 +203,6 @@ class Bird:
         self.velocity = max(self.velocity, self.MIN_VELOCITY)
         self.y += self.velocity
 
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        self.draw()
         self.count += 1
 
     def collide_with_pipe(self, pipe: Pipe) -> bool:
@@ -0,0 +1,313 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.objects.pipe import Pipe
+
+
+class BirdSwarm:
+    """
+    This class stores the state of a group of birds as NumPy arrays, one element per bird. All birds
+    share the same starting position, size and physics constants.
+
+    The update() method applies gravity, lift, the minimum velocity, the offscreen test and the
+    collision test against the nearest pipe to every bird at once using array operations, so the
+    cost of a frame does not depend on Python code per bird. Each Bird is a view of one element of
+    the swarm. The positions, velocities and neural network inputs use the swarm's dtype, which
+    should match the dtype of the birds' neural networks.
+
+    The neural network inputs are written into an array which is allocated once, stored with one
+    contiguous row per input so that each input is written with a single contiguous operation.
+    Every bird shares the same x coordinate and so the same nearest pipe, so the pipe inputs are
+    calculated once per frame and filled in for every bird, leaving only the position and velocity
+    calculated per bird.
+
+    The number of birds alive and the index of the bird with the highest count are maintained as
+    birds die and counts advance, so they can be read in O(1) every frame.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        grav: float,
+        lift: float,
+        min_velocity: float,
+        screen_size: Tuple[int, int],
+        dtype: npt.DTypeLike = "float64",
+    ):
+        """
+        Initialise a swarm of birds at their starting position.
+
+        Parameters:
+            size (int): Number of birds in swarm
+            x (float): x coordinate of birds' start position
+            y (float): y coordinate of birds' start position
+            width (float): Width of birds
+            height (float): Height of birds
+            grav (float): Strength of gravity
+            lift (float): Magnitude of birds' jump
+            min_velocity (float): Minimum velocity of birds
+            screen_size (Tuple[int, int]): Width and height of the screen
+            dtype (npt.DTypeLike): Data type of positions, velocities and inputs
+        """
+        self.size = size
+        self.x = x
+        self.start_y = y
+        self.width = width
+        self.height = height
+        self.GRAV = grav
+        self.LIFT = lift
+        self.MIN_VELOCITY = min_velocity
+        self.screen_width, self.screen_height = screen_size
+
+        self.dtype = np.dtype(dtype)
+        self.y = np.full(size, y, dtype=self.dtype)
+        self.velocity = np.zeros(size, dtype=self.dtype)
+        self.alive = np.ones(size, dtype=bool)
+        self.count = np.zeros(size, dtype=int)
+        self.inputs = np.zeros((5, size), dtype=self.dtype)
+        self.num_alive = size
+        self.best_index = 0
+
+    @classmethod
+    def create(
+        cls, config_bird: Dict[str, Any], size: int, screen_size: Tuple[int, int], dtype: npt.DTypeLike = "float64"
+    ) -> "BirdSwarm":
+        """
+        Create a swarm of birds from config file.
+
+        Parameters:
+            config_bird (Dict(str, Any)): Bird configuration
+            size (int): Number of birds in swarm
+            screen_size (Tuple[int, int]): Width and height of the screen
+            dtype (npt.DTypeLike): Data type of positions, velocities and inputs
+
+        Returns:
+            (BirdSwarm): Configured swarm of birds
+        """
+        return cls(
+            size,
+            config_bird["x"],
+            config_bird["y"],
+            config_bird["width"],
+            config_bird["height"],
+            config_bird["grav"],
+            config_bird["lift"],
+            config_bird["min_velocity"],
+            screen_size,
+            dtype,
+        )
+
+    def reset(self) -> None:
+        """
+        Reset every bird's position, velocity and alive state to starting conditions.
+        """
+        self.y[:] = self.start_y
+        self.velocity[:] = 0
+        self.count[:] = 0
+        self.alive[:] = True
+        self.num_alive = self.size
+        self.best_index = 0
+
+    def set_counts(self, counts: np.ndarray) -> None:
+        """
+        Set the final count of every bird after a generation was simulated elsewhere, e.g. in
+        worker processes. Every bird is left dead.
+
+        Parameters:
+            counts (np.ndarray): Count of each bird
+        """
+        self.count[:] = counts
+        self.alive[:] = False
+        self.num_alive = 0
+        self.best_index = int(np.argmax(self.count))
+
+    def set_known_counts(self, known: np.ndarray) -> None:
+        """
+        Set the counts of the birds whose counts are already known, e.g. from a fitness cache, and
+        leave them dead so only the other birds are simulated. The best bird is the bird with the
+        highest count, or the first bird alive if no known count is higher.
+
+        Parameters:
+            known (np.ndarray): Known count of each bird, -1 for birds which need to be simulated
+        """
+        is_known = known >= 0
+        self.count[is_known] = known[is_known]
+        self.alive[is_known] = False
+        self.num_alive = int(np.count_nonzero(self.alive))
+        self.best_index = int(np.argmax(self.count))
+        self.update_best_alive()
+
+    def update_best_alive(self) -> None:
+        """
+        Make the first bird alive the best bird if the best bird is dead and the birds alive have
+        caught up with its count. Every bird alive has the same count, as they all started the
+        generation together.
+        """
+        if self.num_alive == 0 or self.alive[self.best_index]:
+            return
+
+        first_alive = int(np.argmax(self.alive))
+        if self.count[first_alive] >= self.count[self.best_index]:
+            self.best_index = first_alive
+
+    def kill(self, index: int) -> None:
+        """
+        Set a bird's alive state to false.
+
+        Parameters:
+            index (int): Index of bird in swarm
+        """
+        self.set_alive(index, False)
+
+    def set_alive(self, index: int, alive: bool) -> None:
+        """
+        Set a bird's alive state and update the number of birds alive.
+
+        Parameters:
+            index (int): Index of bird in swarm
+            alive (bool): New alive state
+        """
+        if self.alive[index] != alive:
+            self.num_alive += 1 if alive else -1
+            self.alive[index] = alive
+
+    def set_count(self, index: int, count: int) -> None:
+        """
+        Set a bird's count and update the best bird if it has the highest count.
+
+        Parameters:
+            index (int): Index of bird in swarm
+            count (int): New count
+        """
+        self.count[index] = count
+        if count > self.count[self.best_index]:
+            self.best_index = index
+
+    def get_pipe_inputs(self, nearest_pipe: Optional[Pipe]) -> np.ndarray:
+        """
+        Get the neural network inputs shared by every bird from the position of the nearest pipe.
+
+        Parameters:
+            nearest_pipe (Optional(Pipe)): Pipe closest to and in front of the birds
+
+        Returns:
+            (np.ndarray): Normalised top, bottom and x position of pipe, zeros if there is no pipe
+        """
+        if nearest_pipe is None:
+            return np.zeros(3, dtype=self.dtype)
+
+        return np.array(
+            [
+                nearest_pipe.top / self.screen_height,
+                nearest_pipe.bottom / self.screen_height,
+                nearest_pipe.x / self.screen_width,
+            ],
+            dtype=self.dtype,
+        )
+
+    def get_inputs(self, nearest_pipe: Optional[Pipe]) -> np.ndarray:
+        """
+        Get the neural network inputs of every bird from their positions, velocities and the
+        position of the nearest pipe. The inputs are written into the swarm's input array, which
+        is overwritten by the next call.
+
+        Parameters:
+            nearest_pipe (Optional(Pipe)): Pipe closest to and in front of the birds
+
+        Returns:
+            (np.ndarray): Neural network inputs with shape (size, 5), a view of the input array
+        """
+        np.divide(self.y, self.screen_height, out=self.inputs[0])
+        np.divide(self.velocity, self.MIN_VELOCITY, out=self.inputs[1])
+        self.inputs[2:] = self.get_pipe_inputs(nearest_pipe)[:, np.newaxis]
+        return self.inputs.T
+
+    def update(self, outputs: np.ndarray, nearest_pipe: Optional[Pipe]) -> None:
+        """
+        Perform physics calculations on every bird which is alive. Birds which are offscreen or
+        colliding with the nearest pipe are killed, the rest jump if their first output is larger
+        than their second, accelerate and move.
+
+        Parameters:
+            outputs (np.ndarray): Neural network outputs with shape (size, 2)
+            nearest_pipe (Optional(Pipe)): Pipe closest to and in front of the birds
+        """
+        self.kill_colliding(nearest_pipe)
+        self.move(outputs)
+
+    def kill_colliding(self, nearest_pipe: Optional[Pipe]) -> None:
+        """
+        Kill the birds which are offscreen or colliding with the nearest pipe.
+
+        Parameters:
+            nearest_pipe (Optional(Pipe)): Pipe closest to and in front of the birds
+        """
+        if self.num_alive == 0:
+            return
+
+        dead = self.offscreen
+        if nearest_pipe is not None:
+            dead |= self.collide_with_pipe(nearest_pipe)
+
+        killed = self.alive & dead
+        num_killed = np.count_nonzero(killed)
+        if num_killed:
+            self.alive &= ~killed
+            self.num_alive -= num_killed
+
+        if self.num_alive and killed[self.best_index]:
+            self.best_index = int(np.argmax(self.alive))
+
+    def move(self, outputs: np.ndarray) -> None:
+        """
+        Make the birds which are alive jump if their first output is larger than their second,
+        accelerate and move.
+
+        Parameters:
+            outputs (np.ndarray): Neural network outputs with shape (size, 2)
+        """
+        if self.num_alive == 0:
+            return
+
+        velocity = self.velocity + self.GRAV
+        velocity += np.where(outputs[:, 0] > outputs[:, 1], self.LIFT, 0)
+        np.maximum(velocity, self.MIN_VELOCITY, out=velocity)
+
+        np.copyto(self.velocity, velocity, where=self.alive)
+        np.add(self.y, velocity, out=self.y, where=self.alive)
+        self.count += self.alive
+        self.update_best_alive()
+
+    def collide_with_pipe(self, pipe: Pipe) -> np.ndarray:
+        """
+        Check which birds are colliding with the top or bottom of a pipe.
+
+        Parameters:
+            pipe (Pipe): Pipe to check collision against
+
+        Returns:
+            (np.ndarray): Is each bird colliding with pipe?
+        """
+        if not (self.x < pipe.x + pipe.width and self.x + self.width > pipe.x):
+            return np.zeros(self.size, dtype=bool)
+
+        bottom_y = pipe.top + pipe.spacing
+        collide_top = self.y < pipe.top
+        collide_bottom = self.y + self.height > bottom_y
+        return np.asarray(collide_top | collide_bottom)
+
+    @property
+    def offscreen(self) -> np.ndarray:
+        """
+        Returns which birds are offscreen.
+
+        Returns:
+            (np.ndarray): Is each bird offscreen?
+        """
+        return np.asarray((self.y > self.screen_height - self.height) | (self.y < 0))
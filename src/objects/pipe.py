@@ -1,4 +1,5 @@
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
 
 import numpy as np
 import pygame
@@ -10,22 +11,24 @@ class Pipe:
     pipes, and a speed at which to travel across the screen.
 
     The pipe is drawn to the display in the draw() method. The update() method moves the pipe along
-    the screen.
+    the screen without drawing it.
 
     The pipes have an offscreen property which indicates whether or not the pipes have moved off
-    the screen and get destroyed if they have since they are no longer needed. The
-    get_closest_pipe() method takes a list of pipe pairs and determines which pipe pair is both
-    closest to and in front of the birds on the screen.
+    the screen and get destroyed if they have since they are no longer needed. The pipes on the
+    screen are stored in a PipeQueue, which finds the pipe pair both closest to and in front of the
+    birds.
     """
 
-    def __init__(self, width: float = 50, spacing: float = 200, speed: float = 3.5):
+    def __init__(self, width: float = 50, spacing: float = 200, speed: float = 3.5, top: Optional[float] = None):
         """
-        Initialise a pipe pair with a width, spacing and speed.
+        Initialise a pipe pair with a width, spacing and speed. The height of the top pipe is
+        random if it is not given.
 
         Parameters:
             width (float): Width of the top and bottom pipes
             spacing (float): Space between top and bottom pipe
             speed (float): Speed at which the pipes move across the screen
+            top (Optional[float]): Height of the top pipe
         """
         self.width = width
         self.spacing = spacing
@@ -33,35 +36,42 @@ class Pipe:
         self.screen = pygame.display.get_surface()
         self.color = (0, 255, 0)
         self.x = float(self.screen.get_size()[0])
-        self.top = np.random.uniform(
-            (1 / 5) * (self.screen.get_size()[1] - spacing),
-            (4 / 5) * (self.screen.get_size()[1] - spacing),
-        )
+        if top is None:
+            top = np.random.uniform(
+                (1 / 5) * (self.screen.get_size()[1] - spacing),
+                (4 / 5) * (self.screen.get_size()[1] - spacing),
+            )
+        self.top = top
         self.bottom = self.screen.get_size()[1] - (self.top + spacing)
 
     @classmethod
-    def create(cls, config_pipe: Dict[str, Any], speed: float) -> "Pipe":
+    def create(cls, config_pipe: Dict[str, Any], speed: float, top: Optional[float] = None) -> "Pipe":
         """
         Create a pipe from config file and speed.
 
         Parameters:
             config_pipe (Dict(str, Any)): Pipe configuration
             speed (float): Speed at which pipes move across the screen
+            top (Optional[float]): Height of the top pipe, random if None
 
         Returns:
             (Pipe): Configured pipe
         """
-        pipe = cls(config_pipe["width"], config_pipe["spacing"], speed)
+        pipe = cls(config_pipe["width"], config_pipe["spacing"], speed, top)
         pipe.rect_top = pygame.Rect(pipe.x, 0, config_pipe["width"], pipe.top)
         pipe.rect_bot = pygame.Rect(pipe.x, pipe.top + config_pipe["spacing"], config_pipe["width"], pipe.bottom)
         return pipe
 
-    def draw(self) -> None:
+    def draw(self) -> List[pygame.Rect]:
         """
         Draw the pipes on the display.
+
+        Returns:
+            (List[pygame.Rect]): Rectangles of the top and bottom pipes
         """
         pygame.draw.rect(self.screen, self.color, self.rect_top)
         pygame.draw.rect(self.screen, self.color, self.rect_bot)
+        return [self.rect_top, self.rect_bot]
 
     def update(self) -> None:
         """
@@ -72,8 +82,6 @@ class Pipe:
         self.rect_top = pygame.Rect(self.x, 0, self.width, self.top)
         self.rect_bot = pygame.Rect(self.x, self.top + self.spacing, self.width, self.bottom)
 
-        self.draw()
-
     @property
     def offscreen(self) -> bool:
         """
@@ -83,3 +91,90 @@ class Pipe:
             (bool): Is pipe off screen?
         """
         return self.x < -self.width
+
+
+class PipeQueue:
+    """
+    This class stores the pipes on the screen in the order they spawned. Pipes spawn at the right
+    edge of the screen and move left, so the queue is also ordered by x: the oldest pipe is the
+    first to move off the screen and the birds pass the pipes in order.
+
+    Pipes are appended to the right and evicted from the left of a deque in O(1). A cursor holds
+    the index of the first pipe which the birds have not passed, and only moves forwards, so finding
+    the next pipe ahead of the birds takes amortised O(1) time each frame.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise an empty queue of pipes.
+        """
+        self.pipes: Deque[Pipe] = deque()
+        self.cursor = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of pipes in the queue.
+
+        Returns:
+            (int): Number of pipes
+        """
+        return len(self.pipes)
+
+    def __iter__(self) -> Iterator[Pipe]:
+        """
+        Iterate over the pipes from oldest to newest.
+
+        Returns:
+            (Iterator[Pipe]): Pipes in queue
+        """
+        return iter(self.pipes)
+
+    def __getitem__(self, index: int) -> Pipe:
+        """
+        Return a pipe from the queue.
+
+        Parameters:
+            index (int): Index of pipe, 0 is the oldest pipe
+
+        Returns:
+            (Pipe): Pipe at index
+        """
+        return self.pipes[index]
+
+    def append(self, pipe: Pipe) -> None:
+        """
+        Add a newly spawned pipe to the end of the queue.
+
+        Parameters:
+            pipe (Pipe): Pipe to add
+        """
+        self.pipes.append(pipe)
+
+    def update(self) -> None:
+        """
+        Evict the pipes which have moved off the screen, then move the remaining pipes.
+        """
+        while self.pipes and self.pipes[0].offscreen:
+            self.pipes.popleft()
+            self.cursor = max(self.cursor - 1, 0)
+
+        for pipe in self.pipes:
+            pipe.update()
+
+    def next_pipe(self, x: float) -> Optional[Pipe]:
+        """
+        Return the pipe closest to and in front of a position. The position must not decrease
+        between calls, which holds for the birds since they share a fixed x coordinate.
+
+        Parameters:
+            x (float): x position of the birds
+
+        Returns:
+            (Optional[Pipe]): Pipe closest to the birds, None if every pipe has been passed
+        """
+        while self.cursor < len(self.pipes) and self.pipes[self.cursor].x + self.pipes[self.cursor].width <= x:
+            self.cursor += 1
+
+        if self.cursor < len(self.pipes):
+            return self.pipes[self.cursor]
+        return None
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from src.objects.pipe import Pipe
+
+
+class PipeCourse:
+    """
+    This class stores the pipes of one generation as arrays which are calculated before the
+    generation starts: the frame each pipe spawns on, the position of its gap and its speed.
+
+    The course is created from a seed, so the same seed always gives the same course. The speed and
+    spawnrate of each pipe are calculated from its index rather than accumulated, and the gap
+    positions are drawn in one call, so no random numbers are drawn while the game is running. The
+    course is small and can be sent to worker processes so that every shard plays the same pipes.
+    """
+
+    def __init__(
+        self,
+        frames: np.ndarray,
+        tops: np.ndarray,
+        speeds: np.ndarray,
+        config_pipe: Dict[str, Any],
+        seed: int,
+    ):
+        """
+        Initialise a course from the spawn frame, gap position and speed of each pipe.
+
+        Parameters:
+            frames (np.ndarray): Frame each pipe spawns on, in increasing order
+            tops (np.ndarray): Height of each top pipe
+            speeds (np.ndarray): Speed of each pipe
+            config_pipe (Dict(str, Any)): Pipe configuration
+            seed (int): Seed used to create the course
+        """
+        self.frames = frames
+        self.tops = tops
+        self.speeds = speeds
+        self.config_pipe = config_pipe
+        self.seed = seed
+
+    @classmethod
+    def create(
+        cls, config_pipe: Dict[str, Any], screen_size: Tuple[int, int], num_frames: int, seed: int
+    ) -> "PipeCourse":
+        """
+        Create the course of pipes which spawn before a number of frames from config file.
+
+        Parameters:
+            config_pipe (Dict(str, Any)): Pipe configuration
+            screen_size (Tuple[int, int]): Width and height of the screen
+            num_frames (int): Number of frames in the course
+            seed (int): Seed for the positions of the gaps
+
+        Returns:
+            (PipeCourse): Course of pipes
+        """
+        max_pipes = num_frames // max(int(config_pipe["min_spawnrate"]), 1) + 1
+        indices = np.arange(max_pipes)
+
+        speeds = np.minimum(
+            config_pipe["start_speed"] + indices * config_pipe["acc_speed"],
+            config_pipe["max_speed"],
+        )
+        spawnrates = np.maximum(
+            config_pipe["start_spawnrate"] - (indices + 1) * config_pipe["acc_spawnrate"],
+            config_pipe["min_spawnrate"],
+        ).astype(np.int32)
+
+        frames = np.zeros(max_pipes, dtype=np.int32)
+        np.cumsum(spawnrates[:-1], out=frames[1:])
+        num_pipes = int(np.searchsorted(frames, num_frames))
+
+        gap_range = screen_size[1] - config_pipe["spacing"]
+        rng = np.random.default_rng(seed)
+        tops = rng.uniform((1 / 5) * gap_range, (4 / 5) * gap_range, size=num_pipes)
+
+        return cls(
+            frames[:num_pipes],
+            tops.astype(np.float32),
+            speeds[:num_pipes].astype(np.float32),
+            config_pipe,
+            seed,
+        )
+
+    def __len__(self) -> int:
+        """
+        Return the number of pipes in the course.
+
+        Returns:
+            (int): Number of pipes
+        """
+        return len(self.frames)
+
+    def create_pipe(self, index: int) -> Pipe:
+        """
+        Create a pipe from the course.
+
+        Parameters:
+            index (int): Index of pipe in course
+
+        Returns:
+            (Pipe): Pipe at the start of the course
+        """
+        return Pipe.create(self.config_pipe, float(self.speeds[index]), float(self.tops[index]))
@@ -0,0 +1,132 @@
+import csv
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict
+
+import numpy as np
+
+
+class Profiler:
+    """
+    This class times the phases of each frame, such as neural network inference, bird physics and
+    rendering, and keeps the rolling average time of each phase over a window of samples.
+
+    The time of a phase is measured from the last call to start() or lap(), so each phase costs a
+    single call. When the profiler is disabled these calls return immediately. The profiler is
+    enabled when its overlay is shown or when the averages are dumped every number of generations
+    to a .json or .csv file.
+    """
+
+    def __init__(self, filepath: Path, interval: int, overlay: bool = False, window: int = 120):
+        """
+        Configure where and how often the averages are dumped and how many samples they use.
+
+        Parameters:
+            filepath (Path): Path to dump averages to, as a .json or .csv file
+            interval (int): Number of generations between dumps, 0 to disable dumps
+            overlay (bool): Show the averages on the screen?
+            window (int): Number of samples of each phase in rolling average
+        """
+        self.filepath = filepath
+        self.interval = interval
+        self.overlay = overlay
+        self.window = window
+        self.enabled = self.overlay or self.interval > 0
+        self.samples: Dict[str, Deque[float]] = {}
+        self.last_time = 0.0
+
+    @classmethod
+    def create(cls, config_profiler: Dict[str, Any]) -> "Profiler":
+        """
+        Create a profiler from config file.
+
+        Parameters:
+            config_profiler (Dict(str, Any)): Profiler configuration
+
+        Returns:
+            (Profiler): Configured profiler
+        """
+        return cls(
+            Path(config_profiler["path"]),
+            config_profiler["interval"],
+            config_profiler["overlay"],
+            config_profiler["window"],
+        )
+
+    def toggle_overlay(self) -> None:
+        """
+        Show or hide the overlay, enabling the profiler while it is shown.
+        """
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.interval > 0
+
+    def start(self) -> None:
+        """
+        Start timing the first phase.
+        """
+        if self.enabled:
+            self.last_time = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """
+        Record the time of a phase since the last call to start() or lap() and start timing the
+        next phase.
+
+        Parameters:
+            phase (str): Name of phase
+        """
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if phase not in self.samples:
+            self.samples[phase] = deque(maxlen=self.window)
+        self.samples[phase].append(now - self.last_time)
+        self.last_time = now
+
+    @property
+    def averages(self) -> Dict[str, float]:
+        """
+        Return the rolling average time of each phase.
+
+        Returns:
+            (Dict[str, float]): Average seconds of each phase
+        """
+        return {phase: float(np.mean(samples)) for phase, samples in self.samples.items()}
+
+    def due(self, generation: int) -> bool:
+        """
+        Return whether the averages should be dumped for a generation.
+
+        Parameters:
+            generation (int): Generation of population
+
+        Returns:
+            (bool): Is a dump due?
+        """
+        return self.interval > 0 and generation % self.interval == 0
+
+    def dump(self, generation: int) -> None:
+        """
+        Write the rolling average and maximum time of each phase to a .json file, or to a .csv file
+        if the path ends in .csv. The file is replaced on each dump.
+
+        Parameters:
+            generation (int): Generation of population
+        """
+        phases = {
+            phase: {"mean_ms": float(np.mean(samples)) * 1000, "max_ms": max(samples) * 1000, "count": len(samples)}
+            for phase, samples in self.samples.items()
+        }
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.filepath, "w", newline="") as file:
+            if self.filepath.suffix == ".csv":
+                writer = csv.writer(file)
+                writer.writerow(["generation", "phase", "mean_ms", "max_ms", "count"])
+                for phase, stats in phases.items():
+                    writer.writerow([generation, phase, stats["mean_ms"], stats["max_ms"], stats["count"]])
+            else:
+                json.dump({"generation": generation, "phases": phases}, file, indent=2)
@@ -0,0 +1,61 @@
+from typing import List, Tuple
+
+import pygame
+
+
+class Renderer:
+    """
+    This class updates only the parts of the display which changed since the last frame.
+
+    Each frame, the rectangles drawn in the previous frame are cleared to the background colour
+    rather than filling the whole screen. The objects drawn this frame add their rectangles with
+    add(), and update() sends the cleared and newly drawn rectangles to the display. The first
+    frame fills and updates the whole screen.
+    """
+
+    def __init__(self, surface: pygame.Surface, background: Tuple[int, int, int] = (0, 0, 0)):
+        """
+        Initialise a renderer for a display surface.
+
+        Parameters:
+            surface (pygame.Surface): Display surface to draw on
+            background (Tuple[int, int, int]): Colour of the background
+        """
+        self.surface = surface
+        self.background = background
+        self.previous_rects: List[pygame.Rect] = []
+        self.rects: List[pygame.Rect] = []
+        self.full_update = True
+
+    def clear(self) -> None:
+        """
+        Clear the rectangles drawn in the previous frame, or the whole screen on the first frame.
+        """
+        if self.full_update:
+            self.surface.fill(self.background)
+            return
+
+        for rect in self.previous_rects:
+            self.surface.fill(self.background, rect)
+
+    def add(self, rect: pygame.Rect) -> None:
+        """
+        Add a rectangle which was drawn this frame.
+
+        Parameters:
+            rect (pygame.Rect): Rectangle drawn on the surface
+        """
+        self.rects.append(rect)
+
+    def update(self) -> None:
+        """
+        Update the cleared and newly drawn rectangles on the display and start the next frame.
+        """
+        if self.full_update:
+            pygame.display.update()
+            self.full_update = False
+        else:
+            pygame.display.update(self.previous_rects + self.rects)
+
+        self.previous_rects = self.rects
+        self.rects = []
@@ -1,4 +1,7 @@
+from typing import Optional
+
 import numpy as np
+import numpy.typing as npt
 
 
 def generate_number():
@@ -27,3 +30,40 @@ def select_gene(element: float, other_element: float, mutation_rate: float, low:
         return element
 
     return other_element
+
+
+def select_genes(
+    elements: np.ndarray,
+    other_elements: np.ndarray,
+    mutation_rate: npt.ArrayLike,
+    low: npt.ArrayLike,
+    high: npt.ArrayLike,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Select genes between two arrays or random genes, using the same probabilities as select_gene().
+    A single random draw is used to build the masks for every element, so whole layers of a
+    population can be selected at once.
+
+    Parameters:
+        elements (np.ndarray): Elements to use for selection
+        other_elements (np.ndarray): Other elements to use for selection, same shape as elements
+        mutation_rate (npt.ArrayLike): Probability for each element to be random, range [0, 1], or
+            probabilities which broadcast to elements
+        low (npt.ArrayLike): Lower limit for random elements, or limits which broadcast to elements
+        high (npt.ArrayLike): Upper limit for random elements, or limits which broadcast to elements
+        rng (Optional[np.random.Generator]): Random number generator to use
+
+    Returns:
+        (np.ndarray): Selected genes
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    numbers = rng.random(np.shape(elements))
+    mutation_rate = np.asarray(mutation_rate)
+    genes = np.where(numbers < (0.5 + mutation_rate / 2), elements, other_elements)
+
+    mutate = numbers < mutation_rate
+    genes[mutate] = rng.uniform(np.broadcast_to(low, genes.shape)[mutate], np.broadcast_to(high, genes.shape)[mutate])
+    return genes
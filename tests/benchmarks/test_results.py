@@ -0,0 +1,68 @@
+import pytest
+
+from benchmarks.results import compare_results, load_results, save_results
+
+
+class TestResults:
+    MOCK_RESULTS = [
+        {
+            "name": "game_loop",
+            "topology": "small",
+            "population_size": 10,
+            "dtype": "float64",
+            "value": 700.0,
+            "higher_is_better": True,
+        },
+        {
+            "name": "reproduction",
+            "topology": "small",
+            "population_size": 10,
+            "dtype": "float64",
+            "value": 0.5,
+            "higher_is_better": False,
+        },
+        {
+            "name": "reproduction",
+            "topology": "large",
+            "population_size": 10,
+            "dtype": "float64",
+            "value": 0.5,
+            "higher_is_better": False,
+        },
+    ]
+    MOCK_BASELINE = [
+        {
+            "name": "game_loop",
+            "topology": "small",
+            "population_size": 10,
+            "dtype": "float64",
+            "value": 1000.0,
+            "higher_is_better": True,
+        },
+        {
+            "name": "reproduction",
+            "topology": "small",
+            "population_size": 10,
+            "dtype": "float64",
+            "value": 0.45,
+            "higher_is_better": False,
+        },
+    ]
+
+    def test_given_results_when_saving_and_loading_then_check_results_match(self, tmp_path):
+        filepath = tmp_path / "results.json"
+
+        save_results(self.MOCK_RESULTS, filepath)
+
+        assert load_results(filepath) == self.MOCK_RESULTS
+
+    def test_given_baseline_when_comparing_results_then_check_regressions_flagged(self):
+        comparisons = compare_results(self.MOCK_RESULTS, self.MOCK_BASELINE, 0.2)
+
+        assert [comparison["key"] for comparison in comparisons] == [
+            "game_loop[small-10-float64]",
+            "reproduction[small-10-float64]",
+        ]
+        assert comparisons[0]["regression"]
+        assert not comparisons[1]["regression"]
+        assert comparisons[0]["change"] == pytest.approx(-0.3)
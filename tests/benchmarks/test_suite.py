@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from benchmarks.suite import NEAT_TOPOLOGY, benchmark_memory, benchmark_single_inference, create_benchmark_app
+from src.models.neat import NEATPopulationNetwork
+
+
+class TestSuite:
+    def test_given_checkpoints_and_metrics_enabled_when_creating_benchmark_app_then_check_both_disabled(
+        self, mock_config
+    ):
+        config = SimpleNamespace(
+            GAME={
+                **mock_config.GAME,
+                "checkpoint": {"path": "checkpoints/population.npz", "interval": 1},
+                "metrics": {"path": "metrics/training.jsonl", "flush_interval": 1},
+            },
+            GA=mock_config.GA,
+            NN=mock_config.NN,
+            BIRD=mock_config.BIRD,
+            PIPE=mock_config.PIPE,
+        )
+
+        app = create_benchmark_app(config, 10, "small", "float64")
+
+        assert app.headless
+        assert not app.checkpointer.due(app.population.generation)
+        assert not app.metrics.enabled
+
+    def test_given_neat_topology_when_creating_benchmark_app_then_check_neat_genomes_measured(self, mock_config):
+        app = create_benchmark_app(mock_config, 10, NEAT_TOPOLOGY, "float64")
+
+        assert isinstance(app.brain, NEATPopulationNetwork)
+        assert benchmark_single_inference(app) > 0
+        assert benchmark_memory(app) > sum(array.nbytes for array in [app.swarm.y, app.swarm.count])
+
+    def test_given_neat_genomes_sharing_topology_when_measuring_memory_then_check_topology_counted_once(
+        self, mock_config
+    ):
+        app = create_benchmark_app(mock_config, 10, NEAT_TOPOLOGY, "float64")
+        assert isinstance(app.brain, NEATPopulationNetwork)
+        genome = app.brain.genomes[0]
+        app.brain.genomes = [genome.copy() for _ in range(10)]
+
+        swarm_bytes = sum(array.nbytes for array in [app.swarm.y, app.swarm.velocity, app.swarm.alive, app.swarm.count])
+        topology_bytes = genome.nodes.nbytes + genome.innovations.nbytes + genome.connections.nbytes
+        gene_bytes = genome.biases.nbytes + genome.weights.nbytes + genome.enabled.nbytes
+        assert benchmark_memory(app) == swarm_bytes + topology_bytes + 10 * gene_bytes
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from src.app import App
 from src.models.ga import Population
 from src.objects.bird import Bird
+from src.objects.bird_swarm import BirdSwarm
 from src.objects.pipe import Pipe
 from src.utils.config_utils import get_config_module
 
@@ -35,6 +36,11 @@ def mock_bird(mock_config):
     return Bird.create(mock_config.BIRD, mock_config.NN)
 
 
+@pytest.fixture
+def mock_swarm(mock_config, mock_screen_size):
+    return BirdSwarm.create(mock_config.BIRD, 4, mock_screen_size)
+
+
 @pytest.fixture
 def mock_bird_low_score(mock_config, mock_screen):
     with patch("pygame.display.get_surface", return_value=mock_screen):
@@ -74,3 +80,9 @@ def mock_population(mock_bird_low_score, mock_bird_mid_score, mock_bird_high_sco
 def mock_app(mock_screen):
     with patch("pygame.display.get_surface", return_value=mock_screen):
         return App.create_app(config)
+
+
+@pytest.fixture
+def mock_headless_app():
+    with patch.dict(config.GAME, {"headless": True}):
+        return App.create_app(config)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.models.activation_functions import ActivationFunctions
 
 
@@ -54,3 +56,35 @@ class TestActivationFunctions:
         y_expected = 0.5
         y_actual = func(x)
         assert y_actual == y_expected
+
+    def test_given_tanh_activation_when_calculating_output_then_check_output_is_correct(self):
+        x = 0
+        y_expected = 0
+        y_actual = ActivationFunctions.tanh(x)
+        assert y_actual == y_expected
+
+    def test_given_leaky_relu_activation_when_calculating_output_then_check_output_is_correct(self):
+        x1 = 5
+        y1_expected = 5
+        y1_actual = ActivationFunctions.leaky_relu(x1)
+        assert y1_actual == y1_expected
+
+        x2 = -5
+        y2_expected = -5 * ActivationFunctions.LEAKY_RELU_ALPHA
+        y2_actual = ActivationFunctions.leaky_relu(x2)
+        assert y2_actual == y2_expected
+
+    def test_given_softmax_activation_when_calculating_output_then_check_output_is_correct(self):
+        x = np.array([[1.0, 1.0], [0.0, np.log(3)]])
+        y_expected = np.array([[0.5, 0.5], [0.25, 0.75]])
+        y_actual = ActivationFunctions.softmax(x)
+        assert np.allclose(y_actual, y_expected)
+
+    def test_given_array_when_calculating_output_in_place_then_check_array_overwritten(self):
+        for func_name in ["linear", "relu", "leaky_relu", "sigmoid", "tanh", "softmax"]:
+            func = ActivationFunctions.get_activation(func_name)
+            x = np.array([[-2.0, 0.0, 3.0]])
+            y_expected = func(x.copy())
+            y_actual = func(x, out=x)
+            assert y_actual is x
+            assert np.allclose(y_actual, y_expected)
@@ -1,5 +1,13 @@
 from unittest.mock import call, patch
 
+import numpy as np
+import pytest
+
+from src.metrics import MetricsLog
+from src.models.ga import FitnessCache, MutationScheduler, Population, Speciation
+from src.models.population_nn import PopulationNeuralNetwork
+from src.objects.bird import Bird
+
 
 class TestGA:
     def test_given_mock_birds_when_creating_population_then_check_population_correct(self, mock_population):
@@ -21,16 +29,16 @@ class TestGA:
     @patch("src.objects.bird.Bird.reset")
     @patch("src.objects.bird.Bird.apply")
     @patch("src.objects.bird.Bird.crossover")
-    @patch("src.models.ga.Population.select_parent")
+    @patch("src.models.ga.Population.select_parents")
     def test_given_population_when_evaluating_then_check_birds_evaluated(
         self, mock_select, mock_crossover, mock_apply, mock_reset, mock_population, mock_bird_high_score
     ):
-        mock_select.return_value = mock_bird_high_score
+        mock_select.return_value = (np.array([2, 2, 2]), np.array([2, 2, 2]))
 
         mock_population.evaluate()
 
         assert mock_population.generation == 2
-        assert mock_select.call_count == 6
+        assert mock_select.call_count == 1
 
         for _ in mock_population.population:
             assert mock_crossover.has_calls(
@@ -40,25 +48,339 @@ class TestGA:
         assert mock_apply.call_count == 3
         assert mock_reset.call_count == 3
 
-    @patch("numpy.random.uniform")
-    def test_given_population_when_checking_member_then_check_rejection_sampling_rejects_member(
-        self, mock_np_random, mock_population, mock_bird_mid_score
+    @patch("src.objects.bird.Bird.reset")
+    @patch("src.objects.bird.Bird.apply")
+    @patch("src.objects.bird.Bird.crossover")
+    def test_given_metrics_log_when_evaluating_then_check_generation_record_written(
+        self, mock_crossover, mock_apply, mock_reset, mock_population, tmp_path
+    ):
+        mock_population.metrics = MetricsLog(tmp_path / "metrics.jsonl", flush_interval=10)
+
+        mock_population.evaluate()
+
+        record = mock_population.metrics.records[0]
+        assert record["generation"] == 1
+        assert record["best_fitness"] == 225
+        assert record["median_fitness"] == 36
+        assert record["frames"] == 900
+        assert record["bird_frames"] == 1400
+        assert sum(record["survival_histogram"]["counts"]) == 3
+
+    @patch("src.objects.bird.Bird.reset")
+    @patch("src.objects.bird.Bird.crossover")
+    @patch("src.models.ga.Population.select_parents")
+    def test_given_population_with_brain_when_evaluating_then_check_brain_crossed_over(
+        self, mock_select, mock_crossover, mock_reset, mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score
     ):
-        mock_np_random.return_value = 1
+        birds = [mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score]
+        brain = PopulationNeuralNetwork([bird.nn for bird in birds])
+        population = Population(birds, 0, brain)
+        old_weights = brain.weights[0].copy()
+        mock_select.return_value = (np.array([2, 2, 2]), np.array([2, 2, 2]))
+
+        population.evaluate()
+
+        assert population.generation == 2
+        assert mock_select.call_count == 1
+        assert mock_crossover.call_count == 0
+        assert mock_reset.call_count == 3
+        for bird in birds:
+            assert np.array_equal(bird.nn.layers[1].weights, old_weights[2])
+
+    def test_given_population_when_getting_fitnesses_then_check_fitness_of_each_member_returned(self, mock_population):
+        assert np.array_equal(mock_population.fitnesses, [member.fitness for member in mock_population.population])
+
+    def test_given_population_when_selecting_parents_then_check_parents_in_population(self, mock_population):
+        parents_a, parents_b = mock_population.select_parents(mock_population.fitnesses)
+
+        assert len(parents_a) == len(parents_b) == len(mock_population.population)
+        assert np.all((0 <= parents_a) & (parents_a < len(mock_population.population)))
+        assert np.all((0 <= parents_b) & (parents_b < len(mock_population.population)))
+
+    def test_given_population_when_selecting_parents_then_check_parents_differ_from_member_and_each_other(self):
+        population = Population([None] * 50, selection="roulette")
+        population.rng = np.random.default_rng(0)
+
+        parents_a, parents_b = population.select_parents(np.arange(50, dtype=float) + 1)
+
+        assert np.all(parents_a != np.arange(50))
+        assert np.all(parents_b != np.arange(50))
+        assert np.all(parents_a != parents_b)
+
+    def test_given_one_member_with_fitness_when_selecting_parents_then_check_selection_finishes(self):
+        population = Population([None] * 3)
+
+        parents_a, parents_b = population.select_parents(np.array([0, 0, 1], dtype=float))
+
+        assert np.all(parents_a == 2)
+        assert np.all(parents_b == 2)
+
+    def test_given_all_fitnesses_zero_when_evaluating_then_check_evaluation_finishes(self, mock_population):
+        for member in mock_population.population:
+            member.count = 0
+
+        mock_population.evaluate()
 
-        assert mock_population.rejection_sampling(mock_bird_mid_score) is False
+        assert mock_population.generation == 2
+
+    def test_given_population_with_swarm_when_birds_die_then_check_aggregates_read_from_swarm(
+        self, mock_swarm, mock_config
+    ):
+        birds = [Bird.create(mock_config.BIRD, mock_config.NN, mock_swarm, index) for index in range(mock_swarm.size)]
+        population = Population.create(mock_config.GA, birds, swarm=mock_swarm)
+
+        birds[0].kill()
+        birds[2].count = 120
+
+        assert population.num_alive == mock_swarm.size - 1
+        assert population.best_member == birds[2]
+
+        population.evaluate()
+
+        assert population.num_alive == mock_swarm.size
+        assert np.all(mock_swarm.count == 0)
+
+    def test_given_elitism_when_selecting_elites_then_check_fittest_members_selected(self):
+        population = Population([None] * 5, elitism=2)
+
+        elites = population.select_elites(np.array([4, 9, 1, 7, 3], dtype=float))
+
+        assert np.array_equal(elites, [1, 3])
+
+    def test_given_no_elitism_when_selecting_elites_then_check_no_elites_selected(self):
+        population = Population([None] * 5)
+
+        assert len(population.select_elites(np.arange(5, dtype=float))) == 0
+
+    @patch("src.objects.bird.Bird.reset")
+    @patch("src.models.ga.Population.select_parents")
+    def test_given_elitism_with_brain_when_evaluating_then_check_elite_genes_unchanged(
+        self, mock_select, mock_reset, mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score
+    ):
+        birds = [mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score]
+        brain = PopulationNeuralNetwork([bird.nn for bird in birds])
+        population = Population(birds, 1, brain, elitism=1)
+        old_genomes = brain.genomes.copy()
+        mock_select.return_value = (np.array([1, 2, 0]), np.array([2, 0, 1]))
+
+        population.evaluate()
+
+        assert np.array_equal(brain.genomes[2], old_genomes[2])
+        assert not np.array_equal(brain.genomes[:2], old_genomes[:2])
+
+    @patch("src.objects.bird.Bird.reset")
+    @patch("src.objects.bird.Bird.apply")
+    @patch("src.objects.bird.Bird.crossover")
+    def test_given_elitism_without_brain_when_evaluating_then_check_elites_not_crossed_over(
+        self, mock_crossover, mock_apply, mock_reset, mock_population
+    ):
+        mock_population.elitism = 1
+
+        mock_population.evaluate()
+
+        assert mock_crossover.call_count == 2
+        assert mock_apply.call_count == 2
+        assert mock_reset.call_count == 3
 
-    @patch("numpy.random.uniform")
-    def test_given_population_when_checking_member_then_check_rejection_sampling_accepts_member(
-        self, mock_np_random, mock_population, mock_bird_mid_score
+    @patch("src.objects.bird.Bird.reset")
+    def test_given_speciation_with_brain_when_evaluating_then_check_parents_from_same_species(
+        self, mock_reset, mock_config
     ):
-        mock_np_random.return_value = 0
+        birds = [Bird.create(mock_config.BIRD, mock_config.NN) for _ in range(6)]
+        brain = PopulationNeuralNetwork([bird.nn for bird in birds])
+        speciation = Speciation(threshold=0.1, target_species=0)
+        population = Population(birds, 0.05, brain, speciation=speciation)
+        brain.genomes[:3] = brain.genes_low
+        brain.genomes[3:] = brain.genes_high
+
+        with patch.object(brain, "crossover") as mock_crossover:
+            population.evaluate()
+
+        parents_a, parents_b = mock_crossover.call_args.args[:2]
+        assert np.array_equal(speciation.species, [0, 0, 0, 1, 1, 1]) or np.array_equal(
+            speciation.species, [1, 1, 1, 0, 0, 0]
+        )
+        assert np.array_equal(speciation.species[parents_a], speciation.species[parents_b])
+        assert population.generation_record(population.fitnesses)["species"] == 2
+
+
+class TestSpeciation:
+    def create_genes(self) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        return np.concatenate([rng.normal(-1, 0.01, (6, 4)), rng.normal(1, 0.01, (4, 4))])
+
+    def test_given_two_clusters_when_speciating_then_check_each_cluster_one_species(self):
+        speciation = Speciation(threshold=0.1, target_species=0)
+
+        species = speciation.speciate(self.create_genes(), np.ones(4), np.random.default_rng(0))
+
+        assert speciation.num_species == 2
+        assert len(np.unique(species[:6])) == 1
+        assert len(np.unique(species[6:])) == 1
+        assert species[0] != species[6]
+        assert speciation.representatives is not None
+        assert speciation.representatives.shape == (2, 4)
+
+    def test_given_representatives_when_speciating_next_generation_then_check_species_kept(self):
+        speciation = Speciation(threshold=0.1, target_species=0)
+        genes = self.create_genes()
+        species = speciation.speciate(genes, np.ones(4), np.random.default_rng(0))
+
+        next_species = speciation.speciate(genes[::-1], np.ones(4), np.random.default_rng(1))
+
+        assert np.array_equal(next_species, species[::-1])
+
+    def test_given_max_species_when_speciating_distant_genomes_then_check_species_capped(self):
+        speciation = Speciation(threshold=0.01, max_species=3, target_species=0)
+
+        species = speciation.speciate(np.eye(10), np.ones(10), np.random.default_rng(0))
+
+        assert speciation.num_species == 3
+        assert np.array_equal(np.unique(species), [0, 1, 2])
+
+    def test_given_target_species_when_speciating_then_check_threshold_adapted(self):
+        speciation = Speciation(threshold=0.1, target_species=5, threshold_step=0.5)
+
+        speciation.speciate(self.create_genes(), np.ones(4), np.random.default_rng(0))
+
+        assert speciation.threshold == pytest.approx(0.05)
+
+    def test_given_species_when_sharing_fitness_then_check_offspring_in_proportion(self):
+        speciation = Speciation()
+        speciation.species = np.array([0, 0, 0, 1])
+        fitnesses = np.array([3.0, 3.0, 3.0, 1.0])
+
+        shared = speciation.shared_fitnesses(fitnesses)
+        counts = speciation.offspring_counts(fitnesses, 8)
+
+        assert np.array_equal(shared, [1.0, 1.0, 1.0, 1.0])
+        assert np.array_equal(counts, [6, 2])
+
+    def test_given_zero_fitnesses_when_dividing_offspring_then_check_offspring_by_species_size(self):
+        speciation = Speciation()
+        speciation.species = np.array([0, 0, 0, 1])
+
+        assert np.array_equal(speciation.offspring_counts(np.zeros(4), 4), [3, 1])
+
+    def test_given_speciation_state_when_loading_state_then_check_representatives_restored(self):
+        speciation = Speciation(threshold=0.1)
+        speciation.speciate(self.create_genes(), np.ones(4), np.random.default_rng(0))
+        restored = Speciation()
+
+        restored.load_state(speciation.state)
+
+        assert restored.threshold == speciation.threshold
+        assert restored.representatives is not None and speciation.representatives is not None
+        assert np.allclose(restored.representatives, speciation.representatives)
+
+
+class TestFitnessCache:
+    def test_given_new_genomes_when_looking_up_then_check_every_member_simulated(self):
+        cache = FitnessCache()
 
-        assert mock_population.rejection_sampling(mock_bird_mid_score) is True
+        known = cache.lookup([b"a", b"b", b"c"], 7)
 
-    def test_given_population_when_selecting_parent_then_check_member_in_population(
-        self, mock_population, mock_bird_low_score
+        assert np.array_equal(known, [-1, -1, -1])
+        assert cache.num_hits == 0
+
+    def test_given_stored_counts_when_looking_up_same_course_then_check_cached_counts_returned(self):
+        cache = FitnessCache()
+        cache.lookup([b"a", b"b", b"c"], 7)
+        cache.store(np.array([10, 20, 30]))
+
+        known = cache.lookup([b"c", b"d", b"a"], 7)
+
+        assert np.array_equal(known, [30, -1, 10])
+        assert cache.num_hits == 2
+
+    def test_given_stored_counts_when_looking_up_other_course_then_check_no_counts_returned(self):
+        cache = FitnessCache()
+        cache.lookup([b"a", b"b", b"c"], 7)
+        cache.store(np.array([10, 20, 30]))
+
+        assert np.array_equal(cache.lookup([b"a", b"b", b"c"], 8), [-1, -1, -1])
+
+    def test_given_clones_when_storing_then_check_clones_given_count_of_first_copy(self):
+        cache = FitnessCache()
+        known = cache.lookup([b"a", b"b", b"a"], 7)
+        counts = cache.store(np.array([10, 20, 0]))
+
+        assert np.array_equal(known, [-1, -1, 0])
+        assert cache.num_clones == 1
+        assert np.array_equal(counts, [10, 20, 10])
+
+
+class TestMutationScheduler:
+    def test_given_improving_fitness_when_updating_then_check_rate_lowered(self):
+        scheduler = MutationScheduler(0.1, decrease=0.5)
+
+        rates = scheduler.update(10)
+
+        assert np.allclose(rates, [0.05])
+        assert scheduler.decision == "improved"
+        assert scheduler.best_fitness == 10
+
+    def test_given_stagnant_fitness_when_patience_runs_out_then_check_rate_raised(self):
+        scheduler = MutationScheduler(0.1, increase=2, decrease=1, patience=2)
+        scheduler.update(10)
+
+        scheduler.update(10)
+        assert np.allclose(scheduler.rates, [0.1])
+        assert scheduler.decision == "stagnant"
+
+        scheduler.update(5)
+        assert np.allclose(scheduler.rates, [0.2])
+        assert scheduler.decision == "stagnated"
+        assert scheduler.stagnation == 0
+
+    def test_given_low_diversity_in_one_layer_when_updating_then_check_only_that_layer_raised(self):
+        scheduler = MutationScheduler(0.1, num_layers=2, increase=2, decrease=1, diversity_threshold=0.05)
+
+        rates = scheduler.update(10, np.array([0.01, 0.3]))
+
+        assert scheduler.per_layer
+        assert np.allclose(rates, [0.2, 0.1])
+        assert scheduler.decision == "improved, low diversity"
+
+    def test_given_rates_at_limits_when_updating_then_check_rates_clipped(self):
+        scheduler = MutationScheduler(0.4, num_layers=2, min_rate=0.05, max_rate=0.5, increase=10, decrease=0.01)
+        scheduler.update(10)
+        assert np.allclose(scheduler.rates, [0.05, 0.05])
+
+        scheduler.update(10, np.zeros(2))
+        assert np.allclose(scheduler.rates, [0.5, 0.5])
+
+    def test_given_scheduler_state_when_loading_state_then_check_schedule_restored(self):
+        scheduler = MutationScheduler(0.1, num_layers=2, patience=3)
+        scheduler.update(10)
+        scheduler.update(10)
+
+        restored = MutationScheduler(0.1, num_layers=2)
+        restored.load_state(scheduler.state)
+
+        assert np.array_equal(restored.rates, scheduler.rates)
+        assert (restored.best_fitness, restored.stagnation, restored.decision) == (10, 1, "stagnant")
+        with pytest.raises(ValueError):
+            MutationScheduler(0.1).load_state(scheduler.state)
+
+    @patch("src.objects.bird.Bird.reset")
+    def test_given_per_layer_schedule_when_evaluating_then_check_rate_of_each_gene_used_for_crossover(
+        self, mock_reset, mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score, mock_config
     ):
-        random_parent = mock_population.select_parent(mock_bird_low_score)
-        assert random_parent in mock_population.population
-        assert random_parent != mock_bird_low_score
+        birds = [mock_bird_low_score, mock_bird_mid_score, mock_bird_high_score]
+        brain = PopulationNeuralNetwork([bird.nn for bird in birds])
+        config_ga = {
+            **mock_config.GA,
+            "mutation_schedule": {**mock_config.GA["mutation_schedule"], "enabled": True, "per_layer": True},
+        }
+        population = Population.create(config_ga, birds, brain)
+
+        with patch.object(brain, "crossover") as mock_crossover:
+            population.evaluate()
+
+        gene_rates = mock_crossover.call_args[0][2]
+        assert population.scheduler is not None
+        assert len(population.scheduler.rates) == len(brain.layer_lengths)
+        assert gene_rates.shape == (brain.genome_length,)
+        assert np.array_equal(np.unique(gene_rates), np.unique(population.scheduler.rates))
+        assert population.state["scheduler"]["rates"] == population.scheduler.rates.tolist()
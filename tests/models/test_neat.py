@@ -0,0 +1,259 @@
+import numpy as np
+
+from src.models.neat import FeedforwardPlan, InnovationTracker, NEATGenome, NEATPopulationNetwork
+
+
+def evaluate_genome(genome: NEATGenome, inputs: np.ndarray) -> np.ndarray:
+    values = dict(zip(genome.nodes[: genome.num_inputs].tolist(), inputs))
+
+    def value(node: int) -> float:
+        if node not in values:
+            index = int(np.flatnonzero(genome.nodes == node)[0])
+            total = genome.biases[index] + sum(
+                weight * value(int(in_node))
+                for (in_node, out_node), weight, enabled in zip(genome.connections, genome.weights, genome.enabled)
+                if out_node == node and enabled
+            )
+            values[node] = total if index < genome.num_inputs + genome.num_outputs else max(total, 0.0)
+        return float(values[node])
+
+    return np.array(
+        [value(int(node)) for node in genome.nodes[genome.num_inputs : genome.num_inputs + genome.num_outputs]]
+    )
+
+
+def evolve_genome(genome: NEATGenome, tracker: InnovationTracker, rng: np.random.Generator, steps: int) -> None:
+    for _ in range(steps):
+        genome.add_node(tracker, rng)
+        genome.add_connection(tracker, rng)
+
+
+class TestInnovationTracker:
+    def test_given_same_connection_when_numbering_twice_then_check_same_innovation(self):
+        tracker = InnovationTracker(3)
+
+        first = tracker.connection(0, 2)
+        second = tracker.connection(1, 2)
+
+        assert tracker.connection(0, 2) == first
+        assert second == first + 1
+
+    def test_given_same_connection_when_splitting_twice_then_check_same_node(self):
+        tracker = InnovationTracker(3)
+
+        node = tracker.split(0)
+
+        assert node == 3
+        assert tracker.split(0) == node
+        assert tracker.split(1) == node + 1
+        assert tracker.new_node() == node + 2
+
+
+class TestNEATGenome:
+    NUM_INPUTS = 3
+    NUM_OUTPUTS = 2
+
+    def test_given_tracker_when_creating_genome_then_check_minimal_topology(self):
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=np.random.default_rng(0))
+
+        assert len(genome.nodes) == self.NUM_INPUTS + self.NUM_OUTPUTS
+        assert len(genome.connections) == self.NUM_INPUTS * self.NUM_OUTPUTS
+        assert np.all(genome.enabled)
+        assert np.all(genome.biases[: self.NUM_INPUTS] == 0)
+        assert np.array_equal(genome.innovations, np.arange(self.NUM_INPUTS * self.NUM_OUTPUTS))
+
+    def test_given_minimal_genome_when_feeding_forward_then_check_outputs_match_dense_layer(self):
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=np.random.default_rng(0))
+        inputs = np.array([0.5, -0.2, 0.8])
+
+        outputs = genome.feedforward(inputs)
+
+        weights = genome.weights.reshape(self.NUM_OUTPUTS, self.NUM_INPUTS)
+        assert len(genome.plan.levels) == 1
+        assert np.allclose(outputs, weights @ inputs + genome.biases[self.NUM_INPUTS :])
+
+    def test_given_genome_when_getting_plan_twice_then_check_plan_cached(self):
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, InnovationTracker(5))
+
+        plan = genome.plan
+        genome.mutate_weights(1.0, np.random.default_rng(0))
+
+        assert isinstance(plan, FeedforwardPlan)
+        assert genome.plan is plan
+
+    def test_given_genome_when_adding_node_then_check_connection_split_and_plan_compiled(self):
+        rng = np.random.default_rng(0)
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=rng)
+        plan = genome.plan
+
+        assert genome.add_node(tracker, rng)
+
+        split = int(np.flatnonzero(~genome.enabled)[0])
+        in_node, out_node = genome.connections[split]
+        assert len(genome.nodes) == self.NUM_INPUTS + self.NUM_OUTPUTS + 1
+        assert np.array_equal(genome.connections[-2:], [[in_node, genome.nodes[-1]], [genome.nodes[-1], out_node]])
+        assert np.array_equal(genome.weights[-2:], [1.0, genome.weights[split]])
+        assert genome.plan is not plan
+        assert genome.plan.num_hidden_levels == 1
+        assert len(genome.plan.levels) == 2
+
+    def test_given_genome_when_adding_connections_then_check_no_cycles(self):
+        rng = np.random.default_rng(1)
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=rng)
+
+        evolve_genome(genome, tracker, rng, 20)
+
+        plan = genome.plan
+        hidden = plan.targets >= self.NUM_INPUTS + self.NUM_OUTPUTS
+        assert len(np.unique(genome.innovations)) == len(genome.innovations)
+        assert np.all(plan.depths[plan.sources[hidden]] < plan.depths[plan.targets[hidden]])
+        assert not np.any(np.isin(plan.sources, plan.outputs))
+        assert not np.any(np.isin(plan.targets, plan.inputs))
+
+    def test_given_evolved_genome_when_feeding_forward_then_check_outputs_match_connections(self):
+        rng = np.random.default_rng(2)
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=rng)
+        evolve_genome(genome, tracker, rng, 10)
+        inputs = np.array([0.5, -0.2, 0.8])
+
+        assert np.allclose(genome.feedforward(inputs), evaluate_genome(genome, inputs))
+
+    def test_given_two_genomes_when_crossing_over_then_check_child_shares_first_parent_topology(self):
+        rng = np.random.default_rng(3)
+        tracker = InnovationTracker(self.NUM_INPUTS + self.NUM_OUTPUTS)
+        genome_a = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=rng)
+        genome_b = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, tracker, rng=rng)
+        genome_b.add_node(tracker, rng)
+
+        child = genome_a.crossover(genome_b, rng)
+
+        assert child.plan is genome_a.plan
+        assert np.array_equal(child.innovations, genome_a.innovations)
+        assert np.all((child.weights == genome_a.weights) | (child.weights == genome_b.weights[: len(child.weights)]))
+
+    def test_given_genome_when_copying_then_check_digest_matches_until_mutated(self):
+        rng = np.random.default_rng(4)
+        genome = NEATGenome.create(self.NUM_INPUTS, self.NUM_OUTPUTS, InnovationTracker(5), rng=rng)
+
+        genome_copy = genome.copy()
+
+        assert genome_copy.digest == genome.digest
+        genome_copy.mutate_weights(1.0, rng)
+        assert genome_copy.digest != genome.digest
+
+
+class TestNEATPopulationNetwork:
+    MOCK_POPULATION_SIZE = 8
+
+    def test_given_config_when_creating_network_then_check_minimal_genomes(self, mock_config):
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, self.MOCK_POPULATION_SIZE)
+
+        num_inputs = mock_config.NN["input_layer"]["num_nodes"]
+        num_outputs = mock_config.NN["output_layer"]["num_nodes"]
+        assert len(population_nn.genomes) == self.MOCK_POPULATION_SIZE
+        assert all(len(genome.connections) == num_inputs * num_outputs for genome in population_nn.genomes)
+        assert population_nn.inputs.shape == (self.MOCK_POPULATION_SIZE, num_inputs)
+
+    def test_given_evolved_genomes_when_feeding_forward_then_check_outputs_match_each_genome(self, mock_config):
+        rng = np.random.default_rng(5)
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, self.MOCK_POPULATION_SIZE, rng)
+        for index, genome in enumerate(population_nn.genomes):
+            evolve_genome(genome, population_nn.tracker, rng, index)
+        population_nn.build()
+        inputs = rng.uniform(-1, 1, size=(self.MOCK_POPULATION_SIZE, mock_config.NN["input_layer"]["num_nodes"]))
+
+        outputs = population_nn.feedforward(inputs)
+
+        for genome, genome_inputs, genome_outputs in zip(population_nn.genomes, inputs, outputs):
+            assert np.allclose(
+                genome.feedforward(genome_inputs, output_activation=population_nn.output_activation), genome_outputs
+            )
+
+    def test_given_softmax_outputs_when_feeding_forward_then_check_each_genome_sums_to_one(self, mock_config):
+        config_nn = {**mock_config.NN, "output_layer": {**mock_config.NN["output_layer"], "activation": "softmax"}}
+        population_nn = NEATPopulationNetwork.create(config_nn, self.MOCK_POPULATION_SIZE)
+        inputs = np.random.uniform(-1, 1, size=(self.MOCK_POPULATION_SIZE, config_nn["input_layer"]["num_nodes"]))
+
+        outputs = population_nn.feedforward(inputs)
+
+        assert outputs.shape == (self.MOCK_POPULATION_SIZE, 2)
+        assert np.allclose(np.sum(outputs, axis=1), 1)
+
+    def test_given_parents_when_crossing_over_then_check_kept_genomes_unchanged(self, mock_config):
+        rng = np.random.default_rng(6)
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, self.MOCK_POPULATION_SIZE, rng)
+        population_nn.add_connection_rate = 1.0
+        population_nn.add_node_rate = 1.0
+        kept_genome = population_nn.genomes[0]
+        parents = rng.integers(self.MOCK_POPULATION_SIZE, size=self.MOCK_POPULATION_SIZE)
+
+        population_nn.crossover(parents, parents[::-1], 0.1, rng, keep=np.array([0]))
+
+        assert population_nn.genomes[0] is kept_genome
+        assert all(len(genome.nodes) > len(kept_genome.nodes) for genome in population_nn.genomes[1:])
+        assert population_nn.feedforward(
+            np.zeros((self.MOCK_POPULATION_SIZE, mock_config.NN["input_layer"]["num_nodes"]))
+        ).shape == (self.MOCK_POPULATION_SIZE, mock_config.NN["output_layer"]["num_nodes"])
+
+    def test_given_evolved_parents_when_crossing_over_then_check_genes_taken_from_parents(self, mock_config):
+        rng = np.random.default_rng(8)
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, self.MOCK_POPULATION_SIZE, rng)
+        for index, genome in enumerate(population_nn.genomes):
+            evolve_genome(genome, population_nn.tracker, rng, index % 3)
+        population_nn.add_connection_rate = 0.0
+        population_nn.add_node_rate = 0.0
+        parents = list(population_nn.genomes)
+        parents_a = rng.integers(self.MOCK_POPULATION_SIZE, size=self.MOCK_POPULATION_SIZE)
+        parents_b = rng.integers(self.MOCK_POPULATION_SIZE, size=self.MOCK_POPULATION_SIZE)
+
+        population_nn.crossover(parents_a, parents_b, 0.0, rng)
+
+        for child, parent_a, parent_b in zip(population_nn.genomes, parents_a, parents_b):
+            genome_a, genome_b = parents[parent_a], parents[parent_b]
+            weights_b = dict(zip(genome_b.innovations.tolist(), genome_b.weights))
+            biases_b = dict(zip(genome_b.nodes.tolist(), genome_b.biases))
+            assert child.innovations is genome_a.innovations
+            assert child.plan is genome_a.plan
+            assert all(
+                weight in (weight_a, weights_b.get(innovation))
+                for innovation, weight, weight_a in zip(genome_a.innovations.tolist(), child.weights, genome_a.weights)
+            )
+            assert all(
+                bias in (bias_a, biases_b.get(node))
+                for node, bias, bias_a in zip(genome_a.nodes.tolist(), child.biases, genome_a.biases)
+            )
+
+    def test_given_genomes_when_calculating_diversity_then_check_relative_to_weights_range(self, mock_config):
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, self.MOCK_POPULATION_SIZE)
+
+        diversity = population_nn.diversity(rng=np.random.default_rng(0))
+
+        assert diversity.shape == (1,)
+        assert 0 < diversity[0] < 1
+
+    def test_given_copied_genomes_when_getting_digests_then_check_copies_match(self, mock_config):
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, 2)
+        population_nn.genomes[1] = population_nn.genomes[0].copy()
+
+        digests = population_nn.genome_digests()
+
+        assert digests[0] == digests[1]
+
+    def test_given_genomes_when_getting_compatibility_genes_then_check_weights_by_innovation(self, mock_config):
+        rng = np.random.default_rng(7)
+        population_nn = NEATPopulationNetwork.create(mock_config.NN, 2, rng)
+        population_nn.genomes[1].add_node(population_nn.tracker, rng)
+
+        genes, scale = population_nn.compatibility_genes()
+
+        genome = population_nn.genomes[1]
+        assert genes.shape == (2, population_nn.tracker.next_innovation)
+        assert np.array_equal(genes[1, genome.innovations], genome.effective_weights)
+        assert np.all(genes[0, len(population_nn.genomes[0].innovations) :] == 0)
+        assert np.allclose(scale, 0.5)
@@ -0,0 +1,167 @@
+import numpy as np
+
+from src.models.nn import NeuralNetwork
+from src.models.population_nn import PopulationNeuralNetwork
+
+
+class TestPopulationNeuralNetwork:
+    MOCK_POPULATION_SIZE = 4
+
+    def test_given_networks_when_creating_population_nn_then_check_weights_stacked(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+
+        for layer_index in range(1, len(networks[0].layers)):
+            weights = population_nn.weights[layer_index - 1]
+            assert weights.shape == (self.MOCK_POPULATION_SIZE, *networks[0].layers[layer_index].weights.shape)
+            for nn_index, nn in enumerate(networks):
+                assert np.shares_memory(nn.layers[layer_index].weights, weights)
+                assert np.array_equal(nn.layers[layer_index].weights, weights[nn_index])
+
+    def test_given_inputs_when_feeding_forward_then_check_outputs_match_each_network(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        inputs = np.random.uniform(-1, 1, size=(self.MOCK_POPULATION_SIZE, mock_config.NN["input_layer"]["num_nodes"]))
+
+        outputs = population_nn.feedforward(inputs)
+
+        assert outputs.shape == (self.MOCK_POPULATION_SIZE, mock_config.NN["output_layer"]["num_nodes"])
+        for nn, nn_inputs, nn_outputs in zip(networks, inputs, outputs):
+            assert np.allclose(np.ravel(nn.feedforward(nn_inputs)), nn_outputs)
+
+    def test_given_transposed_inputs_when_feeding_forward_twice_then_check_input_array_reused(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        inputs = np.random.uniform(
+            -1, 1, size=(mock_config.NN["input_layer"]["num_nodes"], self.MOCK_POPULATION_SIZE)
+        ).T
+
+        outputs = population_nn.feedforward(inputs)
+        input_values = population_nn.input_values
+        population_nn.feedforward(inputs)
+
+        assert population_nn.input_values is input_values
+        for nn, nn_inputs, nn_outputs in zip(networks, inputs, outputs):
+            assert np.allclose(np.ravel(nn.feedforward(nn_inputs)), nn_outputs)
+
+    def test_given_parents_when_performing_crossover_then_check_weights_inherited_in_place(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        old_weights = [weights.copy() for weights in population_nn.weights]
+        old_bias = [bias.copy() for bias in population_nn.bias]
+        parents = np.zeros(self.MOCK_POPULATION_SIZE, dtype=int)
+
+        population_nn.crossover(parents, parents, 0)
+
+        for layer_index in range(len(population_nn.weights)):
+            assert np.array_equal(population_nn.weights[layer_index], old_weights[layer_index][parents])
+            assert np.array_equal(population_nn.bias[layer_index], old_bias[layer_index][parents])
+            for nn in networks:
+                assert np.array_equal(nn.layers[layer_index + 1].weights, old_weights[layer_index][0])
+
+    def test_given_genomes_when_setting_genomes_then_check_weights_round_trip(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        genomes = np.random.uniform(-1, 1, size=(self.MOCK_POPULATION_SIZE, population_nn.genome_length))
+
+        population_nn.set_genomes(genomes)
+
+        assert np.array_equal(population_nn.get_genomes(), genomes)
+        assert np.array_equal(networks[1].layers[1].weights.ravel(), genomes[1, : networks[1].layers[1].weights.size])
+
+    def test_given_networks_when_loading_then_check_layers_are_views_of_genomes(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        old_weights = networks[2].layers[1].weights.copy()
+
+        population_nn = PopulationNeuralNetwork(networks)
+
+        assert population_nn.genomes.flags["C_CONTIGUOUS"]
+        assert np.array_equal(networks[2].layers[1].weights, old_weights)
+        for layer_index in range(1, len(networks[0].layers)):
+            assert np.shares_memory(population_nn.weights[layer_index - 1], population_nn.genomes)
+            assert np.shares_memory(networks[2].layers[layer_index].bias, population_nn.genomes)
+
+    def test_given_genomes_path_when_loading_then_check_genomes_memory_mapped(self, mock_config, tmp_path):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        genomes_path = tmp_path / "genomes.npy"
+
+        population_nn = PopulationNeuralNetwork(networks, genomes_path)
+
+        assert isinstance(population_nn.genomes, np.memmap)
+        population_nn.genomes.flush()
+        assert np.array_equal(np.load(genomes_path), population_nn.get_genomes())
+
+    def test_given_genomes_path_when_performing_crossover_then_check_offspring_memory_mapped(
+        self, mock_config, tmp_path
+    ):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks, tmp_path / "genomes.npy")
+        population_nn.CROSSOVER_CHUNK_GENES = population_nn.genome_length
+        old_genomes = population_nn.get_genomes()
+        parents = np.array([3, 2, 1, 0])
+
+        population_nn.crossover(parents, parents, 0)
+        offspring = population_nn.offspring
+        population_nn.crossover(parents, parents, 0)
+
+        assert isinstance(population_nn.offspring, np.memmap)
+        assert population_nn.offspring is offspring
+        assert population_nn.offspring_path == tmp_path / "genomes.offspring.npy"
+        assert (tmp_path / "genomes.offspring.npy").exists()
+        assert np.array_equal(population_nn.genomes, old_genomes)
+        assert np.shares_memory(networks[0].layers[1].weights, population_nn.genomes)
+
+    def test_given_full_mutation_when_performing_crossover_then_check_genes_within_layer_ranges(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        parents = np.arange(self.MOCK_POPULATION_SIZE)
+
+        population_nn.crossover(parents, parents, 1)
+
+        assert np.all(population_nn.genomes >= population_nn.genes_low)
+        assert np.all(population_nn.genomes < population_nn.genes_high)
+        assert not np.shares_memory(population_nn.genes_low, population_nn.genomes)
+
+    def test_given_small_chunks_when_performing_crossover_then_check_every_member_replaced(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        population_nn.CROSSOVER_CHUNK_GENES = population_nn.genome_length
+        old_genomes = population_nn.get_genomes()
+        parents = np.array([3, 2, 1, 0])
+
+        population_nn.crossover(parents, parents, 0)
+
+        assert np.array_equal(population_nn.genomes, old_genomes[parents])
+
+    def test_given_float32_config_when_creating_population_nn_then_check_float32_used(self, mock_config):
+        config_nn = {**mock_config.NN, "dtype": "float32"}
+        networks = [NeuralNetwork.initialise_neural_network(config_nn) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        inputs = np.random.uniform(-1, 1, size=(self.MOCK_POPULATION_SIZE, config_nn["input_layer"]["num_nodes"]))
+        parents = np.arange(self.MOCK_POPULATION_SIZE)
+
+        outputs = population_nn.feedforward(inputs)
+        population_nn.crossover(parents, parents, 0.5)
+
+        assert population_nn.genomes.dtype == np.float32
+        assert outputs.dtype == np.float32
+        assert networks[0].feedforward(inputs[0]).dtype == np.float32
+        assert networks[0].layers[1].weights.dtype == np.float32
+
+    def test_given_identical_genomes_when_measuring_diversity_then_check_diversity_zero(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(self.MOCK_POPULATION_SIZE)]
+        population_nn = PopulationNeuralNetwork(networks)
+        population_nn.set_genomes(population_nn.genomes[0])
+
+        assert np.array_equal(population_nn.diversity(), [0])
+        assert np.array_equal(population_nn.diversity(per_layer=True), np.zeros(len(population_nn.layer_lengths)))
+
+    def test_given_random_genomes_when_measuring_diversity_then_check_diversity_of_each_layer(self, mock_config):
+        networks = [NeuralNetwork.initialise_neural_network(mock_config.NN) for _ in range(200)]
+        population_nn = PopulationNeuralNetwork(networks)
+
+        diversity = population_nn.diversity(per_layer=True, rng=np.random.default_rng(0))
+
+        assert sum(population_nn.layer_lengths) == population_nn.genome_length
+        assert diversity.shape == (len(networks[0].layers) - 1,)
+        assert np.all((0.2 < diversity) & (diversity < 0.4))
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.models.selection import Selection
+
+
+class TestSelection:
+    MOCK_FITNESSES = np.array([0, 1, 0, 9], dtype=float)
+    MOCK_NUM_PARENTS = 1000
+
+    @pytest.mark.parametrize("name", ["roulette", "sus"])
+    def test_given_fitnesses_when_selecting_parents_then_check_zero_fitness_never_selected(self, name):
+        selection = Selection.get_selection(name)
+
+        parents = selection(self.MOCK_FITNESSES, self.MOCK_NUM_PARENTS, np.random.default_rng(0))
+
+        assert len(parents) == self.MOCK_NUM_PARENTS
+        assert set(np.unique(parents)) <= {1, 3}
+        assert np.count_nonzero(parents == 3) > np.count_nonzero(parents == 1)
+
+    @pytest.mark.parametrize("name", ["roulette", "sus", "tournament"])
+    def test_given_zero_fitnesses_when_selecting_parents_then_check_parents_selected(self, name):
+        selection = Selection.get_selection(name)
+
+        parents = selection(np.zeros(4), self.MOCK_NUM_PARENTS, np.random.default_rng(0))
+
+        assert len(parents) == self.MOCK_NUM_PARENTS
+        assert np.all((0 <= parents) & (parents < 4))
+
+    @pytest.mark.parametrize("name", ["roulette", "sus"])
+    def test_given_pointer_at_total_fitness_when_selecting_parents_then_check_last_member_selected(self, name):
+        selection = Selection.get_selection(name)
+        mock_rng = MagicMock()
+        mock_rng.random.side_effect = lambda size=None: 1.0 if size is None else np.ones(size)
+        mock_rng.permutation.side_effect = lambda parents: parents
+
+        parents = selection(self.MOCK_FITNESSES, self.MOCK_NUM_PARENTS, mock_rng)
+
+        assert parents.max() == len(self.MOCK_FITNESSES) - 1
+
+    def test_given_fitnesses_when_using_sus_then_check_parents_proportional_to_fitness(self):
+        parents = Selection.stochastic_universal_sampling(self.MOCK_FITNESSES, 10, np.random.default_rng(0))
+
+        assert np.count_nonzero(parents == 1) == 1
+        assert np.count_nonzero(parents == 3) == 9
+
+    def test_given_fitnesses_when_using_tournament_then_check_fitter_members_selected_more(self):
+        parents = Selection.tournament(self.MOCK_FITNESSES, self.MOCK_NUM_PARENTS, np.random.default_rng(0))
+
+        assert np.count_nonzero(parents == 3) > np.count_nonzero(parents == 1) > np.count_nonzero(parents == 0)
+
+    def test_given_tournament_size_when_getting_selection_then_check_fittest_member_wins(self):
+        selection = Selection.get_selection("tournament", tournament_size=100)
+
+        parents = selection(self.MOCK_FITNESSES, self.MOCK_NUM_PARENTS, np.random.default_rng(0))
+
+        assert np.all(parents == 3)
@@ -0,0 +1,189 @@
+import numpy as np
+
+from src.objects.bird import Bird
+from src.objects.bird_swarm import BirdSwarm
+
+
+class TestBirdSwarm:
+    def test_given_bird_config_when_creating_swarm_then_check_swarm_has_correct_properties(
+        self, mock_swarm, mock_config, mock_screen_size
+    ):
+        assert mock_swarm.size == 4
+        assert mock_swarm.GRAV == mock_config.BIRD["grav"]
+        assert mock_swarm.LIFT == mock_config.BIRD["lift"]
+        assert mock_swarm.MIN_VELOCITY == mock_config.BIRD["min_velocity"]
+        assert (mock_swarm.screen_width, mock_swarm.screen_height) == mock_screen_size
+        assert np.all(mock_swarm.y == mock_config.BIRD["y"])
+        assert np.all(mock_swarm.velocity == 0)
+        assert np.all(mock_swarm.alive)
+        assert np.all(mock_swarm.count == 0)
+
+    def test_given_outputs_when_updating_swarm_then_check_birds_jump_correctly(self, mock_swarm, mock_config):
+        outputs = np.array([[0, 1], [1, 0], [0, 1], [1, 0]])
+
+        mock_swarm.update(outputs, None)
+
+        jump_velocity = max(mock_config.BIRD["min_velocity"], mock_config.BIRD["grav"] + mock_config.BIRD["lift"])
+        assert np.array_equal(
+            mock_swarm.velocity, [mock_config.BIRD["grav"], jump_velocity, mock_config.BIRD["grav"], jump_velocity]
+        )
+        assert np.array_equal(mock_swarm.y, mock_config.BIRD["y"] + mock_swarm.velocity)
+        assert np.all(mock_swarm.count == 1)
+
+    def test_given_offscreen_birds_when_updating_swarm_then_check_birds_killed(self, mock_swarm):
+        mock_swarm.y[0] = -1
+        mock_swarm.y[1] = mock_swarm.screen_height - mock_swarm.height + 1
+
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), None)
+
+        assert np.array_equal(mock_swarm.alive, [False, False, True, True])
+        assert np.array_equal(mock_swarm.count, [0, 0, 1, 1])
+        assert mock_swarm.y[0] == -1
+
+    def test_given_pipe_when_updating_swarm_then_check_colliding_birds_killed(self, mock_swarm, mock_pipe):
+        mock_pipe.x = mock_swarm.x
+        mock_swarm.y[0] = 0
+        mock_swarm.y[1] = mock_pipe.top + 10
+        mock_swarm.y[2] = mock_pipe.top + mock_pipe.spacing - 10
+        mock_swarm.y[3] = mock_pipe.top + 100
+
+        assert np.array_equal(mock_swarm.collide_with_pipe(mock_pipe), [True, False, True, False])
+
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), mock_pipe)
+
+        assert np.array_equal(mock_swarm.alive, [False, True, False, True])
+
+    def test_given_pipe_behind_birds_when_checking_collision_then_check_no_birds_collide(self, mock_swarm, mock_pipe):
+        mock_pipe.x = mock_swarm.x - mock_pipe.width - 1
+        mock_swarm.y[:] = 0
+
+        assert not np.any(mock_swarm.collide_with_pipe(mock_pipe))
+
+    def test_given_pipe_when_getting_inputs_then_check_inputs_normalised(self, mock_swarm, mock_pipe):
+        inputs = mock_swarm.get_inputs(mock_pipe)
+
+        assert inputs.shape == (mock_swarm.size, 5)
+        assert np.all(inputs[:, 0] == mock_swarm.y / mock_swarm.screen_height)
+        assert np.all(inputs[:, 2] == mock_pipe.top / mock_swarm.screen_height)
+        assert np.all(inputs[:, 3] == mock_pipe.bottom / mock_swarm.screen_height)
+        assert np.all(inputs[:, 4] == mock_pipe.x / mock_swarm.screen_width)
+
+    def test_given_inputs_when_getting_inputs_again_then_check_array_reused_and_pipe_cleared(
+        self, mock_swarm, mock_pipe
+    ):
+        inputs = mock_swarm.get_inputs(mock_pipe)
+        mock_swarm.y[1] = 0
+
+        next_inputs = mock_swarm.get_inputs(None)
+
+        assert np.shares_memory(next_inputs, inputs)
+        assert next_inputs[1, 0] == 0
+        assert np.all(next_inputs[:, 2:] == 0)
+
+    def test_given_updated_swarm_when_resetting_then_check_birds_reset(self, mock_swarm, mock_config):
+        mock_swarm.y[0] = -1
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), None)
+
+        mock_swarm.reset()
+
+        assert np.all(mock_swarm.y == mock_config.BIRD["y"])
+        assert np.all(mock_swarm.velocity == 0)
+        assert np.all(mock_swarm.alive)
+        assert np.all(mock_swarm.count == 0)
+
+    def test_given_birds_in_swarm_when_updating_swarm_then_check_birds_are_views(self, mock_swarm, mock_config):
+        birds = [Bird.create(mock_config.BIRD, mock_config.NN, mock_swarm, index) for index in range(mock_swarm.size)]
+        mock_swarm.y[0] = -1
+
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), None)
+        birds[1].kill()
+
+        assert not birds[0].alive
+        assert birds[2].count == 1
+        assert birds[3].y == mock_swarm.y[3]
+        assert not mock_swarm.alive[1]
+
+    def test_given_birds_killed_when_updating_swarm_then_check_num_alive_and_best_index_maintained(self, mock_swarm):
+        mock_swarm.y[0] = -1
+
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), None)
+
+        assert mock_swarm.num_alive == 3
+        assert mock_swarm.best_index == 1
+
+        mock_swarm.kill(1)
+        mock_swarm.kill(1)
+
+        assert mock_swarm.num_alive == 2
+
+        mock_swarm.update(np.zeros((mock_swarm.size, 2)), None)
+
+        assert mock_swarm.best_index == 2
+        assert mock_swarm.count[mock_swarm.best_index] == np.max(mock_swarm.count)
+
+    def test_given_bird_counts_set_when_checking_best_index_then_check_highest_count_tracked(
+        self, mock_swarm, mock_config
+    ):
+        birds = [Bird.create(mock_config.BIRD, mock_config.NN, mock_swarm, index) for index in range(mock_swarm.size)]
+
+        birds[2].count = 10
+        birds[3].count = 5
+        birds[0].alive = False
+        birds[0].alive = True
+        birds[1].alive = False
+
+        assert mock_swarm.best_index == 2
+        assert mock_swarm.num_alive == 3
+
+        mock_swarm.reset()
+
+        assert mock_swarm.num_alive == mock_swarm.size
+        assert mock_swarm.best_index == 0
+
+    def test_given_counts_when_setting_counts_then_check_birds_dead_and_best_index(self, mock_swarm):
+        mock_swarm.set_counts(np.array([3, 9, 1, 4]))
+
+        assert np.array_equal(mock_swarm.count, [3, 9, 1, 4])
+        assert not np.any(mock_swarm.alive)
+        assert mock_swarm.num_alive == 0
+        assert mock_swarm.best_index == 1
+
+    def test_given_known_counts_when_setting_known_counts_then_check_only_unknown_birds_alive(self, mock_swarm):
+        mock_swarm.set_known_counts(np.array([50, -1, 0, -1]))
+
+        assert np.array_equal(mock_swarm.count, [50, 0, 0, 0])
+        assert np.array_equal(mock_swarm.alive, [False, True, False, True])
+        assert mock_swarm.num_alive == 2
+        assert mock_swarm.best_index == 0
+
+    def test_given_known_best_count_when_birds_alive_catch_up_then_check_best_bird_alive(self, mock_swarm):
+        mock_swarm.set_known_counts(np.array([2, -1, 0, -1]))
+        outputs = np.zeros((4, 2))
+
+        mock_swarm.move(outputs)
+        assert mock_swarm.best_index == 0
+
+        mock_swarm.move(outputs)
+        assert mock_swarm.best_index == 1
+
+    def test_given_zero_known_counts_when_setting_known_counts_then_check_first_bird_alive_best(self, mock_swarm):
+        mock_swarm.set_known_counts(np.array([0, -1, 0, -1]))
+
+        assert mock_swarm.best_index == 1
+
+    def test_given_every_count_known_when_setting_known_counts_then_check_best_bird_has_highest_count(self, mock_swarm):
+        mock_swarm.set_known_counts(np.array([5, 80, 0, 20]))
+
+        assert mock_swarm.num_alive == 0
+        assert mock_swarm.best_index == 1
+
+    def test_given_float32_dtype_when_updating_swarm_then_check_state_stays_float32(
+        self, mock_config, mock_screen_size
+    ):
+        swarm = BirdSwarm.create(mock_config.BIRD, 4, mock_screen_size, "float32")
+
+        swarm.update(np.array([[1, 0], [0, 1], [1, 0], [0, 1]]), None)
+
+        assert swarm.y.dtype == np.float32
+        assert swarm.velocity.dtype == np.float32
+        assert swarm.get_inputs(None).dtype == np.float32
@@ -1,6 +1,6 @@
 from unittest.mock import call, patch
 
-from src.objects.pipe import Pipe
+from src.objects.pipe import Pipe, PipeQueue
 
 
 class TestPipe:
@@ -38,7 +38,7 @@ class TestPipe:
         mock_pipe.update()
 
         assert mock_pipe.x == mock_screen_size[0] - mock_config.PIPE["speed"]
-        assert mock_draw_rect.called
+        assert not mock_draw_rect.called
 
     def test_given_moving_pipe_when_moved_offscreen_then_check_offscreen_returns_true(
         self, mock_pipe, mock_config, mock_screen_size
@@ -49,3 +49,53 @@ class TestPipe:
             mock_pipe.update()
 
         assert mock_pipe.offscreen
+
+
+class TestPipeQueue:
+    def create_pipes(self, mock_config, mock_screen, xs):
+        pipes = []
+        with patch("pygame.display.get_surface", return_value=mock_screen):
+            for x in xs:
+                pipe = Pipe.create(mock_config.PIPE, mock_config.PIPE["speed"])
+                pipe.x = x
+                pipes.append(pipe)
+        return pipes
+
+    def test_given_pipes_when_appending_then_check_pipes_in_spawn_order(self, mock_config, mock_screen):
+        queue = PipeQueue()
+        pipes = self.create_pipes(mock_config, mock_screen, [100, 300])
+
+        for pipe in pipes:
+            queue.append(pipe)
+
+        assert len(queue) == 2
+        assert list(queue) == pipes
+        assert queue[1] == pipes[1]
+
+    def test_given_offscreen_pipes_when_updating_then_check_pipes_evicted_and_rest_moved(
+        self, mock_config, mock_screen
+    ):
+        queue = PipeQueue()
+        pipes = self.create_pipes(mock_config, mock_screen, [-100, -80, 300])
+        for pipe in pipes:
+            queue.append(pipe)
+        queue.cursor = 2
+
+        queue.update()
+
+        assert list(queue) == [pipes[2]]
+        assert queue.cursor == 0
+        assert pipes[2].x == 300 - mock_config.PIPE["speed"]
+
+    def test_given_birds_position_when_getting_next_pipe_then_check_closest_pipe_ahead_returned(
+        self, mock_config, mock_screen
+    ):
+        queue = PipeQueue()
+        pipes = self.create_pipes(mock_config, mock_screen, [0, 200, 400])
+        for pipe in pipes:
+            queue.append(pipe)
+
+        assert queue.next_pipe(30) == pipes[0]
+        assert queue.next_pipe(mock_config.PIPE["width"]) == pipes[1]
+        assert queue.next_pipe(500) is None
+        assert PipeQueue().next_pipe(30) is None
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from src.objects.pipe_course import PipeCourse
+
+
+class TestPipeCourse:
+    MOCK_NUM_FRAMES = 6000
+
+    def test_given_pipe_config_when_creating_course_then_check_course_has_correct_pipes(
+        self, mock_config, mock_screen_size
+    ):
+        course = PipeCourse.create(mock_config.PIPE, mock_screen_size, self.MOCK_NUM_FRAMES, 0)
+
+        gap_range = mock_screen_size[1] - mock_config.PIPE["spacing"]
+        assert course.frames[0] == 0
+        assert course.frames[-1] < self.MOCK_NUM_FRAMES
+        assert np.all(np.diff(course.frames) >= mock_config.PIPE["min_spawnrate"])
+        assert np.diff(course.frames)[0] == int(mock_config.PIPE["start_spawnrate"] - mock_config.PIPE["acc_spawnrate"])
+        assert np.all((course.tops >= gap_range / 5) & (course.tops <= 4 * gap_range / 5))
+        assert course.speeds[0] == mock_config.PIPE["start_speed"]
+        assert np.max(course.speeds) <= mock_config.PIPE["max_speed"]
+        assert len(course) == len(course.tops) == len(course.speeds)
+
+    def test_given_same_seed_when_creating_courses_then_check_courses_match(self, mock_config, mock_screen_size):
+        courses = [
+            PipeCourse.create(mock_config.PIPE, mock_screen_size, self.MOCK_NUM_FRAMES, seed) for seed in (7, 7, 8)
+        ]
+
+        assert np.array_equal(courses[0].frames, courses[1].frames)
+        assert np.array_equal(courses[0].tops, courses[1].tops)
+        assert not np.array_equal(courses[0].tops, courses[2].tops)
+
+    def test_given_course_when_creating_pipe_then_check_pipe_matches_course(self, mock_config, mock_screen):
+        course = PipeCourse.create(mock_config.PIPE, mock_screen.get_size(), self.MOCK_NUM_FRAMES, 0)
+
+        with patch("pygame.display.get_surface", return_value=mock_screen):
+            pipe = course.create_pipe(3)
+
+        assert pipe.top == course.tops[3]
+        assert pipe.speed == course.speeds[3]
+        assert pipe.bottom == mock_screen.get_size()[1] - (pipe.top + mock_config.PIPE["spacing"])
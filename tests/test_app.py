@@ -1,4 +1,12 @@
-from unittest.mock import PropertyMock, call, patch
+import threading
+from unittest.mock import MagicMock, PropertyMock, call, patch
+
+import numpy as np
+import pygame
+import pytest
+
+from src.app import App
+from src.models.neat import NEATPopulationNetwork
 
 
 class TestApp:
@@ -9,13 +17,14 @@ class TestApp:
         assert mock_app.display_surf == mock_screen
         assert mock_app.name == mock_config.GAME["name"]
         assert mock_app.count == 0
+        assert not mock_app.headless
 
         assert len(mock_app.birds) == mock_config.GA["population_size"]
         assert len(mock_app.population.population) == mock_config.GA["population_size"]
 
         assert len(mock_app.pipes) == 0
-        assert mock_app.pipe_current_spawnrate == mock_config.PIPE["start_spawnrate"]
-        assert mock_app.pipe_current_speed == mock_config.PIPE["start_speed"]
+        assert mock_app.pipe_index == 0
+        assert len(mock_app.course) > 0
 
     @patch("src.app.App.write_text")
     def test_given_mock_app_when_displaying_stats_then_check_correct_text_written(
@@ -29,40 +38,306 @@ class TestApp:
             call("Score: 0", 0, mock_config.GAME["font"]["size"] * 2),
         )
 
+    def test_given_unchanged_text_when_writing_text_then_check_text_rendered_once(self, mock_app):
+        mock_app.FONT = MagicMock(wraps=mock_app.FONT)
+
+        mock_app.write_text("Score: 0", 0, 0)
+        mock_app.write_text("Score: 0", 0, 0)
+        mock_app.write_text("Score: 1", 0, 0)
+
+        assert mock_app.FONT.render.call_count == 2
+        assert len(mock_app.renderer.rects) == 3
+
+    @patch("src.objects.bird.Bird.draw")
+    @patch("src.objects.pipe.Pipe.draw")
+    def test_given_alive_birds_when_drawing_then_check_bird_rects_joined(
+        self, mock_pipe_draw, mock_bird_draw, mock_app
+    ):
+        mock_bird_draw.side_effect = [pygame.Rect(50, y, 10, 10) for y in range(len(mock_app.birds))]
+
+        mock_app.draw()
+
+        assert mock_app.renderer.rects == [pygame.Rect(50, 0, 10, 10 + len(mock_app.birds) - 1)]
+
     @patch("src.models.ga.Population.evaluate")
     def test_given_no_birds_alive_when_updating_and_then_check_population_evaluated(
         self, mock_evaluate, mock_app, mock_config
     ):
         mock_app.count = 1
+        old_course = mock_app.course
         with patch("src.models.ga.Population.num_alive", new_callable=PropertyMock) as mock_num_alive:
             mock_num_alive.return_value = 0
             mock_app.update()
             assert mock_evaluate.call_count == 1
-            assert mock_app.pipes == []
-            assert mock_app.pipe_current_speed == mock_config.PIPE["start_speed"]
-            assert mock_app.pipe_current_spawnrate == mock_config.PIPE["start_spawnrate"]
+            assert mock_app.course.seed != old_course.seed
+            assert len(mock_app.pipes) == 1
+            assert mock_app.pipe_index == 1
+            assert mock_app.pipes[0].speed == mock_config.PIPE["start_speed"]
 
     @patch("src.models.ga.Population.evaluate")
     def test_given_max_score_reached_when_updating_then_check_population_evaluated(
         self, mock_evaluate, mock_app, mock_config
     ):
         mock_app.count = 1
+        old_course = mock_app.course
         with patch("src.objects.bird.Bird.score", new_callable=PropertyMock) as mock_score:
             mock_score.return_value = mock_config.GA["max_score"]
             mock_app.update()
             assert mock_evaluate.call_count == 1
-            assert mock_app.pipes == []
-            assert mock_app.pipe_current_speed == mock_config.PIPE["start_speed"]
-            assert mock_app.pipe_current_spawnrate == mock_config.PIPE["start_spawnrate"]
+            assert mock_app.course.seed != old_course.seed
+            assert len(mock_app.pipes) == 1
+            assert mock_app.pipe_index == 1
+            assert mock_app.pipes[0].speed == mock_config.PIPE["start_speed"]
+
+    def test_given_background_reproduction_when_generation_finished_then_check_update_not_blocked(self, mock_config):
+        reproduced = threading.Event()
+        with patch.dict(mock_config.GAME, {"background_reproduction": True}):
+            app = App.create_app(mock_config)
+        old_course = app.course
+        generation = app.population.generation
+
+        with patch("src.models.ga.Population.num_alive", new_callable=PropertyMock) as mock_num_alive, patch.object(
+            app.population, "evaluate", side_effect=lambda: reproduced.wait(timeout=5)
+        ) as mock_evaluate:
+            mock_num_alive.return_value = 0
+            app.update()
+            app.update()
+
+            assert app.reproduction is not None
+            assert app.course is old_course
+            assert len(app.pipes) == 0
+
+            reproduced.set()
+            app.reproduction.result(timeout=5)
+            app.update()
+
+        assert mock_evaluate.call_count == 1
+        assert not app.reproducing
+        assert app.course.seed != old_course.seed
+        assert len(app.pipes) == 1
+        assert app.population.generation == generation
+        app.close()
+
+    def test_given_background_reproduction_fails_when_updating_then_check_error_raised(self, mock_config):
+        with patch.dict(mock_config.GAME, {"background_reproduction": True}):
+            app = App.create_app(mock_config)
+
+        with patch("src.models.ga.Population.num_alive", new_callable=PropertyMock) as mock_num_alive, patch.object(
+            app.population, "evaluate", side_effect=RuntimeError
+        ):
+            mock_num_alive.return_value = 0
+            app.update()
+            assert app.reproduction is not None
+            app.reproduction.exception(timeout=5)
+
+            with pytest.raises(RuntimeError):
+                app.update()
+
+        assert not app.reproducing
+        app.close()
+
+    def test_given_cached_bird_at_max_score_when_checking_generation_then_check_birds_alive_simulated(
+        self, mock_app, mock_config
+    ):
+        known = np.full(len(mock_app.birds), -1)
+        known[0] = mock_config.GA["max_score"] * 60
+
+        mock_app.swarm.set_known_counts(known)
+
+        assert mock_app.population.best_member.score == mock_config.GA["max_score"]
+        assert not mock_app.generation_finished
 
     def test_given_time_to_spawn_pipe_when_updating_then_check_pipe_spawns(self, mock_app, mock_config):
-        mock_app.count = mock_app.pipe_current_spawnrate
+        mock_app.update()
+        mock_app.count = mock_app.course.frames[1]
 
         mock_app.update()
 
-        assert len(mock_app.pipes) == 1
-        assert mock_app.pipe_current_speed == mock_config.PIPE["start_speed"] + mock_config.PIPE["acc_speed"]
-        assert (
-            mock_app.pipe_current_spawnrate == mock_config.PIPE["start_spawnrate"] - mock_config.PIPE["acc_spawnrate"]
-        )
-        assert mock_app.count == 1
+        assert len(mock_app.pipes) == 2
+        assert mock_app.pipe_index == 2
+        assert mock_app.pipes[1].speed == pytest.approx(mock_config.PIPE["start_speed"] + mock_config.PIPE["acc_speed"])
+        assert mock_app.pipes[1].top == pytest.approx(mock_app.course.tops[1])
+
+    def test_given_pipe_seed_when_creating_apps_then_check_courses_match(self, mock_app, mock_config):
+        with patch.dict(mock_config.PIPE, {"seed": 42}):
+            apps = [App.create_app(mock_config) for _ in range(2)]
+
+        assert np.array_equal(apps[0].course.frames, apps[1].course.frames)
+        assert np.array_equal(apps[0].course.tops, apps[1].course.tops)
+
+    def test_given_fixed_course_when_starting_new_generation_then_check_course_replayed(self, mock_config):
+        with patch.dict(mock_config.PIPE, {"fixed_course": True}):
+            app = App.create_app(mock_config)
+        seed = app.course.seed
+
+        app.new_generation()
+
+        assert app.course.seed == seed
+
+    def test_given_fitness_cache_and_elitism_when_starting_new_generation_then_check_elites_not_simulated(
+        self, mock_config
+    ):
+        with patch.dict(mock_config.PIPE, {"fixed_course": True}), patch.dict(
+            mock_config.GA, {"elitism": 2, "fitness_cache": True}
+        ):
+            app = App.create_app(mock_config)
+        while not app.generation_finished:
+            app.step()
+            app.count += 1
+        old_genomes = app.brain.genomes.copy()
+        old_counts = app.swarm.count.copy()
+
+        app.new_generation()
+
+        unchanged = np.all(app.brain.genomes == old_genomes, axis=1)
+        assert np.count_nonzero(unchanged) >= 2
+        assert np.array_equal(app.swarm.count[unchanged], old_counts[unchanged])
+        known = np.array([np.any(np.all(old_genomes == genome, axis=1)) for genome in app.brain.genomes])
+        assert not np.any(app.swarm.alive[known])
+        assert app.population.num_alive == np.count_nonzero(~known)
+
+    def test_given_neat_enabled_when_starting_new_generation_then_check_genomes_evolved(self, mock_config):
+        with patch.dict(mock_config.NN, {"neat": {**mock_config.NN["neat"], "enabled": True}}), patch.dict(
+            mock_config.GA, {"elitism": 1}
+        ):
+            app = App.create_app(mock_config)
+        while not app.generation_finished:
+            app.step()
+            app.count += 1
+        fitnesses = app.population.fitnesses
+        best = [app.brain.genomes[index] for index in np.flatnonzero(fitnesses == np.max(fitnesses))]
+
+        app.new_generation()
+
+        assert isinstance(app.brain, NEATPopulationNetwork)
+        assert any(genome in app.brain.genomes for genome in best)
+        assert app.population.num_alive == len(app.brain.genomes)
+        with pytest.raises(ValueError):
+            app.dense_brain
+
+    def test_given_neat_and_checkpoints_when_creating_app_then_check_error_raised(self, mock_config):
+        with patch.dict(mock_config.NN, {"neat": {**mock_config.NN["neat"], "enabled": True}}), patch.dict(
+            mock_config.GAME, {"checkpoint": {**mock_config.GAME["checkpoint"], "interval": 1}}
+        ):
+            with pytest.raises(ValueError):
+                App.create_app(mock_config)
+
+    @patch("src.objects.bird.Bird.draw")
+    @patch("src.objects.pipe.Pipe.draw")
+    def test_given_mock_app_when_drawing_then_check_pipes_and_alive_birds_drawn(
+        self, mock_pipe_draw, mock_bird_draw, mock_app, mock_config
+    ):
+        mock_app.update()
+        mock_app.population.population[0].kill()
+
+        mock_app.draw()
+
+        assert mock_pipe_draw.call_count == len(mock_app.pipes)
+        assert mock_bird_draw.call_count == mock_config.GA["population_size"] - 1
+
+    def test_given_arrow_keys_when_handling_keys_then_check_speed_doubled_and_halved(self, mock_app, mock_config):
+        assert mock_app.speed == mock_config.GAME["speed"]
+
+        mock_app.handle_key(pygame.K_UP)
+        mock_app.handle_key(pygame.K_UP)
+        assert mock_app.speed == 4
+
+        for _ in range(3):
+            mock_app.handle_key(pygame.K_DOWN)
+        assert mock_app.speed == 1
+
+    def test_given_steps_over_one_second_when_recording_steps_then_check_sim_rate_calculated(self, mock_app):
+        mock_app.sim_rate_time -= 2
+        mock_app.record_steps(100)
+
+        assert 40 < mock_app.sim_rate <= 50
+        assert mock_app.sim_steps == 0
+
+    def test_given_profiler_enabled_when_updating_then_check_phases_timed(self, mock_app):
+        mock_app.handle_key(pygame.K_p)
+
+        mock_app.update()
+
+        assert list(mock_app.profiler.averages) == ["pipes", "inputs", "inference", "collision", "physics"]
+
+    def test_given_headless_config_when_creating_app_then_check_dummy_display_used(self, mock_headless_app):
+        assert mock_headless_app.headless
+        assert pygame.display.get_driver() == "dummy"
+
+    @patch("src.objects.bird.Bird.draw")
+    @patch("src.objects.pipe.Pipe.draw")
+    def test_given_headless_app_when_running_headless_then_check_generation_completed_without_drawing(
+        self, mock_pipe_draw, mock_bird_draw, mock_headless_app
+    ):
+        def mock_evaluate():
+            mock_headless_app.population.generation += 1
+
+        with patch.object(mock_headless_app.population, "evaluate", side_effect=mock_evaluate):
+            mock_headless_app.run_headless(num_generations=1)
+
+        assert mock_headless_app.population.generation == 2
+        assert mock_headless_app.num_frames > 0
+        assert mock_headless_app.frames_per_second > 0
+        assert mock_headless_app.generations_per_hour > 0
+        assert mock_pipe_draw.call_count == 0
+        assert mock_bird_draw.call_count == 0
+
+    @patch("src.app.App.update", side_effect=KeyboardInterrupt)
+    def test_given_interrupted_headless_run_when_running_then_check_checkpoints_and_metrics_closed(
+        self, mock_update, mock_headless_app
+    ):
+        with patch.object(mock_headless_app.checkpointer, "close") as mock_checkpointer_close, patch.object(
+            mock_headless_app.metrics, "close"
+        ) as mock_metrics_close:
+            with pytest.raises(KeyboardInterrupt):
+                mock_headless_app.run_headless()
+
+        mock_checkpointer_close.assert_called_once()
+        mock_metrics_close.assert_called_once()
+
+    def test_given_checkpoint_when_resuming_then_check_population_restored(self, mock_app, mock_config, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        with patch.dict(mock_config.GAME, {"checkpoint": {"path": str(filepath), "interval": 1}}):
+            saved_app = App.create_app(mock_config)
+        saved_app.new_generation()
+        saved_app.checkpointer.close()
+
+        mock_app.resume(filepath)
+
+        assert np.array_equal(mock_app.dense_brain.get_genomes(), saved_app.dense_brain.get_genomes())
+        assert mock_app.population.generation == saved_app.population.generation
+        assert mock_app.course.seed == saved_app.course.seed
+        assert len(mock_app.pipes) == 0
+
+    def test_given_fixed_course_without_seed_when_resuming_then_check_course_restored(self, mock_config, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        with patch.dict(mock_config.GAME, {"checkpoint": {"path": str(filepath), "interval": 1}}), patch.dict(
+            mock_config.PIPE, {"fixed_course": True, "seed": None}
+        ):
+            saved_app = App.create_app(mock_config)
+            saved_app.new_generation()
+            saved_app.checkpointer.close()
+            app = App.create_app(mock_config)
+        old_course_seed = app.course_seed
+
+        app.resume(filepath)
+
+        assert app.course_seed == saved_app.course_seed != old_course_seed
+        assert app.course.seed == saved_app.course.seed
+
+    def test_given_mutation_schedule_when_resuming_then_check_schedule_restored(self, mock_config, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        config_ga = {**mock_config.GA, "mutation_schedule": {**mock_config.GA["mutation_schedule"], "enabled": True}}
+        with patch.dict(mock_config.GAME, {"checkpoint": {"path": str(filepath), "interval": 1}}), patch.dict(
+            mock_config.GA, config_ga
+        ):
+            saved_app = App.create_app(mock_config)
+            saved_app.new_generation()
+            saved_app.checkpointer.close()
+            app = App.create_app(mock_config)
+
+        app.resume(filepath)
+
+        assert app.population.scheduler is not None and saved_app.population.scheduler is not None
+        assert app.population.scheduler.state == saved_app.population.scheduler.state
+        assert app.population.mutation_rate == saved_app.population.mutation_rate
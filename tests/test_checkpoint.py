@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+
+
+class TestCheckpoint:
+    MOCK_GENOMES = np.arange(12, dtype=float).reshape(3, 4)
+    MOCK_RNG_STATES = {"population": np.random.default_rng(0).bit_generator.state}
+
+    def test_given_genomes_when_saving_and_loading_checkpoint_then_check_checkpoint_matches(self, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+
+        save_checkpoint(filepath, self.MOCK_GENOMES, 5, self.MOCK_RNG_STATES)
+        checkpoint = load_checkpoint(filepath)
+
+        assert np.array_equal(checkpoint["genomes"], self.MOCK_GENOMES)
+        assert checkpoint["generation"] == 5
+        assert checkpoint["rng_states"] == self.MOCK_RNG_STATES
+        assert not (tmp_path / "checkpoint.npz.tmp").exists()
+
+    def test_given_unknown_version_when_loading_checkpoint_then_check_error_raised(self, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        np.savez(filepath, version=0)
+
+        with pytest.raises(ValueError):
+            load_checkpoint(filepath)
+
+    def test_given_interval_when_checking_due_then_check_every_interval_generations_due(self, tmp_path):
+        checkpointer = Checkpointer(tmp_path / "checkpoint.npz", 3)
+
+        assert [checkpointer.due(generation) for generation in range(1, 7)] == [False, False, True] * 2
+        assert not Checkpointer(tmp_path / "checkpoint.npz", 0).due(3)
+
+    def test_given_checkpointer_when_saving_then_check_checkpoint_written_in_background(self, tmp_path):
+        checkpointer = Checkpointer(tmp_path / "checkpoints" / "checkpoint.npz", 1)
+
+        checkpointer.save(self.MOCK_GENOMES, 2, self.MOCK_RNG_STATES)
+        checkpointer.close()
+
+        assert checkpointer.executor is None
+        assert load_checkpoint(checkpointer.filepath)["generation"] == 2
+
+    def test_given_population_state_when_saving_and_loading_checkpoint_then_check_state_matches(self, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        population_state = {"scheduler": {"rates": [0.1], "best_fitness": 4.0, "stagnation": 2, "decision": "stagnant"}}
+
+        save_checkpoint(filepath, self.MOCK_GENOMES, 5, self.MOCK_RNG_STATES, population_state)
+
+        assert load_checkpoint(filepath)["population_state"] == population_state
+
+    def test_given_checkpoint_without_population_state_when_loading_then_check_state_empty(self, tmp_path):
+        filepath = tmp_path / "checkpoint.npz"
+        np.savez(filepath, version=1, genomes=self.MOCK_GENOMES, generation=5, rng_states="{}")
+
+        checkpoint = load_checkpoint(filepath)
+        assert checkpoint["population_state"] == {}
+        assert checkpoint["course_seed"] is None
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.evaluator import ShardedEvaluator
+
+
+class TestShardedEvaluator:
+    @pytest.fixture
+    def mock_evaluator(self, mock_config):
+        evaluator = ShardedEvaluator(mock_config, 2)
+        yield evaluator
+        evaluator.close()
+
+    def test_given_population_when_splitting_into_shards_then_check_shards_cover_population(self, mock_evaluator):
+        assert mock_evaluator.shards(10) == [(0, 5), (5, 10)]
+        assert mock_evaluator.shards(1) == [(0, 1)]
+
+    def test_given_genomes_when_evaluating_then_check_counts_match_single_process(
+        self, mock_evaluator, mock_headless_app, mock_config
+    ):
+        genomes = mock_headless_app.brain.get_genomes()
+
+        counts = mock_evaluator.evaluate(genomes, mock_headless_app.course)
+
+        while not mock_headless_app.generation_finished:
+            mock_headless_app.step()
+            mock_headless_app.count += 1
+
+        assert counts.shape == (mock_config.GA["population_size"],)
+        assert np.array_equal(counts, mock_headless_app.swarm.count)
+        assert mock_evaluator.shared_memory is not None
+        assert mock_evaluator.shared_memory.size >= genomes.nbytes
+
+    def test_given_known_counts_when_evaluating_then_check_known_counts_returned(
+        self, mock_evaluator, mock_headless_app, mock_config
+    ):
+        genomes = mock_headless_app.brain.get_genomes()
+        known = np.full(mock_config.GA["population_size"], -1)
+        known[[0, 7]] = [123, 45]
+
+        counts = mock_evaluator.evaluate(genomes, mock_headless_app.course, known)
+
+        mock_headless_app.swarm.set_known_counts(known)
+        while not mock_headless_app.generation_finished:
+            mock_headless_app.step()
+            mock_headless_app.count += 1
+
+        assert counts[0] == 123
+        assert counts[7] == 45
+        assert np.array_equal(counts, mock_headless_app.swarm.count)
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing.queues import Queue
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.app import App
+from src.islands import IslandModel, Migration, island_config
+
+
+def wait_for_migrants(inbox: Queue) -> None:
+    for _ in range(100):
+        if not inbox.empty():
+            return
+        time.sleep(0.01)
+
+
+def kill_first_island(model: IslandModel) -> None:
+    for _ in range(3000):
+        if model.processes and model.processes[0].pid is not None:
+            time.sleep(0.5)
+            os.kill(model.processes[0].pid, signal.SIGKILL)
+            return
+        time.sleep(0.01)
+
+
+class TestMigration:
+    @pytest.fixture
+    def mock_inboxes(self):
+        context = multiprocessing.get_context("spawn")
+        return [context.Queue() for _ in range(3)]
+
+    def test_given_topologies_when_getting_neighbours_then_check_neighbours_correct(self, mock_inboxes):
+        assert Migration(2, mock_inboxes, 1, 1, "ring").neighbours == [0]
+        assert Migration(1, mock_inboxes, 1, 1, "full").neighbours == [0, 2]
+        assert Migration(0, mock_inboxes[:1], 1, 1, "full").neighbours == []
+
+    def test_given_unknown_topology_when_creating_migration_then_check_error_raised(self, mock_inboxes):
+        with pytest.raises(ValueError):
+            Migration(0, mock_inboxes, 1, 1, "star")
+
+    def test_given_interval_when_checking_due_then_check_every_interval_due(self, mock_inboxes):
+        migration = Migration(0, mock_inboxes, 3, 1)
+
+        assert [migration.due(generation) for generation in range(1, 7)] == [False, False, True] * 2
+        assert not Migration(0, mock_inboxes, 0, 1).due(3)
+
+    def test_given_genomes_when_emigrating_then_check_fittest_genomes_sent_to_neighbour(self, mock_inboxes):
+        migration = Migration(0, mock_inboxes, 1, 2)
+        genomes = np.arange(12, dtype=float).reshape(4, 3)
+
+        migration.emigrate(genomes, np.array([5.0, 1.0, 9.0, 3.0]))
+
+        assert np.array_equal(mock_inboxes[1].get(timeout=5), genomes[[0, 2]])
+        assert mock_inboxes[2].empty()
+
+    def test_given_migrants_when_immigrating_then_check_least_fit_members_replaced(self, mock_inboxes):
+        migration = Migration(1, mock_inboxes, 1, 2)
+        genomes = np.zeros((4, 3))
+        migrants = np.ones((2, 3))
+        mock_inboxes[1].put(migrants)
+        wait_for_migrants(mock_inboxes[1])
+
+        num_received = migration.immigrate(genomes, np.array([5.0, 1.0, 9.0, 3.0]))
+
+        assert num_received == 2
+        assert np.array_equal(genomes[[1, 3]], migrants)
+        assert np.array_equal(genomes[[0, 2]], np.zeros((2, 3)))
+        assert migration.best_fitness == 9.0
+
+    def test_given_empty_inbox_when_immigrating_then_check_genomes_unchanged(self, mock_inboxes):
+        migration = Migration(1, mock_inboxes, 1, 2)
+        genomes = np.zeros((4, 3))
+
+        assert migration.immigrate(genomes, np.zeros(4)) == 0
+        assert not np.any(genomes)
+
+    def test_given_island_app_when_starting_new_generation_then_check_migrants_exchanged(
+        self, mock_headless_app, mock_inboxes
+    ):
+        mock_headless_app.migration = Migration(0, mock_inboxes, 1, 2)
+        while not mock_headless_app.generation_finished:
+            mock_headless_app.step()
+            mock_headless_app.count += 1
+        old_genomes = mock_headless_app.brain.get_genomes()
+        fitnesses = mock_headless_app.population.fitnesses
+        migrants = np.full((1, old_genomes.shape[1]), 0.5)
+        mock_inboxes[0].put(migrants)
+        wait_for_migrants(mock_inboxes[0])
+
+        mock_headless_app.new_generation()
+
+        sent = mock_inboxes[1].get(timeout=5)
+        sent_indices = [int(np.flatnonzero(np.all(old_genomes == genome, axis=1))[0]) for genome in sent]
+        assert len(sent) == 2
+        assert np.all(fitnesses[sent_indices] >= np.sort(fitnesses)[-2])
+        assert np.any(np.all(mock_headless_app.brain.genomes == migrants, axis=1))
+        assert mock_headless_app.migration.num_received == 1
+
+
+class TestIslandModel:
+    def test_given_config_when_creating_island_config_then_check_island_runs_alone(self, mock_config):
+        config = {name: getattr(mock_config, name) for name in ["GAME", "GA", "NN", "BIRD", "PIPE"]}
+        config["GAME"] = {**config["GAME"], "metrics": {"path": "metrics/training.jsonl", "flush_interval": 10}}
+
+        config_island = island_config(config, 2)
+
+        assert config_island.GAME["headless"]
+        assert config_island.GAME["checkpoint"]["interval"] == 0
+        assert config_island.GAME["metrics"]["path"].endswith("training_island2.jsonl")
+        assert config_island.GA["islands"]["num_islands"] == 1
+
+    def test_given_two_islands_when_running_then_check_each_island_finished(self, mock_config):
+        islands = {"num_islands": 2, "migration_interval": 1, "num_migrants": 1, "topology": "ring"}
+        with patch.dict(mock_config.GA, {"islands": islands}):
+            results = IslandModel(mock_config, 2).run(2)
+
+        assert [result["island"] for result in results] == [0, 1]
+        assert all(result["generation"] == 3 for result in results)
+        assert all(result["migrants_received"] <= 2 for result in results)
+
+    def test_given_killed_island_when_running_forever_then_check_error_raised_and_islands_stopped(self, mock_config):
+        islands = {"num_islands": 2, "migration_interval": 1, "num_migrants": 1, "topology": "ring"}
+        with patch.dict(mock_config.GA, {"islands": islands}):
+            model = IslandModel(mock_config, 2)
+        killer = threading.Thread(target=kill_first_island, args=(model,))
+        killer.start()
+
+        with pytest.raises(RuntimeError):
+            model.run()
+
+        killer.join()
+        assert not any(process.is_alive() for process in model.processes)
+        assert model.processes[0].exitcode == -signal.SIGKILL
+
+    def test_given_neat_and_islands_when_creating_app_then_check_error_raised(self, mock_config):
+        islands = {**mock_config.GA["islands"], "num_islands": 2}
+        with patch.dict(mock_config.NN, {"neat": {**mock_config.NN["neat"], "enabled": True}}), patch.dict(
+            mock_config.GA, {"islands": islands}
+        ):
+            with pytest.raises(ValueError):
+                App.create_app(mock_config)
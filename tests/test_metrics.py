@@ -0,0 +1,53 @@
+import csv
+import json
+
+from src.metrics import MetricsLog
+
+
+class TestMetricsLog:
+    MOCK_RECORD = {"generation": 1, "best_fitness": 4.0, "survival_histogram": {"counts": [1, 2]}}
+
+    def test_given_records_when_buffer_not_full_then_check_nothing_written(self, tmp_path):
+        metrics = MetricsLog(tmp_path / "metrics.jsonl", flush_interval=3)
+
+        metrics.write(self.MOCK_RECORD)
+        metrics.write(self.MOCK_RECORD)
+
+        assert not (tmp_path / "metrics.jsonl").exists()
+        assert len(metrics.records) == 2
+
+    def test_given_full_buffer_when_writing_jsonl_then_check_records_appended(self, tmp_path):
+        filepath = tmp_path / "metrics" / "metrics.jsonl"
+        metrics = MetricsLog(filepath, flush_interval=2)
+
+        for _ in range(3):
+            metrics.write(self.MOCK_RECORD)
+        metrics.close()
+        MetricsLog(filepath, flush_interval=1).write(self.MOCK_RECORD)
+
+        with open(filepath) as file:
+            records = [json.loads(line) for line in file]
+        assert records == [self.MOCK_RECORD] * 4
+        assert metrics.records == []
+
+    def test_given_records_when_writing_csv_then_check_header_written_once(self, tmp_path):
+        filepath = tmp_path / "metrics.csv"
+
+        for _ in range(2):
+            metrics = MetricsLog(filepath, flush_interval=1)
+            metrics.write(self.MOCK_RECORD)
+
+        with open(filepath) as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 2
+        assert rows[0]["best_fitness"] == "4.0"
+        assert json.loads(rows[0]["survival_histogram"]) == {"counts": [1, 2]}
+
+    def test_given_no_path_when_writing_then_check_records_not_buffered(self):
+        metrics = MetricsLog.create({"path": None, "flush_interval": 1})
+
+        metrics.write(self.MOCK_RECORD)
+        metrics.close()
+
+        assert not metrics.enabled
+        assert metrics.records == []
@@ -0,0 +1,67 @@
+import csv
+import json
+from unittest.mock import patch
+
+from src.profiler import Profiler
+
+
+class TestProfiler:
+    def test_given_disabled_profiler_when_timing_phases_then_check_no_samples_recorded(self, tmp_path):
+        profiler = Profiler(tmp_path / "profile.json", 0)
+
+        profiler.start()
+        profiler.lap("inference")
+
+        assert not profiler.enabled
+        assert profiler.samples == {}
+
+    @patch("src.profiler.time.perf_counter")
+    def test_given_laps_when_timing_phases_then_check_rolling_averages(self, mock_perf_counter, tmp_path):
+        mock_perf_counter.side_effect = [0.0, 1.0, 3.0, 6.0, 10.0, 11.0]
+        profiler = Profiler(tmp_path / "profile.json", 0, overlay=True, window=2)
+
+        for _ in range(3):
+            profiler.start()
+            profiler.lap("inference")
+
+        assert profiler.averages == {"inference": 2.0}
+
+    def test_given_overlay_toggled_when_dumps_disabled_then_check_profiler_enabled_with_overlay(self, tmp_path):
+        profiler = Profiler(tmp_path / "profile.json", 0)
+
+        profiler.toggle_overlay()
+        assert (profiler.overlay, profiler.enabled) == (True, True)
+
+        profiler.toggle_overlay()
+        assert (profiler.overlay, profiler.enabled) == (False, False)
+
+    def test_given_interval_when_checking_due_then_check_every_interval_generations_due(self, tmp_path):
+        profiler = Profiler(tmp_path / "profile.json", 2)
+
+        assert [profiler.due(generation) for generation in range(1, 5)] == [False, True] * 2
+        assert not Profiler(tmp_path / "profile.json", 0).due(2)
+
+    def test_given_samples_when_dumping_json_then_check_averages_written(self, tmp_path):
+        profiler = Profiler(tmp_path / "profiles" / "profile.json", 1)
+        profiler.start()
+        profiler.lap("inference")
+
+        profiler.dump(3)
+
+        with open(tmp_path / "profiles" / "profile.json") as file:
+            profile = json.load(file)
+        assert profile["generation"] == 3
+        assert profile["phases"]["inference"]["count"] == 1
+
+    def test_given_samples_when_dumping_csv_then_check_row_written_for_each_phase(self, tmp_path):
+        profiler = Profiler(tmp_path / "profile.csv", 1)
+        profiler.start()
+        profiler.lap("inference")
+        profiler.lap("physics")
+
+        profiler.dump(3)
+
+        with open(tmp_path / "profile.csv") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["phase"] for row in rows] == ["inference", "physics"]
+        assert all(row["generation"] == "3" for row in rows)
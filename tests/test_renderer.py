@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+import pygame
+
+from src.renderer import Renderer
+
+
+class TestRenderer:
+    @patch("src.renderer.pygame.display.update")
+    def test_given_first_frame_when_updating_then_check_whole_screen_updated(self, mock_update, mock_screen):
+        renderer = Renderer(mock_screen)
+        mock_screen.fill((255, 255, 255))
+
+        renderer.clear()
+        renderer.add(pygame.Rect(0, 0, 10, 10))
+        renderer.update()
+
+        mock_update.assert_called_once_with()
+        assert mock_screen.get_at((100, 100)) == (0, 0, 0)
+        assert renderer.previous_rects == [pygame.Rect(0, 0, 10, 10)]
+        assert renderer.rects == []
+
+    @patch("src.renderer.pygame.display.update")
+    def test_given_drawn_rects_when_updating_then_check_only_previous_and_new_rects_updated(
+        self, mock_update, mock_screen
+    ):
+        renderer = Renderer(mock_screen)
+        renderer.clear()
+        renderer.update()
+
+        old_rect = pygame.Rect(0, 0, 10, 10)
+        new_rect = pygame.Rect(20, 0, 10, 10)
+        mock_screen.fill((255, 255, 255))
+        renderer.add(old_rect)
+        renderer.update()
+
+        renderer.clear()
+        renderer.add(new_rect)
+        renderer.update()
+
+        mock_update.assert_called_with([old_rect, new_rect])
+        assert mock_screen.get_at(old_rect.topleft) == (0, 0, 0)
+        assert mock_screen.get_at((100, 100)) == (255, 255, 255)
@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
-from src.utils.matrix_utils import generate_number, select_gene
+import numpy as np
+
+from src.utils.matrix_utils import generate_number, select_gene, select_genes
 
 
 class TestMatrixUtils:
@@ -46,3 +48,41 @@ class TestMatrixUtils:
         )
 
         assert actual_value == self.MOCK_OTHER_ELEMENT
+
+    def test_given_no_mutation_when_selecting_genes_then_check_genes_from_either_array(self):
+        elements = np.full((100, 10), self.MOCK_ELEMENT, dtype=float)
+        other_elements = np.full((100, 10), self.MOCK_OTHER_ELEMENT, dtype=float)
+
+        genes = select_genes(elements, other_elements, 0, self.MOCK_LOW, self.MOCK_HIGH, np.random.default_rng(0))
+
+        assert genes.shape == elements.shape
+        assert np.all((genes == self.MOCK_ELEMENT) | (genes == self.MOCK_OTHER_ELEMENT))
+        assert np.any(genes == self.MOCK_ELEMENT)
+        assert np.any(genes == self.MOCK_OTHER_ELEMENT)
+
+    def test_given_full_mutation_when_selecting_genes_then_check_genes_random(self):
+        elements = np.full((100, 10), self.MOCK_ELEMENT, dtype=float)
+        other_elements = np.full((100, 10), self.MOCK_OTHER_ELEMENT, dtype=float)
+
+        genes = select_genes(elements, other_elements, 1, self.MOCK_LOW, self.MOCK_HIGH, np.random.default_rng(0))
+
+        assert np.all((self.MOCK_LOW <= genes) & (genes <= self.MOCK_HIGH))
+
+    def test_given_limits_per_column_when_selecting_genes_then_check_random_genes_within_column_limits(self):
+        elements = np.full((100, 2), self.MOCK_ELEMENT, dtype=float)
+        other_elements = np.full((100, 2), self.MOCK_OTHER_ELEMENT, dtype=float)
+        low = np.array([0, 10])
+        high = np.array([1, 11])
+
+        genes = select_genes(elements, other_elements, 1, low, high, np.random.default_rng(0))
+
+        assert np.all((low <= genes) & (genes <= high))
+
+    def test_given_mutation_rate_per_column_when_selecting_genes_then_check_only_mutated_columns_random(self):
+        elements = np.full((100, 2), self.MOCK_ELEMENT, dtype=float)
+        other_elements = np.full((100, 2), self.MOCK_ELEMENT, dtype=float)
+
+        genes = select_genes(elements, other_elements, np.array([0, 1]), 10, 11, np.random.default_rng(0))
+
+        assert np.all(genes[:, 0] == self.MOCK_ELEMENT)
+        assert np.all((10 <= genes[:, 1]) & (genes[:, 1] <= 11))